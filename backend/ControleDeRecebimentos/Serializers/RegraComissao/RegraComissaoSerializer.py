@@ -0,0 +1,13 @@
+from rest_framework import serializers
+from ControleDeRecebimentos.models import RegraComissao
+
+class RegraComissaoSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = RegraComissao
+        fields = ['id', 'taxa', 'vigente_desde', 'empreendimento', 'forma_pagamento', 'created_at']
+        read_only_fields = ['id', 'created_at']
+
+    def validate_taxa(self, value):
+        if value < 0:
+            raise serializers.ValidationError("A taxa não pode ser negativa.")
+        return value
@@ -1,14 +1,70 @@
 from rest_framework import serializers
+from django.db.models import Count, Q, Sum
+
 from ControleDeRecebimentos.models import TabelaMensal
 
 
+def tabelas_com_totais():
+    """
+    TabelaMensal com os totais das vendas de cada mês anotados, para
+    listar todos os meses em uma única query.
+    """
+    return TabelaMensal.objects.annotate(
+        total_vendas=Count("vendas"),
+        vendas_pendentes=Count("vendas", filter=Q(vendas__status="PE")),
+        vendas_faturadas=Count("vendas", filter=Q(vendas__status="FA")),
+        total_comissao=Sum("vendas__valor_comissao"),
+    )
+
+
 class TabelaMensalSerializer(serializers.ModelSerializer):
+    """
+    Os totais vêm das anotações de `tabelas_com_totais()`; para uma tabela
+    sem anotações (ex: recém-criada) são calculados com uma query.
+    """
+
     total_vendas = serializers.SerializerMethodField()
+    vendas_pendentes = serializers.SerializerMethodField()
+    vendas_faturadas = serializers.SerializerMethodField()
+    total_comissao = serializers.SerializerMethodField()
 
     class Meta:
         model = TabelaMensal
-        fields = ["id", "mes_referencia", "created_at", "total_vendas"]
-        read_only_fields = ["id", "created_at", "total_vendas"]
+        fields = [
+            "id",
+            "mes_referencia",
+            "created_at",
+            "total_vendas",
+            "vendas_pendentes",
+            "vendas_faturadas",
+            "total_comissao",
+        ]
+        read_only_fields = [
+            "id",
+            "created_at",
+            "total_vendas",
+            "vendas_pendentes",
+            "vendas_faturadas",
+            "total_comissao",
+        ]
+
+    def totais(self, obj):
+        if not hasattr(obj, "total_vendas"):
+            totais = tabelas_com_totais().filter(id=obj.id).values(
+                "total_vendas", "vendas_pendentes", "vendas_faturadas", "total_comissao"
+            )[0]
+            for campo, valor in totais.items():
+                setattr(obj, campo, valor)
+        return obj
 
     def get_total_vendas(self, obj):
-        return obj.vendas.count()
+        return self.totais(obj).total_vendas
+
+    def get_vendas_pendentes(self, obj):
+        return self.totais(obj).vendas_pendentes
+
+    def get_vendas_faturadas(self, obj):
+        return self.totais(obj).vendas_faturadas
+
+    def get_total_comissao(self, obj):
+        return self.totais(obj).total_comissao or 0
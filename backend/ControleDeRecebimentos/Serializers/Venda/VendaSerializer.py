@@ -42,3 +42,31 @@ class VendaSerializer(serializers.ModelSerializer):
             "data_faturamento",
         ]
         read_only_fields = ["id", "created_at"]
+
+    # Colunas do banco necessárias para cada campo calculado
+    ORIGEM_CAMPOS = {
+        "cliente_nome": ["cliente__nome"],
+        "empreendimento_nome": ["empreendimento__nome"],
+        "status_display": ["status"],
+        "forma_pagamento_display": ["forma_pagamento"],
+    }
+
+    def __init__(self, *args, campos=None, **kwargs):
+        """
+        `campos` limita a saída a um subconjunto dos campos (parâmetro
+        `fields=` da listagem).
+        """
+        super().__init__(*args, **kwargs)
+        if campos:
+            for nome in set(self.fields) - set(campos):
+                self.fields.pop(nome)
+
+    @classmethod
+    def colunas_para(cls, campos):
+        """
+        Colunas a carregar com `.only()` para serializar `campos`.
+        """
+        colunas = {"id"}
+        for campo in campos:
+            colunas.update(cls.ORIGEM_CAMPOS.get(campo, [campo]))
+        return colunas
@@ -3,4 +3,7 @@ from django.apps import AppConfig
 
 class ControleDeRecebimentosConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'ControleDeRecebimentos'
\ No newline at end of file
+    name = 'ControleDeRecebimentos'
+
+    def ready(self):
+        from ControleDeRecebimentos import signals  # noqa: F401
@@ -0,0 +1,4 @@
+"""
+Benchmarks de desempenho. Executados via `python manage.py benchmark`, sempre
+em um banco de teste descartável criado a partir de DATABASE_URL.
+"""
@@ -0,0 +1,214 @@
+"""
+Benchmark da importação ACOMPANHAMENTO: pipeline colunar vs. implementação
+original baseada em `df.iterrows()`.
+"""
+import random
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+from django.db import transaction
+
+from ControleDeRecebimentos.models import Cliente, Empreendimento, Venda, TabelaMensal
+from ControleDeRecebimentos.services.acompanhamento import (
+    COLUNAS_ACOMPANHAMENTO,
+    importar_acompanhamento,
+)
+
+
+def gerar_planilha(linhas, mes_referencia, seed=42):
+    """
+    Gera um DataFrame com o formato da planilha ACOMPANHAMENTO já lida
+    (`skiprows=3`), com datas mistas, espaços extras e células vazias.
+    """
+    rnd = random.Random(seed)
+    ano, mes = (int(parte) for parte in mes_referencia.split("-"))
+    inicio_mes = datetime(ano, mes, 1)
+
+    empreendimentos = [f"Residencial {i:03d}" for i in range(max(linhas // 200, 1))]
+    registros = []
+    for i in range(linhas):
+        dia = inicio_mes + timedelta(days=rnd.randrange(28))
+        sorteio = rnd.random()
+        if sorteio < 0.80:
+            data = dia
+        elif sorteio < 0.90:
+            data = f" {dia:%Y-%m-%d} "
+        elif sorteio < 0.95:
+            data = dia - timedelta(days=40)
+        else:
+            data = rnd.choice([None, "A DEFINIR"])
+
+        registros.append(
+            {
+                "quant": i + 1,
+                "data": data,
+                "nome": f"  Cliente {i:07d} " if rnd.random() > 0.01 else None,
+                "corretor": f"Corretor {rnd.randrange(300)}",
+                "imobiliaria": rnd.choice(["Imob A", "Imob B", None]),
+                "empreendimento": rnd.choice(empreendimentos),
+                "unidade": f"{rnd.randrange(1, 30)}-{i}" if rnd.random() > 0.05 else None,
+                "etapa": rnd.choice(["Assinatura", "Repasse", "Registro"]),
+                "fgts": rnd.choice([round(rnd.uniform(0, 30000), 2), None, "-"]),
+                "status": "OK",
+                "observacoes": rnd.choice([None, "  sem observações  "]),
+            }
+        )
+
+    return pd.DataFrame(registros, columns=COLUNAS_ACOMPANHAMENTO)
+
+
+def importar_legado(df, tabela_mensal):
+    """
+    Implementação original da view, mantida apenas como referência de
+    desempenho e de resultado.
+    """
+    df = df.copy()
+    df.columns = COLUNAS_ACOMPANHAMENTO
+
+    nomes_clientes = set(
+        str(row["nome"]).strip() for _, row in df.iterrows() if pd.notna(row["nome"])
+    )
+    nomes_empreendimentos = set(
+        str(row["empreendimento"]).strip()
+        for _, row in df.iterrows()
+        if pd.notna(row["empreendimento"])
+    )
+
+    clientes_existentes = {
+        c.nome: c for c in Cliente.objects.filter(nome__in=nomes_clientes)
+    }
+    empreendimentos_existentes = {
+        e.nome: e for e in Empreendimento.objects.filter(nome__in=nomes_empreendimentos)
+    }
+
+    novos_clientes = [
+        Cliente(nome=nome) for nome in nomes_clientes if nome not in clientes_existentes
+    ]
+    if novos_clientes:
+        Cliente.objects.bulk_create(novos_clientes)
+        clientes_existentes = {
+            c.nome: c for c in Cliente.objects.filter(nome__in=nomes_clientes)
+        }
+
+    novos_empreendimentos = [
+        Empreendimento(nome=nome)
+        for nome in nomes_empreendimentos
+        if nome not in empreendimentos_existentes
+    ]
+    if novos_empreendimentos:
+        Empreendimento.objects.bulk_create(novos_empreendimentos)
+        empreendimentos_existentes = {
+            e.nome: e
+            for e in Empreendimento.objects.filter(nome__in=nomes_empreendimentos)
+        }
+
+    ano, mes = (int(parte) for parte in tabela_mensal.mes_referencia.split("-"))
+
+    def texto(valor):
+        return str(valor).strip() if pd.notna(valor) else None
+
+    dados_vendas = []
+    for _, row in df.iterrows():
+        try:
+            data_venda = pd.to_datetime(str(row["data"]).strip()).date()
+            if data_venda.year != ano or data_venda.month != mes:
+                continue
+        except Exception:
+            continue
+
+        cliente = clientes_existentes.get(texto(row["nome"]))
+        empreendimento = empreendimentos_existentes.get(texto(row["empreendimento"]))
+        if not cliente or not empreendimento:
+            continue
+
+        dados_vendas.append(
+            {
+                "cliente": cliente,
+                "empreendimento": empreendimento,
+                "unidade": texto(row["unidade"]),
+                "data_venda": data_venda,
+                "corretor": texto(row["corretor"]),
+                "imobiliaria": texto(row["imobiliaria"]),
+                "etapa": texto(row["etapa"]),
+                "fgts": row["fgts"]
+                if pd.notna(row["fgts"]) and isinstance(row["fgts"], (int, float))
+                else None,
+                "observacoes": texto(row["observacoes"]),
+            }
+        )
+
+    vendas_existentes = {}
+    for v in Venda.objects.filter(tabela_mensal=tabela_mensal):
+        chave = (v.cliente_id, v.empreendimento_id, v.unidade, v.data_venda)
+        vendas_existentes[chave] = v
+
+    vendas_para_criar = []
+    vendas_para_atualizar = []
+    for dados in dados_vendas:
+        chave = (
+            dados["cliente"].id,
+            dados["empreendimento"].id,
+            dados["unidade"],
+            dados["data_venda"],
+        )
+        if chave in vendas_existentes:
+            venda = vendas_existentes[chave]
+            for campo in ("corretor", "imobiliaria", "etapa", "fgts", "observacoes"):
+                setattr(venda, campo, dados[campo])
+            vendas_para_atualizar.append(venda)
+        else:
+            vendas_para_criar.append(Venda(tabela_mensal=tabela_mensal, **dados))
+
+    if vendas_para_criar:
+        Venda.objects.bulk_create(vendas_para_criar)
+    if vendas_para_atualizar:
+        Venda.objects.bulk_update(
+            vendas_para_atualizar,
+            ["corretor", "imobiliaria", "etapa", "fgts", "observacoes"],
+        )
+
+    return {
+        "vendas_criadas": len(vendas_para_criar),
+        "vendas_atualizadas": len(vendas_para_atualizar),
+        "clientes_criados": len(novos_clientes),
+        "empreendimentos_criados": len(novos_empreendimentos),
+    }
+
+
+def executar(linhas=5000, repeticoes=3, seed=42):
+    """
+    Roda as duas implementações sobre a mesma planilha e o mesmo estado do
+    banco (cada execução é desfeita com rollback) e compara linhas/segundo.
+    """
+    mes_referencia = "2025-11"
+    df = gerar_planilha(linhas, mes_referencia, seed)
+    tabela_mensal = TabelaMensal.objects.create(mes_referencia=mes_referencia)
+
+    # Pré-carrega um terço da planilha para exercitar também as atualizações
+    importar_acompanhamento(df.iloc[: linhas // 3], tabela_mensal)
+
+    resultados = {}
+    for nome, funcao in (("legado", importar_legado), ("colunar", importar_acompanhamento)):
+        tempos = []
+        for _ in range(repeticoes):
+            with transaction.atomic():
+                inicio = time.perf_counter()
+                totais = funcao(df, tabela_mensal)
+                tempos.append(time.perf_counter() - inicio)
+                transaction.set_rollback(True)
+
+        melhor = min(tempos)
+        resultados[nome] = {
+            "segundos": round(melhor, 4),
+            "linhas_por_segundo": round(linhas / melhor, 1),
+            "totais": totais,
+        }
+
+    resultados["mesmos_totais"] = (
+        resultados["legado"]["totais"] == resultados["colunar"]["totais"]
+    )
+    resultados["ganho"] = round(
+        resultados["legado"]["segundos"] / resultados["colunar"]["segundos"], 2
+    )
+    return resultados
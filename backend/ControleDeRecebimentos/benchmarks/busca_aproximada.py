@@ -0,0 +1,156 @@
+"""
+Benchmark da busca aproximada de nomes sobre uma base grande de clientes:
+tempo por nome sem casamento exato e taxa de acerto com erros de digitação.
+"""
+import random
+import time
+
+from ControleDeRecebimentos.models import Cliente, Empreendimento, TabelaMensal, Venda
+from ControleDeRecebimentos.services.busca_aproximada import BuscaAproximada
+from ControleDeRecebimentos.services.nomes import normalizar_nome
+
+
+# Nomes com erro buscados em cada rodada
+NOMES_BUSCADOS = 200
+
+
+PRENOMES = [
+    "Ana", "Maria", "José", "João", "Antônio", "Francisco", "Carlos", "Paulo",
+    "Pedro", "Lucas", "Luiz", "Marcos", "Luís", "Gabriel", "Rafael", "Daniel",
+    "Marcelo", "Bruno", "Eduardo", "Felipe", "Juliana", "Fernanda", "Patrícia",
+    "Aline", "Sandra", "Camila", "Amanda", "Bruna", "Jéssica", "Letícia",
+    "Júlia", "Luciana", "Vanessa", "Mariana", "Gabriela", "Thiago", "Rodrigo",
+    "Cecília", "Heloísa", "Ygor",
+]
+SOBRENOMES = [
+    "Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves",
+    "Pereira", "Lima", "Gomes", "Costa", "Ribeiro", "Martins", "Carvalho",
+    "Almeida", "Lopes", "Soares", "Fernandes", "Vieira", "Barbosa", "Rocha",
+    "Dias", "Nascimento", "Andrade", "Moreira", "Nunes", "Marques", "Machado",
+    "Mendes", "Freitas", "Cardoso", "Ramos", "Gonçalves", "Santana", "Teixeira",
+    "Araújo", "Cavalcanti", "Monteiro", "Moura", "Campos", "Batista", "Pinto",
+    "Correia", "Rezende", "Fonseca", "Magalhães", "Queiroz", "Xavier", "Bezerra",
+    "Siqueira",
+]
+
+
+SILABAS = [
+    "ba", "be", "bo", "ca", "co", "cu", "da", "de", "di", "fa", "fe", "ga",
+    "go", "gu", "ja", "jo", "la", "le", "li", "lo", "ma", "me", "mi", "mo",
+    "na", "ne", "no", "pa", "pe", "qui", "ra", "re", "ri", "ro", "sa", "se",
+    "ta", "te", "ti", "to", "va", "ve", "vi", "xa", "za", "zo",
+]
+
+
+def gerar_sobrenome(rnd):
+    """
+    Metade dos sobrenomes vem da lista dos mais comuns e a outra metade é
+    inventada, para a base ter também nomes raros como uma base real.
+    """
+    if rnd.random() < 0.5:
+        return rnd.choice(SOBRENOMES)
+    silabas = rnd.sample(SILABAS, rnd.choice([2, 3, 3, 4]))
+    return "".join(silabas).capitalize()
+
+
+def gerar_nome(rnd):
+    partes = [rnd.choice(PRENOMES)]
+    if rnd.random() < 0.3:
+        partes.append(rnd.choice(PRENOMES))
+    partes.extend(gerar_sobrenome(rnd) for _ in range(rnd.choice([1, 2, 2, 3])))
+    return " ".join(partes)
+
+
+def com_erro(nome, rnd):
+    """
+    Variação do nome como costuma chegar nas planilhas: sem acento, com uma
+    letra trocada ou sem um dos nomes do meio.
+    """
+    palavras = normalizar_nome(nome).split()
+    sorteio = rnd.random()
+    if sorteio < 0.4 and len(palavras) > 2:
+        del palavras[rnd.randrange(1, len(palavras) - 1)]
+    elif sorteio < 0.8:
+        i = rnd.randrange(len(palavras))
+        palavra = palavras[i]
+        j = rnd.randrange(len(palavra))
+        palavras[i] = palavra[:j] + rnd.choice("aeioulrsn") + palavra[j + 1 :]
+    else:
+        palavras = list(reversed(palavras))
+    return " ".join(palavras).upper()
+
+
+def buscar(consultas, esperados):
+    busca = BuscaAproximada(
+        Venda.objects.select_related("cliente"), orcamento=float("inf")
+    )
+    tempos = []
+    acertos = erros = 0
+    for chave, nome in consultas.items():
+        inicio = time.perf_counter()
+        vendas = busca.resolver({chave: nome})
+        tempos.append(time.perf_counter() - inicio)
+        if chave in vendas:
+            if vendas[chave].cliente_id == esperados[chave]:
+                acertos += 1
+            else:
+                erros += 1
+
+    tempos.sort()
+    return {
+        "segundos": round(sum(tempos), 4),
+        "ms_por_nome": {
+            "media": round(sum(tempos) / len(tempos) * 1000, 2),
+            "p95": round(tempos[int(len(tempos) * 0.95) - 1] * 1000, 2),
+            "max": round(tempos[-1] * 1000, 2),
+        },
+        "casados_corretamente": acertos,
+        "casados_errado": erros,
+        "com_sugestoes": busca.total_sugestoes,
+    }
+
+
+def executar(linhas=100000, repeticoes=3, seed=42):
+    """
+    Cria `linhas` clientes com uma venda cada e busca NOMES_BUSCADOS nomes
+    com erro sorteados entre eles, guardando a melhor de `repeticoes`
+    rodadas.
+    """
+    rnd = random.Random(seed)
+    tabela_mensal = TabelaMensal.objects.create(mes_referencia="2025-11")
+    empreendimento = Empreendimento.objects.create(nome="Residencial Benchmark")
+
+    inicio = time.perf_counter()
+    for lote in range(0, linhas, 5000):
+        clientes = Cliente.objects.bulk_create(
+            [Cliente(nome=gerar_nome(rnd)) for _ in range(min(5000, linhas - lote))]
+        )
+        Venda.objects.bulk_create(
+            [
+                Venda(
+                    tabela_mensal=tabela_mensal,
+                    cliente=cliente,
+                    empreendimento=empreendimento,
+                    unidade=str(cliente.id),
+                    data_venda="2025-11-10",
+                )
+                for cliente in clientes
+            ]
+        )
+    carga = time.perf_counter() - inicio
+
+    consultas = {}
+    esperados = {}
+    clientes = list(Cliente.objects.values_list("id", "nome"))
+    for cliente_id, nome in rnd.sample(clientes, min(NOMES_BUSCADOS, len(clientes))):
+        variacao = com_erro(nome, rnd)
+        consultas[normalizar_nome(variacao)] = variacao
+        esperados[normalizar_nome(variacao)] = cliente_id
+
+    rodadas = [buscar(consultas, esperados) for _ in range(max(repeticoes, 1))]
+    return {
+        "clientes": linhas,
+        "carga_segundos": round(carga, 2),
+        "nomes_buscados": len(consultas),
+        **min(rodadas, key=lambda rodada: rodada["segundos"]),
+    }
@@ -0,0 +1,133 @@
+"""
+Benchmark da reutilização de conexões e dos cursores no servidor.
+
+- requisicoes_curtas: sequência de requisições curtas ao
+  FaturarVendasAPIView (uma venda por requisição), disparando os sinais de
+  início e fim de requisição como o servidor faz. Com CONN_MAX_AGE=0 cada
+  requisição abre e fecha a sua conexão; com conexões persistentes ela é
+  reaproveitada, com a verificação de saúde no início de cada requisição.
+  Contra um PostgreSQL hospedado a diferença inclui o handshake TLS; no
+  SQLite o custo de abrir a conexão é pequeno.
+- varredura: leitura de todas as vendas pendentes com select_related, como
+  nas importações, trazendo todas as linhas de uma vez (`list`) ou com
+  cursor no servidor em lotes de DB_LOTE_CURSOR (`iterator`). Informa o
+  tempo até a primeira linha, o tempo total e o pico de memória alocada.
+"""
+import time
+
+from django.conf import settings
+from django.core import signals
+from django.db import connection
+from rest_framework.test import APIRequestFactory
+
+from ControleDeRecebimentos.benchmarks.dados import popular_base
+from ControleDeRecebimentos.models import Venda
+from ControleDeRecebimentos.services.metricas import medir_memoria
+from ControleDeRecebimentos.views.venda_views import FaturarVendasAPIView
+
+
+# Requisições por rodada em cada configuração de conexão
+REQUISICOES = 200
+
+# {nome: (CONN_MAX_AGE, CONN_HEALTH_CHECKS)}
+CONEXOES = {
+    "nova_por_requisicao": (0, False),
+    "persistente": (600, False),
+    "persistente_com_verificacao": (600, True),
+}
+
+
+def configurar_conexao(conn_max_age, health_checks):
+    connection.close()
+    connection.settings_dict["CONN_MAX_AGE"] = conn_max_age
+    connection.settings_dict["CONN_HEALTH_CHECKS"] = health_checks
+
+
+def requisicoes_curtas(ids):
+    """
+    Fatura cada venda de `ids` em uma requisição própria e devolve os
+    segundos gastos.
+    """
+    fabrica = APIRequestFactory()
+    view = FaturarVendasAPIView.as_view()
+    inicio = time.perf_counter()
+    for venda_id in ids:
+        signals.request_started.send(sender=None)
+        try:
+            response = view(
+                fabrica.post("/vendas/faturar/", {"ids": [venda_id]}, format="json")
+            )
+            assert response.status_code == 200, response.data
+        finally:
+            signals.request_finished.send(sender=None)
+    return time.perf_counter() - inicio
+
+
+def medir_conexoes(pendentes, repeticoes):
+    original = (
+        connection.settings_dict["CONN_MAX_AGE"],
+        connection.settings_dict["CONN_HEALTH_CHECKS"],
+    )
+    resultados = {}
+    try:
+        for nome, configuracao in CONEXOES.items():
+            configurar_conexao(*configuracao)
+            tempos = []
+            for _ in range(repeticoes):
+                ids, pendentes = pendentes[:REQUISICOES], pendentes[REQUISICOES:]
+                if len(ids) < REQUISICOES:
+                    return {"erro": "vendas pendentes insuficientes na base"}
+                tempos.append(requisicoes_curtas(ids))
+            melhor = min(tempos)
+            resultados[nome] = {
+                "segundos": round(melhor, 4),
+                "ms_por_requisicao": round(melhor * 1000 / REQUISICOES, 3),
+            }
+    finally:
+        configurar_conexao(*original)
+    return resultados
+
+
+def varrer(vendas, cursor_no_servidor):
+    inicio = time.perf_counter()
+    primeira = None
+    total = 0
+    # .all() para não reaproveitar o cache de resultados do queryset
+    if cursor_no_servidor:
+        linhas = vendas.all().iterator(chunk_size=settings.DB_LOTE_CURSOR)
+    else:
+        linhas = iter(list(vendas.all()))
+    for venda in linhas:
+        if primeira is None:
+            primeira = time.perf_counter() - inicio
+        total += len(venda.cliente.nome_normalizado)
+    return primeira or 0.0, time.perf_counter() - inicio
+
+
+def medir_varredura(repeticoes):
+    vendas = Venda.objects.filter(status="PE").select_related("cliente")
+    resultados = {}
+    for nome, cursor_no_servidor in (("lista", False), ("cursor_servidor", True)):
+        medicoes = [varrer(vendas, cursor_no_servidor) for _ in range(repeticoes)]
+        with medir_memoria(rastrear_alocacoes=True) as memoria:
+            varrer(vendas, cursor_no_servidor)
+        resultados[nome] = {
+            "primeira_linha_ms": round(min(p for p, _ in medicoes) * 1000, 2),
+            "segundos": round(min(s for _, s in medicoes), 4),
+            "pico_alocado_mb": memoria["pico_alocado_mb"],
+        }
+    return resultados
+
+
+def executar(linhas=10000, repeticoes=3, seed=42):
+    base = popular_base(linhas, seed)
+    resultados = {
+        "banco": connection.vendor,
+        "varredura": medir_varredura(repeticoes),
+    }
+    # As requisições faturam vendas, então a varredura vem antes
+    pendentes = list(
+        Venda.objects.filter(status="PE").order_by("id").values_list("id", flat=True)
+    )
+    resultados["requisicoes_curtas"] = medir_conexoes(pendentes, repeticoes)
+    return {"base": base, **resultados}
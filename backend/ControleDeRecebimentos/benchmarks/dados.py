@@ -0,0 +1,83 @@
+"""
+Base sintética e determinística de Cliente/Empreendimento/TabelaMensal/Venda
+para os benchmarks: a mesma `seed` gera sempre os mesmos registros.
+"""
+import random
+import time
+from decimal import Decimal
+
+from django.db import transaction
+
+from ControleDeRecebimentos.benchmarks.busca_aproximada import PRENOMES, SOBRENOMES
+from ControleDeRecebimentos.models import Cliente, Empreendimento, TabelaMensal, Venda
+from ControleDeRecebimentos.services.resumo_mensal import recalcular_resumo_mensal
+
+
+# Tamanhos de base aceitos em `benchmark --escala`
+ESCALAS = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+MESES_BASE = [f"2025-{mes:02d}" for mes in range(1, 13)]
+EMPREENDIMENTOS_BASE = 200
+LOTE = 5000
+
+
+def nome_cliente(rnd, i):
+    """
+    Nome realista e único: o índice no fim evita homônimos, que tornariam o
+    casamento por nome ambíguo.
+    """
+    return f"{rnd.choice(PRENOMES)} {rnd.choice(SOBRENOMES)} {rnd.choice(SOBRENOMES)} {i:07d}"
+
+
+def popular_base(vendas, seed=42):
+    """
+    Cria `vendas` vendas, cada uma de um cliente distinto, distribuídas
+    pelos meses de MESES_BASE. Um terço é à vista, um terço financiado e o
+    resto ainda sem forma de pagamento; 80% estão pendentes.
+    """
+    rnd = random.Random(seed)
+    inicio = time.perf_counter()
+
+    tabelas = [TabelaMensal.objects.create(mes_referencia=mes) for mes in MESES_BASE]
+    empreendimentos = Empreendimento.objects.bulk_create(
+        [
+            Empreendimento(nome=f"RESIDENCIAL {i:03d}")
+            for i in range(EMPREENDIMENTOS_BASE)
+        ]
+    )
+
+    for lote in range(0, vendas, LOTE):
+        with transaction.atomic():
+            clientes = Cliente.objects.bulk_create(
+                [
+                    Cliente(nome=nome_cliente(rnd, i))
+                    for i in range(lote, min(lote + LOTE, vendas))
+                ]
+            )
+            novas = []
+            for cliente in clientes:
+                tabela = rnd.choice(tabelas)
+                valor = Decimal(rnd.randrange(150000, 250000, 1000))
+                novas.append(
+                    Venda(
+                        tabela_mensal=tabela,
+                        cliente=cliente,
+                        empreendimento=rnd.choice(empreendimentos),
+                        unidade=f"BL {rnd.randrange(1, 30):02d} APT {cliente.id}",
+                        data_venda=f"{tabela.mes_referencia}-{rnd.randrange(1, 29):02d}",
+                        forma_pagamento=rnd.choice(["AV", "FI", None]),
+                        status="PE" if rnd.random() < 0.8 else "FA",
+                        valor_venda=valor,
+                        valor_comissao=round(valor * Decimal("0.00195"), 2),
+                    )
+                )
+            Venda.objects.bulk_create(novas)
+
+    recalcular_resumo_mensal()
+
+    return {
+        "vendas": vendas,
+        "meses": len(tabelas),
+        "empreendimentos": len(empreendimentos),
+        "segundos": round(time.perf_counter() - inicio, 2),
+    }
@@ -0,0 +1,171 @@
+"""
+Planilhas sintéticas com o formato das amostras em Utils/, para medir as
+rotas de importação com arquivos de verdade (upload, leitura e gravação).
+
+São geradas com o modo write_only do openpyxl, então mesmo planilhas com
+centenas de milhares de linhas não são montadas inteiras em memória. A EPR
+real é .xls, mas como não há escritor de .xls disponível ela é gerada em
+.xlsx, que a importação também aceita.
+"""
+import random
+import tempfile
+from datetime import datetime, timedelta
+
+from openpyxl import Workbook
+
+from ControleDeRecebimentos.services.importacao import mes_referencia_para_aba
+
+
+CABECALHO_ACOMPANHAMENTO = [
+    "QUANT.", "DATA", "NOME", "CORRETOR", "IMOBILIARIA", "EMPREENDIMENTO",
+    "UNIDADE", "ETAPA", "FGTS", "STATUS", "OBSERVAÇÕES",
+]
+CABECALHO_CONTROLE_GESTORES = [
+    "#", "NOME DO CLIENTE", "STATUS - NF", "STATUS - NF", "EMPREENDIMENTO",
+    "VALOR DO IMÓVEL", "COMISSÃO", "FORMA", "$ CONSTRUT.", "DATA COMPRA",
+    "VENCIMENTO", "IMOB", "CORRETOR", "COORD", "STATUS",
+]
+CABECALHO_WEBROPAY = [
+    "Pagador", "Empreendimento", "Unidade", "Data_da_venda", "Parcelas_totais",
+    "Liberacao", "Numero_parcela", "Vencimento_parcela", "Segunda_via",
+    "Valor_original", "Valor_disponivel", "Status_parcela", "Status_comissão",
+    "Data_resgate",
+]
+CABECALHO_EPR = [
+    "Nome Empreendimento", "Número Contrato", "Nome Mutuário",
+    "CPF/CNPJ Mutuário", "Data de Assinatura", "Data de Registro(CRI)",
+    "Valor de Financiamento", "Valor de Financiamento do Terreno",
+    "Valor de Desconto Subsídio Complementar", "Valor do FGTS",
+    "Valor Recursos Próprios", "Valor de Compra e Venda",
+    "Valor de Avaliação do Imóvel", "Fração Ideal", "Data Inicio Atraso Obra",
+    "Unidade Desligada",
+]
+
+FORMAS_CONTROLE_GESTORES = ["PIX", "FINANCIAMENTO", "FIN + IMOB", "QUITADO", "BOLETO", "--"]
+
+
+def salvar(abas, sufixo=".xlsx"):
+    """
+    Grava {título: (linhas do preâmbulo, cabeçalho, iterável de linhas)} em
+    um arquivo temporário e retorna o arquivo aberto, pronto para upload.
+    """
+    wb = Workbook(write_only=True)
+    for titulo, (preambulo, cabecalho, linhas) in abas.items():
+        ws = wb.create_sheet(titulo)
+        for linha in preambulo:
+            ws.append(linha)
+        ws.append(cabecalho)
+        for linha in linhas:
+            ws.append(linha)
+
+    arquivo = tempfile.NamedTemporaryFile(suffix=sufixo)
+    wb.save(arquivo)
+    arquivo.seek(0)
+    return arquivo
+
+
+def planilha_acompanhamento(nomes, mes_referencia, seed=42):
+    """
+    ACOMPANHAMENTO com uma venda por nome em `mes_referencia`: três linhas
+    de título antes do cabeçalho, datas mistas e células vazias.
+    """
+    rnd = random.Random(seed)
+    ano, mes = (int(parte) for parte in mes_referencia.split("-"))
+    inicio_mes = datetime(ano, mes, 1)
+
+    def linhas():
+        for i, nome in enumerate(nomes):
+            dia = inicio_mes + timedelta(days=rnd.randrange(28))
+            yield [
+                i + 1,
+                dia if rnd.random() < 0.9 else f"{dia:%Y-%m-%d}",
+                f" {nome} ",
+                f"CORRETOR {rnd.randrange(300)}",
+                rnd.choice(["ALCANCE IMOBILIARIA", "CASAL CORRETOR", None]),
+                f"RESIDENCIAL {rnd.randrange(200):03d}",
+                f"BL {rnd.randrange(1, 30):02d} APT {i}",
+                rnd.choice(["1ª ETAPA", "2ª ETAPA"]),
+                rnd.choice([None, round(rnd.uniform(0, 30000), 2)]),
+                None,
+                rnd.choice([None, "sem observações"]),
+            ]
+
+    return salvar(
+        {"Plan1": ([[None, "FECHAMENTOS"], [], []], CABECALHO_ACOMPANHAMENTO, linhas())}
+    )
+
+
+def planilha_controle_gestores(nomes_por_mes, seed=42):
+    """
+    Controle Gestores com uma aba por mês ({"2025-11": nomes, ...}), cada
+    uma com a linha de título antes do cabeçalho, mais uma aba não mensal.
+    """
+    rnd = random.Random(seed)
+
+    def linhas(nomes, mes_referencia):
+        data = datetime.strptime(mes_referencia, "%Y-%m")
+        for i, nome in enumerate(nomes):
+            valor = rnd.randrange(150000, 250000, 1000) - 10
+            yield [
+                10000 + i, nome, None, "SECRE", f"RESIDENCIAL {rnd.randrange(200):03d}",
+                valor, round(valor * 0.00195, 4), rnd.choice(FORMAS_CONTROLE_GESTORES),
+                "--", data, data, "IMOB", "CORRETOR", "COORD", "ENTROU",
+            ]
+
+    abas = {}
+    for mes_referencia, nomes in nomes_por_mes.items():
+        abas[mes_referencia_para_aba(mes_referencia)] = (
+            [[None, "TABELA DE COMISSÕES POR COORDENADOR"]],
+            CABECALHO_CONTROLE_GESTORES,
+            linhas(nomes, mes_referencia),
+        )
+    abas["NOTAS FISCAIS"] = ([[None]], ["NOME", "NF"], iter([]))
+    return salvar(abas)
+
+
+def planilha_webropay(nomes, seed=42):
+    """
+    Uma parcela por pagador, no formato da exportação do WebroPay.
+    """
+    rnd = random.Random(seed)
+    data = datetime(2025, 12, 23)
+
+    def linhas():
+        for nome in nomes:
+            pago = rnd.random() < 0.5
+            yield [
+                nome, f"RESIDENCIAL {rnd.randrange(200):03d}",
+                f"{rnd.randrange(1, 400)} - BLOCO 18",
+                data, rnd.randrange(1, 20), data + timedelta(days=1), 1,
+                data + timedelta(days=3), None, 350.98, 350.98,
+                "Pago" if pago else "Pendente", "pago" if pago else "pendente",
+                "2025-12-24T13:12:51.875Z" if pago else None,
+            ]
+
+    return salvar({"comissoes": ([], CABECALHO_WEBROPAY, linhas())})
+
+
+def planilha_epr(nomes, seed=42):
+    """
+    Aba UNIDADES da EPR com um contrato por mutuário.
+    """
+    rnd = random.Random(seed)
+    data = datetime(2025, 5, 23)
+
+    def linhas():
+        for nome in nomes:
+            financiamento = round(rnd.uniform(120000, 180000), 2)
+            yield [
+                "ACQUA VENTURE EUROPA II  Mod 1", str(rnd.randrange(10**11, 10**12)), nome,
+                str(rnd.randrange(10**9, 10**11)), data, data + timedelta(days=48),
+                financiamento, 18177.2, rnd.choice([0, 5272]), 0,
+                round(rnd.uniform(30000, 50000), 2), 193600, 193600, 18177.2,
+                datetime(2028, 6, 5), "Não",
+            ]
+
+    return salvar(
+        {
+            "UNIDADES": ([], CABECALHO_EPR, linhas()),
+            "CRONOGRAMA": ([], ["Evento", "Data"], iter([])),
+        }
+    )
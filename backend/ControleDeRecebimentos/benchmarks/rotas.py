@@ -0,0 +1,261 @@
+"""
+Linha de base de desempenho das rotas de importação, dashboard e
+listagem sobre uma base sintética (ver dados.py e planilhas.py).
+
+Cada rota é chamada pelo cliente de testes do DRF, como faria o frontend,
+dentro de uma transação desfeita ao final, então todas as rodadas partem
+do mesmo estado do banco. Para cada rota são informados o melhor tempo
+entre as repetições, linhas/segundo (nas rotas que processam linhas), o
+número de queries e, em uma rodada extra com o tracemalloc ligado, o pico
+de memória alocada.
+"""
+import random
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from django.db import transaction
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from ControleDeRecebimentos.benchmarks.dados import nome_cliente, popular_base
+from ControleDeRecebimentos.benchmarks.planilhas import (
+    planilha_acompanhamento,
+    planilha_controle_gestores,
+    planilha_epr,
+    planilha_webropay,
+)
+from ControleDeRecebimentos.models import Venda
+from ControleDeRecebimentos.services.metricas import medir_memoria, medir_queries
+
+
+# Fração das linhas de cada planilha com nomes que não existem na base
+FRACAO_DESCONHECIDOS = 0.05
+
+
+def nomes_de(vendas, quantidade, rnd):
+    """
+    `quantidade` nomes de clientes de `vendas`, com FRACAO_DESCONHECIDOS
+    deles trocados por nomes que não estão na base.
+    """
+    nomes = list(
+        vendas.order_by("id").values_list("cliente__nome", flat=True)[:quantidade]
+    )
+    for i in range(int(len(nomes) * FRACAO_DESCONHECIDOS)):
+        nomes[rnd.randrange(len(nomes))] = f"DESCONHECIDO {i:07d}"
+    return nomes
+
+
+def vendas_do_mes(mes_referencia):
+    return Venda.objects.filter(tabela_mensal__mes_referencia=mes_referencia)
+
+
+def medir(cliente, requisicao, preparar=None, linhas=None, repeticoes=3):
+    """
+    Executa `requisicao(cliente, contexto)` `repeticoes` vezes, mais uma
+    rodada para medir a memória. `preparar(cliente)`, se informado, roda
+    antes de cada rodada, fora da medição, e devolve o `contexto`.
+    """
+    tempos = []
+    for rodada in range(repeticoes + 1):
+        rastrear = rodada == repeticoes
+        with transaction.atomic():
+            contexto = preparar(cliente) if preparar else None
+            with medir_memoria(rastrear_alocacoes=rastrear) as memoria:
+                with medir_queries() as consultas:
+                    inicio = time.perf_counter()
+                    response = requisicao(cliente, contexto)
+                    if response.streaming:
+                        for _ in response.streaming_content:
+                            pass
+                    segundos = time.perf_counter() - inicio
+            transaction.set_rollback(True)
+
+        if response.status_code >= 400:
+            return {"status": response.status_code, "erro": response.data}
+        if not rastrear:
+            tempos.append(segundos)
+            queries = consultas["queries"]
+
+    melhor = min(tempos)
+    resultado = {
+        "status": response.status_code,
+        "segundos": round(melhor, 4),
+        "queries": queries,
+        "pico_alocado_mb": memoria["pico_alocado_mb"],
+        "rss_pico_processo_mb": memoria["rss_pico_processo_mb"],
+    }
+    if linhas:
+        resultado["linhas"] = linhas
+        resultado["linhas_por_segundo"] = round(linhas / melhor, 1)
+    return resultado
+
+
+def enviar(url, arquivo, **campos):
+    def requisicao(cliente, contexto):
+        arquivo.seek(0)
+        return cliente.post(url, {"file": arquivo, **campos}, format="multipart")
+
+    return requisicao
+
+
+def consultar(url):
+    def requisicao(cliente, contexto):
+        return cliente.get(url)
+
+    return requisicao
+
+
+def cenarios(linhas_planilha, rnd, diretorio):
+    """
+    {nome: (requisicao, preparar, linhas)} de cada rota medida.
+    """
+    pendentes = Venda.objects.filter(status="PE")
+    epr = planilha_epr(
+        nomes_de(pendentes.filter(forma_pagamento="FI"), linhas_planilha, rnd)
+    )
+
+    def analisar(cliente):
+        epr.seek(0)
+        return cliente.post(
+            "/import/epr/analisar/", {"file": epr}, format="multipart"
+        ).data["analise_id"]
+
+    def analisar_e_confirmar(cliente):
+        analise_id = analisar(cliente)
+        cliente.post(f"/import/epr/confirmar/{analise_id}/")
+        # Mede a geração da planilha, não o arquivo já em cache
+        shutil.rmtree(Path(diretorio, "analises_epr"), ignore_errors=True)
+        return analise_id
+
+    def sem_copia_colunar(cliente):
+        # Mede a leitura da planilha, não a cópia colunar da rodada anterior
+        shutil.rmtree(Path(diretorio, "colunar"), ignore_errors=True)
+
+    novos = [nome_cliente(rnd, 10**7 + i) for i in range(linhas_planilha)]
+    por_mes = linhas_planilha // 3
+    total = Venda.objects.count()
+
+    return {
+        "import_acompanhamento": (
+            enviar(
+                "/import/acompanhamento/",
+                planilha_acompanhamento(novos, "2026-01"),
+                mes_referencia="2026-01",
+            ),
+            None,
+            linhas_planilha,
+        ),
+        "import_controle_gestores": (
+            enviar(
+                "/import/controle-gestores/",
+                planilha_controle_gestores(
+                    {"2025-11": nomes_de(vendas_do_mes("2025-11"), linhas_planilha, rnd)}
+                ),
+                mes_referencia="2025-11",
+            ),
+            None,
+            linhas_planilha,
+        ),
+        "import_controle_gestores_todas_abas": (
+            enviar(
+                "/import/controle-gestores/",
+                planilha_controle_gestores(
+                    {
+                        mes: nomes_de(vendas_do_mes(mes), por_mes, rnd)
+                        for mes in ["2025-09", "2025-10", "2025-11"]
+                    }
+                ),
+                todas_abas="true",
+            ),
+            None,
+            por_mes * 3,
+        ),
+        "import_webropay": (
+            enviar(
+                "/import/webropay/",
+                planilha_webropay(
+                    nomes_de(pendentes.filter(forma_pagamento="AV"), linhas_planilha, rnd)
+                ),
+            ),
+            None,
+            linhas_planilha,
+        ),
+        "import_epr": (enviar("/import/epr/", epr), None, linhas_planilha),
+        "analisar_epr": (
+            enviar("/import/epr/analisar/", epr),
+            sem_copia_colunar,
+            linhas_planilha,
+        ),
+        "reanalisar_epr": (
+            lambda cliente, analise_id: cliente.post(
+                f"/import/epr/reanalisar/{analise_id}/"
+            ),
+            analisar,
+            linhas_planilha,
+        ),
+        "confirmar_epr": (
+            lambda cliente, analise_id: cliente.post(
+                f"/import/epr/confirmar/{analise_id}/"
+            ),
+            analisar,
+            None,
+        ),
+        "exportar_epr": (
+            lambda cliente, analise_id: cliente.get(
+                f"/export/analise-epr/{analise_id}/"
+            ),
+            analisar_e_confirmar,
+            None,
+        ),
+        "dashboard": (consultar("/dashboard/"), None, None),
+        "dashboard_mes": (consultar("/dashboard/mes/"), None, None),
+        "tabelas_mensais": (consultar("/tabelas-mensais/"), None, None),
+        "listar_vendas": (consultar("/vendas/?page_size=100"), None, None),
+        "listar_vendas_campos": (
+            consultar("/vendas/?page_size=1000&fields=id,cliente_nome,status"),
+            None,
+            None,
+        ),
+        "listar_analises_epr": (consultar("/analises-epr/"), None, None),
+        "exportar_vendas": (consultar("/export/vendas/"), None, total),
+        "recalcular_comissoes": (
+            lambda cliente, contexto: cliente.post("/comissoes/recalcular/"),
+            None,
+            total,
+        ),
+    }
+
+
+def executar(linhas=10000, repeticoes=3, seed=42):
+    """
+    Cria uma base com `linhas` vendas e mede cada rota com planilhas de um
+    décimo desse tamanho (mínimo de 100 linhas).
+    """
+    rnd = random.Random(seed)
+    linhas_planilha = max(linhas // 10, 100)
+    diretorio = tempfile.mkdtemp()
+
+    # Sem cache, para medir o custo das próprias rotas; os arquivos gerados
+    # ficam em um diretório descartável
+    configuracao = override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}},
+        IMPORTACAO_DIR=diretorio,
+        ALLOWED_HOSTS=["testserver"],
+    )
+    try:
+        with configuracao:
+            base = popular_base(linhas, seed)
+            cliente = APIClient()
+            resultados = {}
+            for nome, (requisicao, preparar, linhas_rota) in cenarios(
+                linhas_planilha, rnd, diretorio
+            ).items():
+                resultados[nome] = medir(
+                    cliente, requisicao, preparar, linhas_rota, repeticoes
+                )
+    finally:
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+    return {"base": base, "linhas_planilha": linhas_planilha, "rotas": resultados}
@@ -0,0 +1,96 @@
+import json
+import platform
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = (
+        "Executa os benchmarks de desempenho em um banco de teste descartável "
+        "(criado a partir de DATABASE_URL e destruído ao final)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "benchmarks",
+            nargs="*",
+            help="Benchmarks a executar (padrão: todos).",
+        )
+        parser.add_argument("--linhas", type=int, default=5000)
+        parser.add_argument(
+            "--escala",
+            choices=["10k", "100k", "1m"],
+            help="Tamanho da base (substitui --linhas).",
+        )
+        parser.add_argument(
+            "--saida",
+            help="Grava os resultados neste arquivo JSON, para comparar execuções.",
+        )
+        parser.add_argument("--repeticoes", type=int, default=3)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        from ControleDeRecebimentos.benchmarks import (
+            acompanhamento,
+            busca_aproximada,
+            conexoes,
+            rotas,
+        )
+        from ControleDeRecebimentos.benchmarks.dados import ESCALAS
+
+        disponiveis = {
+            "acompanhamento": acompanhamento.executar,
+            "busca_aproximada": busca_aproximada.executar,
+            "conexoes": conexoes.executar,
+            "rotas": rotas.executar,
+        }
+        if options["escala"]:
+            options["linhas"] = ESCALAS[options["escala"]]
+
+        nomes = options["benchmarks"] or list(disponiveis)
+        desconhecidos = set(nomes) - set(disponiveis)
+        if desconhecidos:
+            raise CommandError(
+                f"Benchmark(s) desconhecido(s): {', '.join(sorted(desconhecidos))}. "
+                f"Disponíveis: {', '.join(disponiveis)}"
+            )
+
+        nome_original = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        resultados = {}
+        try:
+            for i, nome in enumerate(nomes):
+                if i:
+                    # Cada benchmark cria a sua própria base
+                    call_command("flush", interactive=False, verbosity=0)
+                self.stdout.write(f"== {nome} ({options['linhas']} linhas)")
+                resultados[nome] = disponiveis[nome](
+                    linhas=options["linhas"],
+                    repeticoes=options["repeticoes"],
+                    seed=options["seed"],
+                )
+                self.stdout.write(json.dumps(resultados[nome], indent=2, default=str))
+        finally:
+            connection.creation.destroy_test_db(nome_original, verbosity=0)
+
+        if options["saida"]:
+            with open(options["saida"], "w", encoding="utf-8") as saida:
+                json.dump(
+                    {
+                        "executado_em": timezone.now().isoformat(),
+                        "banco": connection.vendor,
+                        "python": platform.python_version(),
+                        "linhas": options["linhas"],
+                        "repeticoes": options["repeticoes"],
+                        "seed": options["seed"],
+                        "resultados": resultados,
+                    },
+                    saida,
+                    indent=2,
+                    default=str,
+                )
+            self.stdout.write(f"Resultados gravados em {options['saida']}")
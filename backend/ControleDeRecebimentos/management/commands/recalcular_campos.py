@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula campos derivados em todas as linhas da tabela (comissao: "
+        "Venda.valor_comissao pelas regras de comissão; nome_normalizado: "
+        "Cliente.nome_normalizado e as chaves da busca aproximada), em faixas "
+        "de id processadas em paralelo. Cada faixa é confirmada ao terminar; "
+        "use --retomar para continuar uma execução interrompida."
+    )
+
+    def add_arguments(self, parser):
+        from ControleDeRecebimentos.services.recalculo import TAREFAS
+
+        parser.add_argument("tarefa", choices=list(TAREFAS))
+        parser.add_argument("--tamanho-lote", type=int, default=50000)
+        parser.add_argument(
+            "--processos", type=int, default=settings.IMPORTACAO_PROCESSOS
+        )
+        parser.add_argument(
+            "--retomar",
+            action="store_true",
+            help="Pula as faixas concluídas pela última execução interrompida.",
+        )
+
+    def handle(self, *args, **options):
+        from ControleDeRecebimentos.services.recalculo import recalcular
+
+        def relatar(progresso):
+            self.stdout.write(
+                f"{progresso['faixas_concluidas']}/{progresso['faixas_total']} faixas, "
+                f"{progresso['linhas']} linhas, "
+                f"{progresso['linhas_por_segundo']:.0f} linhas/s"
+            )
+
+        resultado = recalcular(
+            options["tarefa"],
+            tamanho_lote=options["tamanho_lote"],
+            processos=options["processos"],
+            retomar=options["retomar"],
+            relatar=relatar,
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Concluído: {resultado['linhas']} linhas em {resultado['segundos']}s."
+            )
+        )
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from ControleDeRecebimentos.models import ResumoMensal
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula a tabela ResumoMensal a partir das vendas. Use depois de "
+        "alterações feitas direto no banco."
+    )
+
+    def handle(self, *args, **options):
+        from ControleDeRecebimentos.services.resumo_mensal import (
+            recalcular_resumo_mensal,
+        )
+        from ControleDeRecebimentos.services.versao_vendas import (
+            invalidar_cache_vendas,
+        )
+
+        recalcular_resumo_mensal()
+        invalidar_cache_vendas()
+        self.stdout.write(
+            f"Resumo mensal reconstruído: {ResumoMensal.objects.count()} linhas."
+        )
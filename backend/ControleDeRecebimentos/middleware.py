@@ -0,0 +1,129 @@
+"""
+Middlewares do backend.
+
+Instrumentação opcional das requisições (INSTRUMENTACAO_ATIVA).
+
+Para cada requisição registra o número de queries, o tempo total no banco,
+as queries mais lentas e o tempo da view, e os expõe no cabeçalho
+`Server-Timing` e em um log JSON no logger
+"ControleDeRecebimentos.instrumentacao". Requisições acima de
+INSTRUMENTACAO_LIMIAR_MS são logadas como WARNING com a lista completa de
+queries. Só o SQL é registrado, nunca os parâmetros, que podem conter dados
+de clientes.
+
+Em respostas em streaming, as queries feitas enquanto o corpo é enviado
+não entram na medição.
+"""
+import json
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from ControleDeRecebimentos.roteador import COOKIE_PRIMARIO, replica_disponivel
+
+
+logger = logging.getLogger("ControleDeRecebimentos.instrumentacao")
+
+# Queries mais lentas incluídas no log de toda requisição
+QUERIES_LENTAS = 5
+
+
+class MedicaoQueries:
+    """
+    execute_wrapper que guarda o SQL e a duração de cada query.
+    """
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append(
+                {
+                    "sql": sql,
+                    "ms": round((time.perf_counter() - inicio) * 1000, 2),
+                    "banco": context["connection"].alias,
+                }
+            )
+
+    @property
+    def tempo_ms(self):
+        return round(sum(query["ms"] for query in self.queries), 2)
+
+    def mais_lentas(self, quantidade):
+        return sorted(self.queries, key=lambda query: -query["ms"])[:quantidade]
+
+
+class InstrumentacaoMiddleware:
+    def __init__(self, get_response):
+        if not settings.INSTRUMENTACAO_ATIVA:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        medicao = MedicaoQueries()
+        inicio = time.perf_counter()
+        with ExitStack() as pilha:
+            for conexao in connections.all():
+                pilha.enter_context(conexao.execute_wrapper(medicao))
+            response = self.get_response(request)
+        tempo_view = round((time.perf_counter() - inicio) * 1000, 2)
+
+        response["Server-Timing"] = (
+            f'db;dur={medicao.tempo_ms};desc="{len(medicao.queries)} queries", '
+            f"view;dur={tempo_view}"
+        )
+
+        resolver_match = getattr(request, "resolver_match", None)
+        dados = {
+            "metodo": request.method,
+            "caminho": request.path,
+            "view": resolver_match.view_name if resolver_match else None,
+            "status": response.status_code,
+            "view_ms": tempo_view,
+            "db_ms": medicao.tempo_ms,
+            "queries": len(medicao.queries),
+        }
+
+        if tempo_view >= settings.INSTRUMENTACAO_LIMIAR_MS:
+            dados["lista_queries"] = medicao.queries
+            logger.warning(json.dumps(dados), extra={"instrumentacao": dados})
+        else:
+            dados["queries_lentas"] = medicao.mais_lentas(QUERIES_LENTAS)
+            logger.info(json.dumps(dados), extra={"instrumentacao": dados})
+
+        return response
+
+
+class FixarPrimarioMiddleware:
+    """
+    Depois de uma gravação bem-sucedida, marca o cliente com um cookie que
+    faz as suas leituras usarem o banco principal por
+    REPLICA_JANELA_SEGUNDOS (ver roteador.py). Sem réplica, não é carregado.
+    """
+
+    METODOS_ESCRITA = {"POST", "PUT", "PATCH", "DELETE"}
+
+    def __init__(self, get_response):
+        if not replica_disponivel():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if request.method in self.METODOS_ESCRITA and response.status_code < 400:
+            response.set_cookie(
+                COOKIE_PRIMARIO,
+                "1",
+                max_age=settings.REPLICA_JANELA_SEGUNDOS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
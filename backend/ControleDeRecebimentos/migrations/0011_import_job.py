@@ -0,0 +1,36 @@
+# Generated by Django 5.2.7 on 2026-10-18 08:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ControleDeRecebimentos', '0010_analise_epr'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('AC', 'Acompanhamento'), ('CG', 'Controle Gestores'), ('WP', 'WebroPay'), ('EP', 'Análise EPR')], max_length=2)),
+                ('status', models.CharField(choices=[('PE', 'Pendente'), ('EX', 'Em execução'), ('CO', 'Concluído'), ('ER', 'Erro')], default='PE', max_length=2)),
+                ('etapa', models.CharField(default='Na fila', max_length=50)),
+                ('parametros', models.JSONField(default=dict)),
+                ('arquivo', models.CharField(max_length=500)),
+                ('linhas_total', models.IntegerField(blank=True, null=True)),
+                ('linhas_processadas', models.IntegerField(default=0)),
+                ('resultado', models.JSONField(blank=True, null=True)),
+                ('erro', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('iniciado_em', models.DateTimeField(blank=True, null=True)),
+                ('finalizado_em', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Job de Importação',
+                'verbose_name_plural': 'Jobs de Importação',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.7 on 2026-10-18 08:26
+
+from django.db import migrations, models
+
+from ControleDeRecebimentos.services.nomes import normalizar_nome
+
+
+def preencher_nome_normalizado(apps, schema_editor):
+    Cliente = apps.get_model("ControleDeRecebimentos", "Cliente")
+    lote = []
+    for cliente in Cliente.objects.only("id", "nome").iterator(chunk_size=2000):
+        cliente.nome_normalizado = normalizar_nome(cliente.nome)
+        lote.append(cliente)
+        if len(lote) >= 2000:
+            Cliente.objects.bulk_update(lote, ["nome_normalizado"])
+            lote = []
+    if lote:
+        Cliente.objects.bulk_update(lote, ["nome_normalizado"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ControleDeRecebimentos', '0011_import_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cliente',
+            name='nome_normalizado',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=250),
+        ),
+        migrations.RunPython(preencher_nome_normalizado, migrations.RunPython.noop),
+    ]
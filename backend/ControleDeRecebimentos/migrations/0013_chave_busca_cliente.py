@@ -0,0 +1,44 @@
+# Generated by Django 5.2.7 on 2026-10-18 08:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from ControleDeRecebimentos.services.nomes import chaves_busca
+
+
+def preencher_chaves_busca(apps, schema_editor):
+    Cliente = apps.get_model("ControleDeRecebimentos", "Cliente")
+    ChaveBuscaCliente = apps.get_model("ControleDeRecebimentos", "ChaveBuscaCliente")
+    lote = []
+    for cliente in Cliente.objects.only("id", "nome").iterator(chunk_size=2000):
+        lote.extend(
+            ChaveBuscaCliente(cliente_id=cliente.id, chave=chave)
+            for chave in sorted(chaves_busca(cliente.nome))
+        )
+        if len(lote) >= 2000:
+            ChaveBuscaCliente.objects.bulk_create(lote)
+            lote = []
+    if lote:
+        ChaveBuscaCliente.objects.bulk_create(lote)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ControleDeRecebimentos', '0012_cliente_nome_normalizado'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChaveBuscaCliente',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('chave', models.CharField(max_length=100)),
+                ('cliente', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chaves_busca', to='ControleDeRecebimentos.cliente')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['chave', 'cliente'], name='ControleDeR_chave_001f40_idx')],
+            },
+        ),
+        migrations.RunPython(preencher_chaves_busca, migrations.RunPython.noop),
+    ]
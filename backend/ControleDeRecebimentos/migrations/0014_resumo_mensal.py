@@ -0,0 +1,51 @@
+# Generated by Django 5.2.7 on 2026-10-18 08:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def preencher_resumo_mensal(apps, schema_editor):
+    Venda = apps.get_model("ControleDeRecebimentos", "Venda")
+    ResumoMensal = apps.get_model("ControleDeRecebimentos", "ResumoMensal")
+    totais = (
+        Venda.objects.values("tabela_mensal_id", "status")
+        .annotate(total_vendas=Count("id"), total_comissao=Sum("valor_comissao"))
+        .order_by()
+    )
+    ResumoMensal.objects.bulk_create(
+        [
+            ResumoMensal(
+                tabela_mensal_id=linha["tabela_mensal_id"],
+                status=linha["status"],
+                total_vendas=linha["total_vendas"],
+                total_comissao=linha["total_comissao"] or 0,
+            )
+            for linha in totais
+        ]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ControleDeRecebimentos', '0013_chave_busca_cliente'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumoMensal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('PE', 'Pendente'), ('FA', 'Faturado')], max_length=2)),
+                ('total_vendas', models.PositiveIntegerField(default=0)),
+                ('total_comissao', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('atualizado_em', models.DateTimeField(auto_now=True)),
+                ('tabela_mensal', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resumos', to='ControleDeRecebimentos.tabelamensal')),
+            ],
+            options={
+                'unique_together': {('tabela_mensal', 'status')},
+            },
+        ),
+        migrations.RunPython(preencher_resumo_mensal, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-18 08:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ControleDeRecebimentos', '0014_resumo_mensal'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='venda',
+            index=models.Index(fields=['tabela_mensal', 'status', 'id'], name='ControleDeR_tabela__c5a3f4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='venda',
+            index=models.Index(fields=['status', 'id'], name='ControleDeR_status_32d6e7_idx'),
+        ),
+    ]
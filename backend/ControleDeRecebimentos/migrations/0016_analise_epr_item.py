@@ -0,0 +1,124 @@
+# Generated by Django 5.2.7 on 2026-10-18 08:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+TEXTOS = [
+    "nome_empreendimento",
+    "numero_contrato",
+    "nome_mutuario",
+    "cpf_cnpj",
+    "data_assinatura",
+    "empreendimento_sistema",
+]
+VALORES = [
+    "valor_financiamento",
+    "valor_financiamento_terreno",
+    "valor_subsidio",
+    "valor_fgts",
+    "valor_recursos_proprios",
+    "valor_compra_venda",
+    "valor_comissao",
+]
+
+
+def preencher_itens(apps, schema_editor):
+    """
+    Copia as linhas de AnaliseEPR.dados_epr para AnaliseEPRItem. Vendas ou
+    meses que não existem mais ficam nulos no item.
+    """
+    AnaliseEPR = apps.get_model("ControleDeRecebimentos", "AnaliseEPR")
+    AnaliseEPRItem = apps.get_model("ControleDeRecebimentos", "AnaliseEPRItem")
+    Venda = apps.get_model("ControleDeRecebimentos", "Venda")
+    TabelaMensal = apps.get_model("ControleDeRecebimentos", "TabelaMensal")
+
+    for analise_id, dados_epr in AnaliseEPR.objects.values_list("id", "dados_epr").iterator():
+        dados_epr = dados_epr or []
+        vendas = set(
+            Venda.objects.filter(
+                id__in={d.get("venda_id") for d in dados_epr}
+            ).values_list("id", flat=True)
+        )
+        tabelas = set(
+            TabelaMensal.objects.filter(
+                id__in={d.get("tabela_mensal_id") for d in dados_epr}
+            ).values_list("id", flat=True)
+        )
+        AnaliseEPRItem.objects.bulk_create(
+            [
+                AnaliseEPRItem(
+                    analise_id=analise_id,
+                    venda_id=d.get("venda_id") if d.get("venda_id") in vendas else None,
+                    tabela_mensal_id=(
+                        d.get("tabela_mensal_id")
+                        if d.get("tabela_mensal_id") in tabelas
+                        else None
+                    ),
+                    mes_referencia=d.get("mes_referencia"),
+                    **{campo: d.get(campo) or "" for campo in TEXTOS},
+                    **{campo: round(d.get(campo) or 0, 2) for campo in VALORES},
+                )
+                for d in dados_epr
+            ],
+            batch_size=1000,
+        )
+
+
+def restaurar_dados_epr(apps, schema_editor):
+    AnaliseEPR = apps.get_model("ControleDeRecebimentos", "AnaliseEPR")
+    AnaliseEPRItem = apps.get_model("ControleDeRecebimentos", "AnaliseEPRItem")
+
+    for analise in AnaliseEPR.objects.iterator():
+        dados_epr = []
+        for item in AnaliseEPRItem.objects.filter(analise_id=analise.id).order_by("id"):
+            dados_epr.append(
+                {
+                    "venda_id": item.venda_id,
+                    **{campo: getattr(item, campo) for campo in TEXTOS},
+                    **{campo: float(getattr(item, campo)) for campo in VALORES},
+                    "tabela_mensal_id": item.tabela_mensal_id,
+                    "mes_referencia": item.mes_referencia,
+                }
+            )
+        analise.dados_epr = dados_epr
+        analise.vendas_ids = [d["venda_id"] for d in dados_epr if d["venda_id"]]
+        analise.save(update_fields=["dados_epr", "vendas_ids"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ControleDeRecebimentos', '0015_venda_indices_listagem'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnaliseEPRItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mes_referencia', models.CharField(blank=True, max_length=7, null=True)),
+                ('nome_empreendimento', models.TextField(blank=True)),
+                ('numero_contrato', models.TextField(blank=True)),
+                ('nome_mutuario', models.TextField()),
+                ('cpf_cnpj', models.TextField(blank=True)),
+                ('data_assinatura', models.TextField(blank=True)),
+                ('valor_financiamento', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('valor_financiamento_terreno', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('valor_subsidio', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('valor_fgts', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('valor_recursos_proprios', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('valor_compra_venda', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('valor_comissao', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('empreendimento_sistema', models.CharField(blank=True, max_length=200)),
+                ('analise', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='itens', to='ControleDeRecebimentos.analiseepr')),
+                ('tabela_mensal', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='ControleDeRecebimentos.tabelamensal')),
+                ('venda', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='itens_analise_epr', to='ControleDeRecebimentos.venda')),
+            ],
+            options={
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['analise', 'mes_referencia'], name='ControleDeR_analise_a104c2_idx'), models.Index(fields=['analise', 'venda'], name='ControleDeR_analise_acc1e5_idx')],
+            },
+        ),
+        migrations.RunPython(preencher_itens, restaurar_dados_epr),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-18 08:55
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ControleDeRecebimentos', '0016_analise_epr_item'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='analiseepr',
+            name='dados_epr',
+        ),
+        migrations.RemoveField(
+            model_name='analiseepr',
+            name='vendas_ids',
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.7 on 2026-10-18 08:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ControleDeRecebimentos', '0017_remove_blobs_analise_epr'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='analiseepr',
+            name='atualizado_em',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='analiseepr',
+            index=models.Index(fields=['status', '-created_at'], name='ControleDeR_status_6d73d9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='analiseepr',
+            index=models.Index(fields=['-created_at'], name='ControleDeR_created_9ab118_idx'),
+        ),
+    ]
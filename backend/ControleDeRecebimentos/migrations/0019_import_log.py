@@ -0,0 +1,34 @@
+# Generated by Django 5.2.7 on 2026-10-18 09:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ControleDeRecebimentos', '0018_analise_epr_listagem'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('AC', 'Acompanhamento'), ('CG', 'Controle Gestores'), ('WP', 'WebroPay'), ('EF', 'Faturamento EPR')], max_length=2)),
+                ('hash_arquivo', models.CharField(db_index=True, max_length=64)),
+                ('chave', models.CharField(max_length=64, unique=True)),
+                ('nome_arquivo', models.CharField(blank=True, max_length=255)),
+                ('tamanho_bytes', models.BigIntegerField(default=0)),
+                ('parametros', models.JSONField(default=dict)),
+                ('resultado', models.JSONField(default=dict)),
+                ('reenvios', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('atualizado_em', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Registro de Importação',
+                'verbose_name_plural': 'Registros de Importação',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
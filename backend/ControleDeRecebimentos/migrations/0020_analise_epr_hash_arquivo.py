@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 09:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ControleDeRecebimentos', '0019_import_log'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='analiseepr',
+            name='hash_arquivo',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.7 on 2026-10-18 09:12
+
+import datetime
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def criar_regra_padrao(apps, schema_editor):
+    # A taxa que era fixa na importação do controle dos gestores
+    RegraComissao = apps.get_model("ControleDeRecebimentos", "RegraComissao")
+    RegraComissao.objects.create(
+        taxa=Decimal("0.00195"), vigente_desde=datetime.date(2000, 1, 1)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ControleDeRecebimentos', '0020_analise_epr_hash_arquivo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RegraComissao',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('taxa', models.DecimalField(decimal_places=6, max_digits=9)),
+                ('vigente_desde', models.DateField()),
+                ('forma_pagamento', models.CharField(blank=True, choices=[('AV', 'À Vista'), ('FI', 'Financiado'), ('DS', 'Desconto')], max_length=2, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('empreendimento', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='regras_comissao', to='ControleDeRecebimentos.empreendimento')),
+            ],
+            options={
+                'verbose_name': 'Regra de Comissão',
+                'verbose_name_plural': 'Regras de Comissão',
+                'ordering': ['vigente_desde', 'id'],
+            },
+        ),
+        migrations.RunPython(criar_regra_padrao, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.7 on 2026-10-18 09:31
+
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def remover_itens_repetidos(apps, schema_editor):
+    """
+    Mantém um item por (análise, venda), o da última linha da planilha, e
+    recalcula os totais das análises afetadas.
+    """
+    AnaliseEPR = apps.get_model("ControleDeRecebimentos", "AnaliseEPR")
+    AnaliseEPRItem = apps.get_model("ControleDeRecebimentos", "AnaliseEPRItem")
+
+    repetidos = (
+        AnaliseEPRItem.objects.filter(venda__isnull=False)
+        .values("analise_id", "venda_id")
+        .annotate(total=Count("id"), ultimo=Max("id"))
+        .filter(total__gt=1)
+    )
+    analises = set()
+    for grupo in repetidos.iterator():
+        AnaliseEPRItem.objects.filter(
+            analise_id=grupo["analise_id"], venda_id=grupo["venda_id"]
+        ).exclude(id=grupo["ultimo"]).delete()
+        analises.add(grupo["analise_id"])
+
+    for analise in AnaliseEPR.objects.filter(id__in=analises):
+        itens = AnaliseEPRItem.objects.filter(analise_id=analise.id)
+        analise.total_encontradas = itens.count()
+        analise.resumo_por_mes = dict(
+            itens.filter(mes_referencia__isnull=False)
+            .values_list("mes_referencia")
+            .annotate(total=Count("id"))
+            .order_by()
+        )
+        analise.save(update_fields=["total_encontradas", "resumo_por_mes"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ControleDeRecebimentos', '0021_regra_comissao'),
+    ]
+
+    operations = [
+        migrations.RunPython(remover_itens_repetidos, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='analiseepritem',
+            name='ControleDeR_analise_acc1e5_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='analiseepritem',
+            constraint=models.UniqueConstraint(fields=('analise', 'venda'), name='analise_epr_item_unico'),
+        ),
+    ]
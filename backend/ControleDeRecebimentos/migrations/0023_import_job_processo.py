@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-18 09:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ControleDeRecebimentos', '0022_analise_epr_item_unico'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importjob',
+            name='atualizado_em',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='importjob',
+            name='processo',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+    ]
@@ -0,0 +1,51 @@
+from django.db import models
+
+from ControleDeRecebimentos.models import AnaliseEPR, TabelaMensal, Venda
+
+
+class AnaliseEPRItem(models.Model):
+    """
+    Uma linha da planilha EPR casada com uma venda na análise. Guarda os
+    dados usados para gerar a planilha de recebimentos depois da
+    confirmação.
+    """
+
+    analise = models.ForeignKey(
+        AnaliseEPR, on_delete=models.CASCADE, related_name="itens"
+    )
+    venda = models.ForeignKey(
+        Venda, on_delete=models.SET_NULL, null=True, related_name="itens_analise_epr"
+    )
+    tabela_mensal = models.ForeignKey(
+        TabelaMensal, on_delete=models.SET_NULL, null=True, blank=True
+    )
+    mes_referencia = models.CharField(max_length=7, null=True, blank=True)
+
+    # Dados da planilha EPR
+    nome_empreendimento = models.TextField(blank=True)
+    numero_contrato = models.TextField(blank=True)
+    nome_mutuario = models.TextField()
+    cpf_cnpj = models.TextField(blank=True)
+    data_assinatura = models.TextField(blank=True)
+    valor_financiamento = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    valor_financiamento_terreno = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    valor_subsidio = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    valor_fgts = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    valor_recursos_proprios = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    valor_compra_venda = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    # Dados da venda para o relatório
+    valor_comissao = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    empreendimento_sistema = models.CharField(max_length=200, blank=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [models.Index(fields=["analise", "mes_referencia"])]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["analise", "venda"], name="analise_epr_item_unico"
+            )
+        ]
+
+    def __str__(self):
+        return f"Análise EPR #{self.analise_id} - {self.nome_mutuario}"
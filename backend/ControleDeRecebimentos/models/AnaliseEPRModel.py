@@ -11,13 +11,10 @@ class AnaliseEPR(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     status = models.CharField(max_length=2, choices=STATUS_CHOICES, default="PE")
     confirmado_em = models.DateTimeField(null=True, blank=True)
+    atualizado_em = models.DateTimeField(auto_now=True)
 
-    # IDs das vendas encontradas (para atualizar status depois)
-    vendas_ids = models.JSONField(default=list)
-
-    # Dados completos da EPR para geração da planilha
-    # Estrutura: [{"venda_id": 1, "dados_epr": {...}}, ...]
-    dados_epr = models.JSONField(default=list)
+    # As vendas encontradas e os dados da EPR de cada uma ficam em
+    # AnaliseEPRItem (related_name "itens")
 
     # Resumo para exibição rápida
     total_encontradas = models.IntegerField(default=0)
@@ -25,10 +22,19 @@ class AnaliseEPR(models.Model):
     # Resumo por mês: {"2025-11": 10, "2025-10": 5}
     resumo_por_mes = models.JSONField(default=dict)
 
+    # SHA-256 da planilha analisada, que localiza a sua cópia colunar para
+    # reanálises sem novo upload
+    hash_arquivo = models.CharField(max_length=64, null=True, blank=True)
+
     class Meta:
         verbose_name = "Análise EPR"
         verbose_name_plural = "Análises EPR"
         ordering = ["-created_at"]
+        indexes = [
+            # Listagem filtrada por status e/ou período, mais recentes primeiro
+            models.Index(fields=["status", "-created_at"]),
+            models.Index(fields=["-created_at"]),
+        ]
 
     def __str__(self):
         return f"Análise EPR #{self.id} - {self.get_status_display()} ({self.total_encontradas} vendas)"
\ No newline at end of file
@@ -0,0 +1,22 @@
+from django.db import models
+
+from ControleDeRecebimentos.models import Cliente
+
+
+class ChaveBuscaCliente(models.Model):
+    """
+    Índice de bloqueio da busca aproximada de nomes: uma linha por chave
+    fonética de cada palavra do nome do cliente. Mantido pelo próprio
+    Cliente (ver ClienteModel).
+    """
+
+    cliente = models.ForeignKey(
+        Cliente, on_delete=models.CASCADE, related_name="chaves_busca"
+    )
+    chave = models.CharField(max_length=100)
+
+    class Meta:
+        indexes = [models.Index(fields=["chave", "cliente"])]
+
+    def __str__(self):
+        return f"{self.chave} -> {self.cliente_id}"
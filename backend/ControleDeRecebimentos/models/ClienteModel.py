@@ -1,9 +1,88 @@
-from django.db import models
+from django.db import connections, models, transaction
+
+from ControleDeRecebimentos.services.nomes import chaves_busca, normalizar_nome
+
+
+def indexar_chaves_busca(clientes, novos=False, using="default"):
+    """
+    Regrava as chaves da busca aproximada (ChaveBuscaCliente) dos clientes.
+
+    São várias chaves por cliente, então a inserção é feita com um único
+    executemany em vez de instanciar um model por chave.
+    """
+    from ControleDeRecebimentos.models import ChaveBuscaCliente
+
+    clientes = [cliente for cliente in clientes if cliente.pk]
+    if not clientes:
+        return
+    if not novos:
+        ChaveBuscaCliente.objects.using(using).filter(
+            cliente_id__in=[cliente.pk for cliente in clientes]
+        ).delete()
+
+    linhas = [
+        (cliente.pk, chave)
+        for cliente in clientes
+        for chave in sorted(chaves_busca(cliente.nome))
+    ]
+    connection = connections[using]
+    tabela = connection.ops.quote_name(ChaveBuscaCliente._meta.db_table)
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        cursor.executemany(
+            f"INSERT INTO {tabela} (cliente_id, chave) VALUES (%s, %s)", linhas
+        )
+
+
+class ClienteQuerySet(models.QuerySet):
+    """
+    Mantém `nome_normalizado` e as chaves de busca sincronizados também nas
+    operações em lote, que não passam pelo `save()`. Atualizações via
+    `.update(nome=...)` não são cobertas.
+    """
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        for obj in objs:
+            obj.nome_normalizado = normalizar_nome(obj.nome)
+        criados = super().bulk_create(objs, *args, **kwargs)
+        indexar_chaves_busca(
+            criados, novos=not kwargs.get("update_conflicts"), using=self.db
+        )
+        return criados
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        if "nome" in fields:
+            for obj in objs:
+                obj.nome_normalizado = normalizar_nome(obj.nome)
+            fields = [*fields, "nome_normalizado"]
+        atualizados = super().bulk_update(objs, fields, *args, **kwargs)
+        if "nome" in fields:
+            indexar_chaves_busca(objs, using=self.db)
+        return atualizados
+
 
 class Cliente(models.Model):
     nome = models.CharField(max_length=200)
+    # Chave indexada usada para casar nomes vindos das planilhas
+    nome_normalizado = models.CharField(
+        max_length=250, db_index=True, editable=False, default=""
+    )
     cpf = models.CharField(max_length=100, unique=True, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    
+
+    objects = ClienteQuerySet.as_manager()
+
+    def save(self, *args, **kwargs):
+        novo = self._state.adding
+        anterior = self.nome_normalizado
+        self.nome_normalizado = normalizar_nome(self.nome)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "nome" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "nome_normalizado"}
+        super().save(*args, **kwargs)
+        if novo or self.nome_normalizado != anterior:
+            indexar_chaves_busca([self], novos=novo, using=self._state.db)
+
     def __str__(self):
-        return self.nome
\ No newline at end of file
+        return self.nome
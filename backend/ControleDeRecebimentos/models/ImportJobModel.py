@@ -0,0 +1,62 @@
+from django.db import models
+from django.utils import timezone
+
+
+class ImportJob(models.Model):
+    TIPO_CHOICES = [
+        ("AC", "Acompanhamento"),
+        ("CG", "Controle Gestores"),
+        ("WP", "WebroPay"),
+        ("EP", "Análise EPR"),
+    ]
+
+    STATUS_CHOICES = [
+        ("PE", "Pendente"),
+        ("EX", "Em execução"),
+        ("CO", "Concluído"),
+        ("ER", "Erro"),
+    ]
+
+    tipo = models.CharField(max_length=2, choices=TIPO_CHOICES)
+    status = models.CharField(max_length=2, choices=STATUS_CHOICES, default="PE")
+    etapa = models.CharField(max_length=50, default="Na fila")
+
+    # Parâmetros do formulário (ex: {"mes_referencia": "2025-11"})
+    parametros = models.JSONField(default=dict)
+    # Caminho do arquivo enviado, salvo até o job terminar
+    arquivo = models.CharField(max_length=500)
+
+    linhas_total = models.IntegerField(null=True, blank=True)
+    linhas_processadas = models.IntegerField(default=0)
+
+    # Mesmo corpo que a rota síncrona devolveria
+    resultado = models.JSONField(null=True, blank=True)
+    erro = models.TextField(null=True, blank=True)
+
+    # Processo (host:pid) que executa o job e última vez que ele gravou
+    # progresso, para detectar jobs abandonados (ver services/jobs.py)
+    processo = models.CharField(max_length=100, blank=True)
+    atualizado_em = models.DateTimeField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    iniciado_em = models.DateTimeField(null=True, blank=True)
+    finalizado_em = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Job de Importação"
+        verbose_name_plural = "Jobs de Importação"
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"Importação #{self.id} - {self.get_tipo_display()} ({self.get_status_display()})"
+
+    @property
+    def eta_segundos(self):
+        """
+        Estimativa do tempo restante a partir da vazão observada até agora.
+        """
+        if self.status != "EX" or not self.linhas_processadas or not self.linhas_total:
+            return None
+        decorrido = (timezone.now() - self.iniciado_em).total_seconds()
+        restantes = max(self.linhas_total - self.linhas_processadas, 0)
+        return round(decorrido / self.linhas_processadas * restantes, 1)
@@ -0,0 +1,41 @@
+from django.db import models
+
+
+class ImportLog(models.Model):
+    """
+    Registro de uma importação concluída: o hash do arquivo enviado, a rota,
+    os parâmetros e o resultado devolvido. Um reenvio do mesmo arquivo com
+    os mesmos parâmetros devolve este resultado sem reprocessar a planilha
+    (ver services/registro_importacao.py).
+    """
+
+    TIPO_CHOICES = [
+        ("AC", "Acompanhamento"),
+        ("CG", "Controle Gestores"),
+        ("WP", "WebroPay"),
+        ("EF", "Faturamento EPR"),
+    ]
+
+    tipo = models.CharField(max_length=2, choices=TIPO_CHOICES)
+    # SHA-256 do conteúdo; o arquivo fica guardado em IMPORTACAO_DIR/arquivos
+    hash_arquivo = models.CharField(max_length=64, db_index=True)
+    # SHA-256 de (tipo, hash_arquivo, parametros), usado na busca do reenvio
+    chave = models.CharField(max_length=64, unique=True)
+    nome_arquivo = models.CharField(max_length=255, blank=True)
+    tamanho_bytes = models.BigIntegerField(default=0)
+
+    parametros = models.JSONField(default=dict)
+    resultado = models.JSONField(default=dict)
+
+    # Reenvios respondidos com o resultado guardado
+    reenvios = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    atualizado_em = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Registro de Importação"
+        verbose_name_plural = "Registros de Importação"
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.get_tipo_display()} {self.hash_arquivo[:12]} ({self.created_at:%Y-%m-%d %H:%M})"
@@ -0,0 +1,53 @@
+from decimal import Decimal
+
+from django.db import models
+
+from ControleDeRecebimentos.models import Empreendimento, Venda
+
+
+# Taxa usada antes das regras configuráveis (0,195% do valor da venda)
+TAXA_COMISSAO_PADRAO = Decimal("0.00195")
+
+
+class RegraComissao(models.Model):
+    """
+    Taxa de comissão sobre o valor da venda, válida para as vendas com
+    data_venda a partir de `vigente_desde`. Sem empreendimento e/ou forma de
+    pagamento, a regra vale para todos.
+
+    Quando mais de uma regra se aplica a uma venda, prevalece a mais
+    específica (empreendimento e forma, só empreendimento, só forma, geral)
+    e, entre as igualmente específicas, a de vigência mais recente. Ver
+    services/comissao.py.
+    """
+
+    taxa = models.DecimalField(max_digits=9, decimal_places=6)
+    vigente_desde = models.DateField()
+    empreendimento = models.ForeignKey(
+        Empreendimento,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="regras_comissao",
+    )
+    forma_pagamento = models.CharField(
+        max_length=2,
+        choices=Venda.FormaPagamento.choices,
+        null=True,
+        blank=True,
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Regra de Comissão"
+        verbose_name_plural = "Regras de Comissão"
+        ordering = ["vigente_desde", "id"]
+
+    @property
+    def especificidade(self):
+        return 2 * (self.empreendimento_id is not None) + (
+            self.forma_pagamento is not None
+        )
+
+    def __str__(self):
+        return f"{self.taxa} desde {self.vigente_desde}"
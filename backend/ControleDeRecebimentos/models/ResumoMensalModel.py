@@ -0,0 +1,24 @@
+from django.db import models
+
+from ControleDeRecebimentos.models import TabelaMensal, Venda
+
+
+class ResumoMensal(models.Model):
+    """
+    Totais das vendas de um mês por status, mantidos pelo backend a cada
+    gravação em Venda (ver services/resumo_mensal.py).
+    """
+
+    tabela_mensal = models.ForeignKey(
+        TabelaMensal, on_delete=models.CASCADE, related_name="resumos"
+    )
+    status = models.CharField(max_length=2, choices=Venda.Status.choices)
+    total_vendas = models.PositiveIntegerField(default=0)
+    total_comissao = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    atualizado_em = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ["tabela_mensal", "status"]
+
+    def __str__(self):
+        return f"{self.tabela_mensal.mes_referencia} - {self.get_status_display()}"
@@ -46,6 +46,11 @@ class Venda(models.Model):
     class Meta:
         # Uma venda é única pela combinação desses campos
         unique_together = ["cliente", "empreendimento", "unidade", "data_venda"]
+        # Listagem paginada por id com os filtros mais usados
+        indexes = [
+            models.Index(fields=["tabela_mensal", "status", "id"]),
+            models.Index(fields=["status", "id"]),
+        ]
 
     def __str__(self):
         return f"{self.cliente.nome} - {self.empreendimento.nome}"
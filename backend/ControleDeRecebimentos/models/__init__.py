@@ -1,9 +1,15 @@
 from .UserModel import User
 from .EmpreendimentoModel import Empreendimento
 from .ClienteModel import Cliente
+from .ChaveBuscaClienteModel import ChaveBuscaCliente
 from .TabelaMensalModel import TabelaMensal
 from .VendaModel import Venda
+from .RegraComissaoModel import RegraComissao
+from .ResumoMensalModel import ResumoMensal
 from .AnaliseEPRModel import AnaliseEPR
+from .AnaliseEPRItemModel import AnaliseEPRItem
+from .ImportJobModel import ImportJob
+from .ImportLogModel import ImportLog
 
 # Se você tiver outros modelos em outros arquivos, importe-os aqui também.
 # from .OutroModelo import OutroModelo
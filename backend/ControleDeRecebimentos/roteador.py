@@ -0,0 +1,79 @@
+"""
+Réplica de leitura opcional (REPLICA_DATABASE_URL).
+
+Só as views de leitura pesada decoradas com `ler_da_replica` (dashboards,
+listagem de vendas e listagem/detalhe/exportação das análises EPR) leem da
+réplica; todo o resto, e toda escrita, usa o banco principal.
+
+Para não mostrar dados anteriores a uma gravação ainda não replicada, as
+leituras voltam ao principal por REPLICA_JANELA_SEGUNDOS:
+- para o cliente que fez a gravação: o FixarPrimarioMiddleware marca com
+  um cookie as respostas de POST/PUT/PATCH/DELETE bem-sucedidas;
+- para todos, depois de gravações em vendas (registradas junto com a
+  troca da versão dos dados, ver versao_vendas.py), para que os caches do
+  dashboard, guardados com a versão nova, não recebam leituras atrasadas.
+
+Para testar localmente com dois bancos SQLite, aponte REPLICA_DATABASE_URL
+para uma cópia do arquivo do banco principal.
+"""
+import time
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+ALIAS_REPLICA = "replica"
+COOKIE_PRIMARIO = "usar_primario"
+CHAVE_ESCRITA_VENDAS = "vendas:escrita_em"
+
+_usar_replica = ContextVar("usar_replica", default=False)
+
+
+def replica_disponivel():
+    return settings.REPLICA_ATIVA and ALIAS_REPLICA in settings.DATABASES
+
+
+def registrar_escrita_vendas():
+    cache.set(CHAVE_ESCRITA_VENDAS, time.time(), settings.REPLICA_JANELA_SEGUNDOS)
+
+
+def pode_usar_replica(request):
+    return (
+        replica_disponivel()
+        and COOKIE_PRIMARIO not in request.COOKIES
+        and cache.get(CHAVE_ESCRITA_VENDAS) is None
+    )
+
+
+def ler_da_replica(metodo):
+    """
+    Decora um método de view (get) para que as leituras feitas durante ele
+    usem a réplica, quando possível. Querysets avaliados depois que o
+    método retorna (ex: corpo de respostas em streaming) usam o principal.
+    """
+
+    @wraps(metodo)
+    def envolvido(self, request, *args, **kwargs):
+        token = _usar_replica.set(pode_usar_replica(request))
+        try:
+            return metodo(self, request, *args, **kwargs)
+        finally:
+            _usar_replica.reset(token)
+
+    return envolvido
+
+
+class RoteadorReplica:
+    def db_for_read(self, model, **hints):
+        if _usar_replica.get():
+            return ALIAS_REPLICA
+        return None
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Os dois bancos têm os mesmos dados
+        return True
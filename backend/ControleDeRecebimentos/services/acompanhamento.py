@@ -0,0 +1,265 @@
+"""
+Pipeline colunar da importação ACOMPANHAMENTO.
+
+Cada etapa (parse de datas, filtro do mês, limpeza de texto, tratamento de
+nulos e resolução das FKs) opera sobre colunas inteiras do DataFrame, sem
+percorrer a planilha linha a linha em Python. As vendas são gravadas com um
+upsert pela restrição única de Venda, sem carregar as vendas do mês.
+"""
+import numbers
+
+import pandas as pd
+
+from ControleDeRecebimentos.models import Cliente, Empreendimento, Venda
+from ControleDeRecebimentos.services.nomes import normalizar_nome
+from ControleDeRecebimentos.services.resumo_mensal import vendas_alteradas
+from ControleDeRecebimentos.services.sql_em_lote import atualizar_em_lote, upsert
+
+
+COLUNAS_ACOMPANHAMENTO = [
+    "quant",
+    "data",
+    "nome",
+    "corretor",
+    "imobiliaria",
+    "empreendimento",
+    "unidade",
+    "etapa",
+    "fgts",
+    "status",
+    "observacoes",
+]
+
+# Campos sobrescritos quando a venda já existe no mês
+CAMPOS_ATUALIZAVEIS = ["corretor", "imobiliaria", "etapa", "fgts", "observacoes"]
+
+CHAVE_VENDA = ["cliente_id", "empreendimento_id", "unidade", "data_venda"]
+
+
+def limpar_texto(serie):
+    """
+    Versão colunar de `str(valor).strip() if pd.notna(valor) else None`.
+    """
+    nulos = serie.isna()
+    texto = serie.astype(str).str.strip().astype(object)
+    return texto.where(~nulos, None)
+
+
+def limpar_numero(serie):
+    """
+    Mantém apenas células numéricas; texto e vazios viram None.
+    """
+    if not pd.api.types.is_numeric_dtype(serie):
+        serie = serie.where(serie.map(lambda v: isinstance(v, numbers.Number)))
+        serie = pd.to_numeric(serie, errors="coerce")
+    return serie.astype(object).where(serie.notna(), None)
+
+
+def converter_datas(serie):
+    """
+    Converte a coluna de datas de uma vez; valores inválidos viram NaT.
+    """
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return serie
+    texto = serie.astype(str).str.strip()
+    return pd.to_datetime(texto, errors="coerce", format="mixed")
+
+
+def ids_criados(novos, consulta):
+    """
+    {chave: id} dos objetos recém-criados em `novos` ({chave: objeto}).
+    Bancos que devolvem os ids no INSERT em lote (PostgreSQL, SQLite 3.35+)
+    dispensam a `consulta`.
+    """
+    if all(obj.pk for obj in novos.values()):
+        return {chave: obj.pk for chave, obj in novos.items()}
+    return dict(consulta)
+
+
+def garantir_clientes(nomes):
+    """
+    Retorna {nome da planilha: id do cliente}, casando pelo nome normalizado
+    e criando em lote os clientes que ainda não existem (com a primeira
+    grafia encontrada na planilha). Também retorna quantos foram criados.
+    """
+    chaves = {nome: normalizar_nome(nome) for nome in nomes}
+    consulta = Cliente.objects.filter(
+        nome_normalizado__in=set(chaves.values())
+    ).values_list("nome_normalizado", "id")
+    existentes = dict(consulta)
+
+    novos = {}
+    for nome, chave in chaves.items():
+        if chave not in existentes and chave not in novos:
+            novos[chave] = Cliente(nome=nome)
+    if novos:
+        Cliente.objects.bulk_create(novos.values())
+        existentes.update(
+            ids_criados(novos, consulta.filter(nome_normalizado__in=novos.keys()))
+        )
+
+    return {nome: existentes[chave] for nome, chave in chaves.items()}, len(novos)
+
+
+def garantir_por_nome(model, nomes):
+    """
+    Retorna {nome: id} para os nomes informados, criando em lote os que
+    ainda não existem. Também retorna quantos registros foram criados.
+    """
+    existentes = dict(
+        model.objects.filter(nome__in=nomes).values_list("nome", "id")
+    )
+    novos = {nome: model(nome=nome) for nome in nomes if nome not in existentes}
+    if novos:
+        model.objects.bulk_create(novos.values())
+        existentes.update(
+            ids_criados(
+                novos,
+                model.objects.filter(nome__in=novos.keys()).values_list("nome", "id"),
+            )
+        )
+    return existentes, len(novos)
+
+
+def preparar_vendas(df, ano, mes, clientes, empreendimentos):
+    """
+    Aplica limpeza, filtro do mês e resolução de FKs sobre a planilha
+    inteira. Retorna um DataFrame com uma linha por venda válida.
+    """
+    datas = converter_datas(df["data"])
+    no_mes = (datas.dt.year == ano) & (datas.dt.month == mes)
+
+    df = df.loc[no_mes]
+    datas = datas.loc[no_mes]
+
+    nome = limpar_texto(df["nome"])
+    empreendimento = limpar_texto(df["empreendimento"])
+
+    vendas = pd.DataFrame(
+        {
+            "cliente_id": nome.map(clientes),
+            "empreendimento_id": empreendimento.map(empreendimentos),
+            "unidade": limpar_texto(df["unidade"]),
+            "data_venda": datas.dt.date,
+            "corretor": limpar_texto(df["corretor"]),
+            "imobiliaria": limpar_texto(df["imobiliaria"]),
+            "etapa": limpar_texto(df["etapa"]),
+            "fgts": limpar_numero(df["fgts"]),
+            "observacoes": limpar_texto(df["observacoes"]),
+        }
+    )
+
+    # Nomes vazios não têm cliente/empreendimento correspondente
+    vendas = vendas.dropna(subset=["cliente_id", "empreendimento_id"])
+    return vendas.astype({"cliente_id": "int64", "empreendimento_id": "int64"})
+
+
+def registros(df):
+    return df.astype(object).where(df.notna(), None).to_dict("records")
+
+
+def gravar_sem_unidade(vendas, tabela_mensal):
+    """
+    Cria ou atualiza as vendas sem unidade. NULL não conflita na restrição
+    única, então essas vendas são casadas com as já cadastradas no mês, só
+    para os clientes presentes na planilha. Retorna (criadas, atualizadas).
+    """
+    existentes = pd.DataFrame.from_records(
+        Venda.objects.filter(
+            tabela_mensal=tabela_mensal,
+            unidade__isnull=True,
+            cliente_id__in=set(vendas["cliente_id"].tolist()),
+        ).values_list("id", *CHAVE_VENDA),
+        columns=["id", *CHAVE_VENDA],
+    ).astype({"id": "int64", "cliente_id": "int64", "empreendimento_id": "int64"})
+    existentes = existentes.drop(columns="unidade")
+    chave = ["cliente_id", "empreendimento_id", "data_venda"]
+    vendas = vendas.drop_duplicates(subset=chave, keep="last").merge(
+        existentes.drop_duplicates(subset=chave, keep="last"), how="left", on=chave
+    )
+    existe = vendas["id"].notna()
+
+    criadas = Venda.objects.bulk_create(
+        [
+            Venda(tabela_mensal=tabela_mensal, **dados)
+            for dados in registros(vendas.loc[~existe].drop(columns="id"))
+        ]
+    )
+    atualizadas = [
+        Venda(**dados)
+        for dados in registros(
+            vendas.loc[existe, ["id", *CAMPOS_ATUALIZAVEIS]].astype({"id": "int64"})
+        )
+    ]
+    atualizar_em_lote(Venda, atualizadas, CAMPOS_ATUALIZAVEIS)
+    return len(criadas), len(atualizadas)
+
+
+def importar_acompanhamento(df, tabela_mensal):
+    """
+    Importa a planilha ACOMPANHAMENTO (já lida com `skiprows=3`) para a
+    tabela mensal informada e retorna os totais criados/atualizados.
+    """
+    df = df.copy()
+    df.columns = COLUNAS_ACOMPANHAMENTO
+
+    ano, mes = (int(parte) for parte in tabela_mensal.mes_referencia.split("-"))
+
+    # 1. Clientes e empreendimentos presentes na planilha
+    nomes_clientes = limpar_texto(df["nome"]).dropna().unique()
+    nomes_empreendimentos = set(limpar_texto(df["empreendimento"]).dropna())
+
+    clientes, clientes_criados = garantir_clientes(nomes_clientes)
+    empreendimentos, empreendimentos_criados = garantir_por_nome(
+        Empreendimento, nomes_empreendimentos
+    )
+
+    # 2. Vendas válidas do mês, já com as FKs resolvidas
+    vendas = preparar_vendas(df, ano, mes, clientes, empreendimentos)
+    sem_unidade = vendas["unidade"].isna()
+
+    # 3. Criar ou atualizar em um único upsert pela chave da venda; as
+    # atualizações não mexem em status nem comissão
+    criadas, atualizadas = upsert(
+        Venda,
+        [
+            Venda(tabela_mensal=tabela_mensal, **dados)
+            for dados in registros(vendas.loc[~sem_unidade])
+        ],
+        unique_fields=CHAVE_VENDA,
+        update_fields=CAMPOS_ATUALIZAVEIS,
+    )
+    vendas_criadas, vendas_atualizadas = len(criadas), len(atualizadas)
+
+    if sem_unidade.any():
+        criadas_sem_unidade, atualizadas_sem_unidade = gravar_sem_unidade(
+            vendas.loc[sem_unidade], tabela_mensal
+        )
+        vendas_criadas += criadas_sem_unidade
+        vendas_atualizadas += atualizadas_sem_unidade
+
+    if vendas_criadas:
+        vendas_alteradas([tabela_mensal.id])
+
+    return {
+        "vendas_criadas": vendas_criadas,
+        "vendas_atualizadas": vendas_atualizadas,
+        "clientes_criados": clientes_criados,
+        "empreendimentos_criados": empreendimentos_criados,
+    }
+
+
+def importar_planilha_acompanhamento(leitor, tabela_mensal):
+    """
+    Importa a planilha bloco a bloco, somando os totais de cada bloco.
+    """
+    totais = {
+        "vendas_criadas": 0,
+        "vendas_atualizadas": 0,
+        "clientes_criados": 0,
+        "empreendimentos_criados": 0,
+    }
+    for df in leitor:
+        for chave, valor in importar_acompanhamento(df, tabela_mensal).items():
+            totais[chave] += valor
+    return totais
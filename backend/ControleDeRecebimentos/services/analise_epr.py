@@ -0,0 +1,200 @@
+"""
+Análise da planilha EPR: casa os mutuários com as vendas financiadas
+pendentes e registra uma AnaliseEPR aguardando confirmação.
+"""
+import pandas as pd
+from django.db import transaction
+
+from ControleDeRecebimentos.models import Venda, AnaliseEPR, AnaliseEPRItem
+from ControleDeRecebimentos.services.busca_aproximada import BuscaAproximada
+from ControleDeRecebimentos.services.importacao import (
+    ErroImportacao,
+    casar_aproximados,
+    limpar_nome,
+    vendas_por_chave,
+)
+from ControleDeRecebimentos.services.nomes import normalizar_nome
+
+
+def coluna_mutuario(colunas):
+    """
+    Identifica a coluna com o nome do cliente na planilha EPR.
+    """
+    for col in colunas:
+        if "mutuário" in str(col).lower() or "mutua" in str(col).lower():
+            return col
+
+    # Fallback para coluna que contém "nome"
+    for col in colunas:
+        if "nome" in str(col).lower():
+            return col
+
+    return None
+
+
+def texto_epr(linha, coluna):
+    valor = linha.get(coluna)
+    return str(valor) if pd.notna(valor) else ""
+
+
+def valor_epr(linha, coluna):
+    valor = linha.get(coluna)
+    return float(valor) if pd.notna(valor) else 0
+
+
+def dados_da_linha(venda, nome_cliente, linha):
+    """
+    Extrai os dados da EPR para esta venda.
+
+    Nota: valor_comissao vem da tabela Venda (importado das outras planilhas),
+    pois a planilha EPR não contém esse valor.
+    """
+    return {
+        "venda_id": venda.id,
+        "nome_empreendimento": texto_epr(linha, "Nome Empreendimento"),
+        "numero_contrato": texto_epr(linha, "Número Contrato"),
+        "nome_mutuario": nome_cliente,
+        "cpf_cnpj": texto_epr(linha, "CPF/CNPJ Mutuário"),
+        "data_assinatura": texto_epr(linha, "Data de Assinatura"),
+        "valor_financiamento": valor_epr(linha, "Valor de Financiamento"),
+        "valor_financiamento_terreno": valor_epr(linha, "Valor de Financiamento do Terreno"),
+        "valor_subsidio": valor_epr(linha, "Valor de Desconto Subsídio Complementar"),
+        "valor_fgts": valor_epr(linha, "Valor do FGTS"),
+        "valor_recursos_proprios": valor_epr(linha, "Valor Recursos Próprios"),
+        "valor_compra_venda": valor_epr(linha, "Valor de Compra e Venda"),
+        "valor_comissao": float(venda.valor_comissao) if venda.valor_comissao else 0,
+        # Dados da venda para o relatório
+        "tabela_mensal_id": venda.tabela_mensal.id if venda.tabela_mensal else None,
+        "mes_referencia": venda.tabela_mensal.mes_referencia if venda.tabela_mensal else None,
+        "empreendimento_sistema": venda.empreendimento.nome if venda.empreendimento else "",
+    }
+
+
+# Campos de AnaliseEPRItem devolvidos em "dados_epr" no detalhe da análise
+CAMPOS_DADOS_EPR = [
+    "id",
+    "venda_id",
+    "nome_empreendimento",
+    "numero_contrato",
+    "nome_mutuario",
+    "cpf_cnpj",
+    "data_assinatura",
+    "valor_financiamento",
+    "valor_financiamento_terreno",
+    "valor_subsidio",
+    "valor_fgts",
+    "valor_recursos_proprios",
+    "valor_compra_venda",
+    "valor_comissao",
+    "tabela_mensal_id",
+    "mes_referencia",
+    "empreendimento_sistema",
+]
+
+
+def dados_epr(analise_id, mes=None):
+    """
+    Linhas da análise no formato de `dados_da_linha`, mais o id do item,
+    opcionalmente só as do mês `mes`.
+    """
+    itens = AnaliseEPRItem.objects.filter(analise_id=analise_id)
+    if mes:
+        itens = itens.filter(mes_referencia=mes)
+    return itens.order_by("id").values(*CAMPOS_DADOS_EPR)
+
+
+def analisar_epr(leitor, fuzzy=False, hash_arquivo=None):
+    """
+    Lê a planilha EPR bloco a bloco e cria a análise pendente.
+
+    Cada venda entra uma vez na análise: quando mais de uma linha casa com
+    a mesma venda, prevalecem os dados da última. Com `fuzzy`, os nomes sem
+    casamento exato passam pela busca aproximada. `hash_arquivo` identifica
+    a cópia colunar da planilha usada nas reanálises. Retorna o corpo da
+    resposta; `analise_id` só está presente quando alguma venda foi
+    encontrada.
+    """
+    total_linhas = 0
+    nome_coluna = None
+    encontradas = {}
+    vendas = Venda.objects.filter(forma_pagamento="FI", status="PE").select_related(
+        "cliente", "empreendimento", "tabela_mensal"
+    )
+    busca = BuscaAproximada(vendas) if fuzzy else None
+
+    for df in leitor:
+        total_linhas += len(df)
+
+        if nome_coluna is None:
+            nome_coluna = coluna_mutuario(df.columns)
+            if not nome_coluna:
+                raise ErroImportacao(
+                    "Coluna de nome do cliente não encontrada na planilha EPR"
+                )
+
+        linhas = []
+        for linha in df.to_dict("records"):
+            nome_cliente = limpar_nome(linha[nome_coluna])
+            if nome_cliente:
+                linhas.append((normalizar_nome(nome_cliente), nome_cliente, linha))
+        chaves = {nome_cliente: chave for chave, nome_cliente, _ in linhas}
+
+        # Buscar as vendas financiadas pendentes dos nomes deste bloco em UMA query
+        vendas_por_nome = vendas_por_chave(vendas, chaves)
+        casar_aproximados(busca, chaves, vendas_por_nome)
+
+        for chave, nome_cliente, linha in linhas:
+            venda = vendas_por_nome.get(chave)
+            if venda:
+                encontradas[venda.id] = dados_da_linha(venda, nome_cliente, linha)
+
+    dados_epr = list(encontradas.values())
+    busca_aproximada = {"busca_aproximada": busca.resumo()} if busca else {}
+
+    if not dados_epr:
+        return {
+            "message": "Nenhuma venda pendente encontrada na planilha EPR",
+            "total_linhas_epr": total_linhas,
+            "vendas_encontradas": 0,
+            **busca_aproximada,
+        }
+
+    resumo_por_mes = {}
+    detalhes_por_mes = {}
+    for dados in dados_epr:
+        mes = dados.get("mes_referencia")
+        if mes:
+            resumo_por_mes[mes] = resumo_por_mes.get(mes, 0) + 1
+            detalhes_por_mes.setdefault(mes, []).append(
+                {
+                    "venda_id": dados["venda_id"],
+                    "cliente": dados["nome_mutuario"],
+                    "empreendimento": dados["empreendimento_sistema"],
+                    "valor_comissao": dados["valor_comissao"],
+                }
+            )
+
+    # Criar registro de análise pendente com uma linha por venda encontrada
+    with transaction.atomic():
+        analise = AnaliseEPR.objects.create(
+            status="PE",
+            total_encontradas=len(dados_epr),
+            resumo_por_mes=resumo_por_mes,
+            hash_arquivo=hash_arquivo,
+        )
+        AnaliseEPRItem.objects.bulk_create(
+            [AnaliseEPRItem(analise=analise, **dados) for dados in dados_epr],
+            batch_size=1000,
+        )
+
+    return {
+        "analise_id": analise.id,
+        "message": "Análise criada com sucesso. Aguardando confirmação.",
+        "resumo": {
+            "total_linhas_epr": total_linhas,
+            "vendas_encontradas": len(dados_epr),
+            "por_mes": resumo_por_mes,
+        },
+        "detalhes_por_mes": detalhes_por_mes,
+        **busca_aproximada,
+    }
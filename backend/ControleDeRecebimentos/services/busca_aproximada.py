@@ -0,0 +1,212 @@
+"""
+Busca aproximada de clientes para os nomes das planilhas que não casaram
+pela chave normalizada (`fuzzy=true` nas importações).
+
+Cada nome é pontuado apenas contra os clientes que compartilham com ele
+alguma chave de busca (ChaveBuscaCliente). Chaves muito frequentes, como
+'maria' ou 'silva', servem só para ordenar os candidatos e não para
+encontrá-los, de forma que o conjunto pontuado continua pequeno mesmo com
+uma base grande de clientes.
+"""
+import time
+
+from django.conf import settings
+from django.db.models import Count
+
+from ControleDeRecebimentos.models import ChaveBuscaCliente
+from ControleDeRecebimentos.services.nomes import chaves_busca, similaridade
+
+
+# Em quantos clientes uma chave pode aparecer para ainda ser usada no bloqueio
+FREQUENCIA_MAXIMA_CHAVE = 2000
+# Clientes pontuados por nome
+MAXIMO_CANDIDATOS = 50
+# Candidatos devolvidos em cada sugestão
+CANDIDATOS_POR_SUGESTAO = 3
+# Vantagem mínima do melhor candidato sobre o segundo para casar sozinho
+MARGEM_ACEITE = 0.05
+# Quantos casamentos e sugestões são devolvidos na resposta
+LIMITE_RESPOSTA = 50
+
+
+class BuscaAproximada:
+    """
+    Resolve nomes sem casamento exato para vendas de `vendas`, o queryset
+    das vendas elegíveis da importação. Só clientes com alguma dessas vendas
+    são candidatos.
+
+    Um nome é casado automaticamente quando o melhor candidato atinge o
+    `limiar` com folga sobre o segundo; os demais candidatos acima de
+    `limiar_sugestao` são devolvidos como sugestões para revisão. A busca
+    para de ser feita quando o tempo gasto passa do `orcamento` (segundos).
+    """
+
+    def __init__(self, vendas, limiar=None, limiar_sugestao=None, orcamento=None):
+        self.vendas = vendas
+        self.limiar = settings.IMPORTACAO_FUZZY_LIMIAR if limiar is None else limiar
+        self.limiar_sugestao = (
+            settings.IMPORTACAO_FUZZY_LIMIAR_SUGESTAO
+            if limiar_sugestao is None
+            else limiar_sugestao
+        )
+        self.orcamento = (
+            settings.IMPORTACAO_FUZZY_ORCAMENTO_SEGUNDOS
+            if orcamento is None
+            else orcamento
+        )
+        self.tempo = 0.0
+        self.interrompida = False
+        self.decisoes = {}
+        self.aceitas = []
+        self.sugestoes = []
+        self.total_sugestoes = 0
+        # Melhor candidato de cada nome casado automaticamente
+        self.melhores = {}
+        # Ids das vendas já casadas pelo nome exato nesta importação
+        self.ocupadas = set()
+        # Nomes cujo cliente só tinha vendas já casadas pelo nome exato
+        self.recusadas = set()
+
+    def candidatos(self, chave):
+        """
+        Clientes similares ao nome normalizado `chave`, do mais para o menos
+        similar, cada um como {"cliente_id", "nome", "score"}.
+        """
+        chaves = chaves_busca(chave)
+        if not chaves:
+            return []
+
+        frequencias = dict(
+            ChaveBuscaCliente.objects.filter(chave__in=chaves)
+            .values_list("chave")
+            .annotate(total=Count("id"))
+        )
+        if not frequencias:
+            return []
+
+        raras = {
+            chave_busca
+            for chave_busca, total in frequencias.items()
+            if total <= FREQUENCIA_MAXIMA_CHAVE
+        } or {min(frequencias, key=frequencias.get)}
+
+        clientes = (
+            ChaveBuscaCliente.objects.filter(
+                chave__in=frequencias,
+                cliente_id__in=ChaveBuscaCliente.objects.filter(
+                    chave__in=raras
+                ).values("cliente_id"),
+            )
+            .filter(cliente_id__in=self.vendas.values("cliente_id"))
+            .values_list("cliente_id", "cliente__nome", "cliente__nome_normalizado")
+            .annotate(comuns=Count("id"))
+            .order_by("-comuns", "cliente_id")[:MAXIMO_CANDIDATOS]
+        )
+
+        encontrados = []
+        for cliente_id, nome, nome_normalizado, _ in clientes:
+            score = similaridade(chave, nome_normalizado)
+            if score >= self.limiar_sugestao:
+                encontrados.append({"cliente_id": cliente_id, "nome": nome, "score": score})
+
+        encontrados.sort(key=lambda candidato: -candidato["score"])
+        return encontrados
+
+    def resolver(self, nomes, ocupadas=()):
+        """
+        Recebe {chave normalizada: nome na planilha} dos nomes sem
+        casamento exato e devolve {chave normalizada: venda} dos que foram
+        casados. Nomes repetidos em blocos seguintes reaproveitam a decisão.
+
+        `ocupadas` são os ids das vendas já casadas pelo nome exato nesta
+        importação. Um nome cujo cliente só tem uma dessas vendas não é
+        casado: vai para as sugestões, para revisão.
+        """
+        inicio = time.perf_counter()
+        self.ocupadas.update(ocupadas)
+
+        for chave, nome in nomes.items():
+            if chave in self.decisoes:
+                continue
+            if self.tempo + (time.perf_counter() - inicio) > self.orcamento:
+                self.interrompida = True
+                break
+            self.decisoes[chave] = self._decidir(chave, nome, self.candidatos(chave))
+
+        clientes = {
+            chave: self.decisoes[chave]
+            for chave in nomes
+            if self.decisoes.get(chave) and chave not in self.recusadas
+        }
+        vendas_por_cliente = {}
+        if clientes:
+            for venda in self.vendas.filter(
+                cliente_id__in=set(clientes.values())
+            ).iterator(chunk_size=settings.DB_LOTE_CURSOR):
+                vendas_por_cliente[venda.cliente_id] = venda
+
+        casadas = {}
+        for chave, cliente_id in clientes.items():
+            venda = vendas_por_cliente.get(cliente_id)
+            if venda is None:
+                continue
+            if venda.id in self.ocupadas:
+                self._recusar(chave, nomes[chave])
+                continue
+            casadas[chave] = venda
+
+        self.tempo += time.perf_counter() - inicio
+
+        return casadas
+
+    def _recusar(self, chave, nome):
+        """
+        Desfaz o casamento automático de `chave`, cuja venda já foi casada
+        pelo nome exato, e o devolve como sugestão para revisão.
+        """
+        self.recusadas.add(chave)
+        self.aceitas = [aceita for aceita in self.aceitas if aceita["nome"] != nome]
+        self.total_sugestoes += 1
+        if len(self.sugestoes) < LIMITE_RESPOSTA:
+            self.sugestoes.append(
+                {
+                    "nome": nome,
+                    "candidatos": [self.melhores[chave]],
+                    "motivo": "venda já casada pelo nome exato de outra linha",
+                }
+            )
+
+    def _decidir(self, chave, nome, candidatos):
+        if not candidatos:
+            return None
+
+        melhor = candidatos[0]
+        segundo = candidatos[1]["score"] if len(candidatos) > 1 else 0
+        if melhor["score"] >= self.limiar and melhor["score"] - segundo >= MARGEM_ACEITE:
+            self.melhores[chave] = melhor
+            if len(self.aceitas) < LIMITE_RESPOSTA:
+                self.aceitas.append(
+                    {"nome": nome, "cliente": melhor["nome"], "score": melhor["score"]}
+                )
+            return melhor["cliente_id"]
+
+        self.total_sugestoes += 1
+        if len(self.sugestoes) < LIMITE_RESPOSTA:
+            self.sugestoes.append(
+                {"nome": nome, "candidatos": candidatos[:CANDIDATOS_POR_SUGESTAO]}
+            )
+        return None
+
+    def resumo(self):
+        return {
+            "casadas": sum(
+                1
+                for chave, cliente_id in self.decisoes.items()
+                if cliente_id and chave not in self.recusadas
+            ),
+            "casamentos": self.aceitas,
+            "total_sugestoes": self.total_sugestoes,
+            "sugestoes": self.sugestoes,
+            "interrompida": self.interrompida,
+            "tempo_ms": round(self.tempo * 1000, 1),
+        }
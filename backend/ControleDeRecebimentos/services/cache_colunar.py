@@ -0,0 +1,126 @@
+"""
+Cópia colunar das planilhas já lidas, para não precisar ler o arquivo de
+novo (a EPR .xls via xlrd é a leitura mais lenta de todas).
+
+A planilha é lida uma vez e cada coluna é gravada como um .npy em
+IMPORTACAO_DIR/colunar/<hash do arquivo>-<aba>-<linhas puladas>/. As
+leituras seguintes abrem os .npy com memory-map e só materializam o bloco
+em uso. Colunas numéricas e de data mantêm o tipo; as demais são gravadas
+como texto, com células vazias como "".
+
+As cópias só servem às reanálises de análises EPR pendentes; quando
+nenhuma análise pendente usa mais o arquivo, elas são apagadas (ver
+signals.py).
+"""
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+
+from ControleDeRecebimentos.services.planilhas import LeitorPlanilha
+
+
+TIPOS_NATIVOS = "biufMm"
+
+
+def diretorio_colunar(hash_arquivo, sheet_name=None, skiprows=0):
+    return (
+        Path(settings.IMPORTACAO_DIR)
+        / "colunar"
+        / f"{hash_arquivo}-{sheet_name or 0}-{skiprows}"
+    )
+
+
+def salvar_colunas(df, diretorio):
+    """
+    Grava as colunas de `df` em `diretorio`. A gravação é feita em um
+    diretório temporário renomeado ao final, então um diretório existente
+    está sempre completo.
+    """
+    diretorio.parent.mkdir(parents=True, exist_ok=True)
+    temporario = Path(tempfile.mkdtemp(dir=diretorio.parent))
+    colunas = []
+    for i, nome in enumerate(df.columns):
+        serie = df.iloc[:, i]
+        if isinstance(serie.dtype, np.dtype) and serie.dtype.kind in TIPOS_NATIVOS:
+            valores = serie.to_numpy()
+            tipo = "nativo"
+        else:
+            vazias = serie.isna().to_numpy()
+            valores = np.array(
+                ["" if vazia else str(valor) for valor, vazia in zip(serie, vazias)],
+                dtype=str,
+            )
+            tipo = "texto"
+        np.save(temporario / f"{i}.npy", valores, allow_pickle=False)
+        colunas.append({"nome": str(nome), "tipo": tipo})
+
+    with open(temporario / "colunas.json", "w", encoding="utf-8") as saida:
+        json.dump({"linhas": len(df), "colunas": colunas}, saida)
+
+    try:
+        os.replace(temporario, diretorio)
+    except OSError:
+        # Outra requisição gravou a mesma planilha primeiro
+        shutil.rmtree(temporario, ignore_errors=True)
+
+
+class LeitorColunar:
+    """
+    Itera a cópia colunar em DataFrames de até `tamanho_bloco` linhas, como
+    o LeitorPlanilha.
+    """
+
+    def __init__(self, diretorio, tamanho_bloco=None):
+        self.diretorio = Path(diretorio)
+        with open(self.diretorio / "colunas.json", encoding="utf-8") as entrada:
+            self.estrutura = json.load(entrada)
+        self.tamanho_bloco = tamanho_bloco
+        self.total_linhas = self.estrutura["linhas"]
+
+    def __iter__(self):
+        colunas = [
+            (
+                coluna["nome"],
+                coluna["tipo"],
+                np.load(self.diretorio / f"{i}.npy", mmap_mode="r", allow_pickle=False),
+            )
+            for i, coluna in enumerate(self.estrutura["colunas"])
+        ]
+
+        passo = self.tamanho_bloco or max(self.total_linhas, 1)
+        for inicio in range(0, max(self.total_linhas, 1), passo):
+            bloco = {}
+            for nome, tipo, valores in colunas:
+                fatia = np.array(valores[inicio : inicio + passo])
+                if tipo == "texto":
+                    fatia = np.where(fatia == "", None, fatia.astype(object))
+                bloco[nome] = fatia
+            yield pd.DataFrame(bloco, columns=[nome for nome, _, _ in colunas])
+
+
+def planilha_colunar(arquivo, hash_arquivo, sheet_name=None, skiprows=0, engine=None):
+    """
+    Diretório da cópia colunar de `arquivo`, lendo a planilha e gravando a
+    cópia na primeira vez.
+    """
+    diretorio = diretorio_colunar(hash_arquivo, sheet_name, skiprows)
+    if not diretorio.exists():
+        [df] = LeitorPlanilha(
+            arquivo, sheet_name=sheet_name, skiprows=skiprows, engine=engine
+        )
+        salvar_colunas(df, diretorio)
+    return diretorio
+
+
+def remover_copias(hash_arquivo):
+    """
+    Apaga as cópias colunares do arquivo `hash_arquivo`, de todas as abas.
+    """
+    for diretorio in diretorio_colunar(hash_arquivo).parent.glob(f"{hash_arquivo}-*"):
+        shutil.rmtree(diretorio, ignore_errors=True)
@@ -0,0 +1,137 @@
+"""
+Cálculo da comissão das vendas a partir das RegraComissao.
+
+Na importação a taxa de cada venda é resolvida em Python (`RegrasComissao`),
+com as regras carregadas uma vez. O recálculo em massa (`recalcular_comissoes`)
+não lê as vendas: aplica um UPDATE por regra, da menos para a mais
+prioritária, de forma que cada venda termina com a comissão da regra que
+prevalece para ela. Nos dois casos, vendas sem regra aplicável ficam com
+TAXA_COMISSAO_PADRAO.
+"""
+import time
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.db import transaction
+from django.db.models import F, Q, Value
+from django.db.models.functions import Round
+
+from ControleDeRecebimentos.models import RegraComissao, TabelaMensal, Venda
+from ControleDeRecebimentos.models.RegraComissaoModel import TAXA_COMISSAO_PADRAO
+from ControleDeRecebimentos.services.resumo_mensal import (
+    recalcular_resumo_mensal,
+    vendas_alteradas,
+)
+from ControleDeRecebimentos.services.versao_vendas import invalidar_cache_vendas
+
+
+def regras_por_prioridade():
+    """
+    Regras da menos para a mais prioritária.
+    """
+    return sorted(
+        RegraComissao.objects.all(),
+        key=lambda regra: (regra.especificidade, regra.vigente_desde, regra.id),
+    )
+
+
+def calcular_comissao(valor, taxa):
+    return (Decimal(str(valor)) * taxa).quantize(Decimal("0.01"), ROUND_HALF_UP)
+
+
+class RegrasComissao:
+    """
+    Resolve a taxa de uma venda sem consultar o banco a cada linha. Sem
+    nenhuma regra aplicável vale TAXA_COMISSAO_PADRAO.
+    """
+
+    def __init__(self):
+        # Da mais para a menos prioritária: a primeira que casar prevalece
+        self.regras = regras_por_prioridade()[::-1]
+
+    def taxa(self, venda):
+        for regra in self.regras:
+            if (
+                regra.vigente_desde <= venda.data_venda
+                and regra.empreendimento_id in (None, venda.empreendimento_id)
+                and regra.forma_pagamento in (None, venda.forma_pagamento)
+            ):
+                return regra.taxa
+        return TAXA_COMISSAO_PADRAO
+
+    def comissao(self, venda, valor):
+        return calcular_comissao(valor, self.taxa(venda))
+
+
+def filtro_regra(regra):
+    filtro = Q(data_venda__gte=regra.vigente_desde)
+    if regra.empreendimento_id is not None:
+        filtro &= Q(empreendimento_id=regra.empreendimento_id)
+    if regra.forma_pagamento is not None:
+        filtro &= Q(forma_pagamento=regra.forma_pagamento)
+    return filtro
+
+
+def aplicar_regras(escopo):
+    """
+    Aplica as regras às vendas do queryset `escopo`, um UPDATE por regra.
+    As vendas sem nenhuma regra aplicável recebem TAXA_COMISSAO_PADRAO, como
+    na importação. Retorna o número dessas vendas e
+    [{"regra_id", "vendas_atualizadas"}] na ordem de aplicação.
+    """
+    regras = regras_por_prioridade()
+    aplicaveis = Q(pk__in=[])
+    for regra in regras:
+        aplicaveis |= filtro_regra(regra)
+    sem_regra = escopo.exclude(aplicaveis).update(
+        valor_comissao=Round(F("valor_venda") * Value(TAXA_COMISSAO_PADRAO), 2)
+    )
+
+    por_regra = []
+    for regra in regras:
+        atualizadas = escopo.filter(filtro_regra(regra)).update(
+            valor_comissao=Round(F("valor_venda") * Value(regra.taxa), 2)
+        )
+        por_regra.append({"regra_id": regra.id, "vendas_atualizadas": atualizadas})
+    return sem_regra, por_regra
+
+
+def recalcular_comissoes(mes_referencia=None, empreendimento_id=None):
+    """
+    Recalcula valor_comissao das vendas com valor_venda do escopo
+    informado (um mês, um empreendimento, ambos ou todas), com um UPDATE por
+    regra dentro de uma transação. Vendas sem regra aplicável recebem
+    TAXA_COMISSAO_PADRAO.
+
+    Retorna as linhas atualizadas por regra, as vendas sem regra e o tempo
+    gasto. Como as regras são aplicadas em sequência, uma venda pode ser
+    contada em mais de uma delas.
+    """
+    inicio = time.perf_counter()
+    escopo = Venda.objects.filter(valor_venda__isnull=False)
+    tabela_ids = None
+    if mes_referencia:
+        tabela_ids = list(
+            TabelaMensal.objects.filter(mes_referencia=mes_referencia).values_list(
+                "id", flat=True
+            )
+        )
+        escopo = escopo.filter(tabela_mensal_id__in=tabela_ids)
+    if empreendimento_id:
+        escopo = escopo.filter(empreendimento_id=empreendimento_id)
+
+    with transaction.atomic():
+        sem_regra, por_regra = aplicar_regras(escopo)
+
+        if tabela_ids is None:
+            recalcular_resumo_mensal()
+            invalidar_cache_vendas()
+        else:
+            vendas_alteradas(tabela_ids)
+
+    return {
+        "linhas_atualizadas": sem_regra
+        + sum(item["vendas_atualizadas"] for item in por_regra),
+        "por_regra": por_regra,
+        "vendas_sem_regra": sem_regra,
+        "segundos": round(time.perf_counter() - inicio, 3),
+    }
@@ -0,0 +1,493 @@
+"""
+Importações que atualizam vendas existentes a partir do nome do cliente
+(Controle Gestores e WebroPay). Cada bloco lido da planilha passa pelas
+etapas de casamento e gravação antes do próximo ser lido.
+"""
+import re
+
+import pandas as pd
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from ControleDeRecebimentos.models import Venda
+from ControleDeRecebimentos.services.busca_aproximada import BuscaAproximada
+from ControleDeRecebimentos.services.comissao import RegrasComissao
+from ControleDeRecebimentos.services.nomes import normalizar_nome
+from ControleDeRecebimentos.services.planilhas import caminho_local, ler_abas, nomes_abas
+from ControleDeRecebimentos.services.resumo_mensal import vendas_alteradas
+from ControleDeRecebimentos.services.sql_em_lote import atualizar_em_lote
+
+
+# Quantos nomes não encontrados são devolvidos na resposta
+LIMITE_NAO_ENCONTRADAS = 10
+
+MESES_ABA = {
+    "01": "JAN",
+    "02": "FEV",
+    "03": "MAR",
+    "04": "ABR",
+    "05": "MAI",
+    "06": "JUN",
+    "07": "JUL",
+    "08": "AGO",
+    "09": "SET",
+    "10": "OUT",
+    "11": "NOV",
+    "12": "DEZ",
+}
+
+MESES_ABA_INVERSO = {nome: mes for mes, nome in MESES_ABA.items()}
+
+PADRAO_ABA_MENSAL = re.compile(rf"^({'|'.join(MESES_ABA.values())})(\d{{2}})$")
+
+
+class ErroImportacao(Exception):
+    """
+    Problema no conteúdo da planilha, devolvido ao usuário como erro 400.
+    """
+
+
+def mes_referencia_para_aba(mes_referencia):
+    """
+    Converte mes_referencia (ex: '2025-11') para nome da aba (ex: 'NOV25')
+    """
+    ano, mes = mes_referencia.split("-")
+    ano_curto = ano[2:]  # 2025 -> 25
+    nome_mes = MESES_ABA.get(mes, "")
+
+    return f"{nome_mes}{ano_curto}"
+
+
+def aba_para_mes_referencia(aba):
+    """
+    Converte o nome da aba (ex: 'NOV25') para mes_referencia (ex: '2025-11'),
+    ou None se a aba não for de um mês.
+    """
+    correspondencia = PADRAO_ABA_MENSAL.match(str(aba).strip().upper())
+    if not correspondencia:
+        return None
+    nome_mes, ano_curto = correspondencia.groups()
+    return f"20{ano_curto}-{MESES_ABA_INVERSO[nome_mes]}"
+
+
+def encontrar_coluna(colunas, palavras_chave):
+    """
+    Primeira coluna cujo título contém alguma das palavras-chave.
+    """
+    for col in colunas:
+        col_lower = str(col).lower()
+        for palavra in palavras_chave:
+            if palavra in col_lower:
+                return col
+    return None
+
+
+def limpar_nome(valor):
+    """
+    Nome da célula sem espaços extras, ou None se estiver vazia.
+    """
+    nome = str(valor).strip() if pd.notna(valor) else ""
+    return nome if nome and nome.lower() != "nan" else None
+
+
+def nomes_da_coluna(serie):
+    return [limpar_nome(valor) for valor in serie]
+
+
+class NaoEncontradas:
+    """
+    Acumula os nomes sem venda correspondente guardando apenas a amostra
+    exibida na resposta, para não crescer com o tamanho da planilha.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.amostra = []
+
+    def adicionar(self, nome):
+        self.total += 1
+        if len(self.amostra) < LIMITE_NAO_ENCONTRADAS:
+            self.amostra.append(nome)
+
+
+def vendas_por_chave(vendas, chaves):
+    """
+    {chave normalizada: venda} das vendas de `vendas` cujo cliente tem uma
+    das chaves de `chaves` ({nome: chave}). As vendas são lidas com um
+    cursor no servidor, DB_LOTE_CURSOR por vez, em vez de todas de uma vez.
+    """
+    return {
+        venda.cliente.nome_normalizado: venda
+        for venda in vendas.filter(
+            cliente__nome_normalizado__in=set(chaves.values())
+        ).iterator(chunk_size=settings.DB_LOTE_CURSOR)
+    }
+
+
+def casar_aproximados(busca, chaves, vendas_por_nome):
+    """
+    Completa `vendas_por_nome` com a busca aproximada dos nomes do bloco
+    que não casaram pela chave normalizada.
+    """
+    if busca is None:
+        return
+    faltantes = {
+        chave: nome for nome, chave in chaves.items() if chave not in vendas_por_nome
+    }
+    if faltantes:
+        vendas_por_nome.update(
+            busca.resolver(
+                faltantes, ocupadas={venda.id for venda in vendas_por_nome.values()}
+            )
+        )
+
+
+def forma_pagamento_da_planilha(valor):
+    """
+    Mapeia o texto da planilha para o código de forma de pagamento.
+    """
+    forma = str(valor).upper() if pd.notna(valor) else ""
+    if "FIN" in forma:
+        return "FI"
+    if "PIX" in forma or "CARTAO" in forma or "VISTA" in forma:
+        return "AV"
+    if "QUITADO" in forma or "DESCONTO" in forma:
+        return "DS"
+    return None
+
+
+def colunas_controle_gestores(colunas):
+    """
+    Detecta as colunas de nome, valor e forma de pagamento da planilha.
+    """
+    col_nome = encontrar_coluna(colunas, ["nome", "cliente"])
+    if not col_nome:
+        raise ErroImportacao("Coluna de nome do cliente não encontrada na planilha")
+    return (
+        col_nome,
+        encontrar_coluna(colunas, ["valor", "imóvel", "imovel", "vgv"]),
+        encontrar_coluna(colunas, ["forma", "pagamento", "pgto"]),
+    )
+
+
+def linhas_controle_gestores(df, colunas):
+    """
+    (nome, forma, valor) de cada linha; colunas ausentes viram None.
+    """
+    col_nome, col_valor, col_forma = colunas
+    formas = df[col_forma] if col_forma else [None] * len(df)
+    valores = df[col_valor] if col_valor else [None] * len(df)
+    return zip(nomes_da_coluna(df[col_nome]), formas, valores)
+
+
+def aplicar_controle_gestores(venda, forma, valor, regras):
+    venda.forma_pagamento = forma_pagamento_da_planilha(forma) or venda.forma_pagamento
+
+    if pd.notna(valor) and isinstance(valor, (int, float)):
+        venda.valor_venda = valor
+        venda.valor_comissao = regras.comissao(venda, valor)
+
+
+CAMPOS_CONTROLE_GESTORES = ["forma_pagamento", "valor_venda", "valor_comissao"]
+
+
+def importar_controle_gestores(leitor, fuzzy=False):
+    """
+    Atualiza forma de pagamento, valor e comissão (pelas RegraComissao)
+    das vendas a partir da aba do mês da planilha de controle dos gestores.
+
+    Com `fuzzy`, os nomes sem casamento exato passam pela busca aproximada.
+    """
+    vendas_atualizadas = 0
+    nao_encontradas = NaoEncontradas()
+    colunas = None
+    meses = set()
+    vendas = Venda.objects.select_related("cliente")
+    busca = BuscaAproximada(vendas) if fuzzy else None
+    regras = RegrasComissao()
+
+    for df in leitor:
+        if colunas is None:
+            # Detectar colunas automaticamente
+            colunas = colunas_controle_gestores(df.columns)
+
+        linhas = list(linhas_controle_gestores(df, colunas))
+        chaves = {nome: normalizar_nome(nome) for nome, _, _ in linhas if nome}
+        if not chaves:
+            continue
+
+        # Buscar as vendas dos nomes deste bloco em UMA query indexada
+        vendas_por_nome = vendas_por_chave(vendas, chaves)
+        casar_aproximados(busca, chaves, vendas_por_nome)
+
+        vendas_para_atualizar = []
+        for nome_cliente, forma, valor in linhas:
+            if not nome_cliente:
+                continue
+
+            venda = vendas_por_nome.get(chaves[nome_cliente])
+            if not venda:
+                nao_encontradas.adicionar(nome_cliente)
+                continue
+
+            aplicar_controle_gestores(venda, forma, valor, regras)
+            vendas_para_atualizar.append(venda)
+
+        if vendas_para_atualizar:
+            atualizar_em_lote(Venda, vendas_para_atualizar, CAMPOS_CONTROLE_GESTORES)
+            meses.update(venda.tabela_mensal_id for venda in vendas_para_atualizar)
+        vendas_atualizadas += len(vendas_para_atualizar)
+
+    vendas_alteradas(meses)
+
+    resultado = {
+        "vendas_atualizadas": vendas_atualizadas,
+        "vendas_nao_encontradas": nao_encontradas.total,
+        "nao_encontradas": nao_encontradas.amostra,
+    }
+    if busca:
+        resultado["busca_aproximada"] = busca.resumo()
+    return resultado
+
+
+class AbasLidas:
+    """
+    As linhas das abas já lidas, uma aba por bloco, com a mesma interface
+    do LeitorPlanilha (`total_linhas` e iteração), para o `acompanhar`.
+    """
+
+    def __init__(self, linhas_por_aba):
+        self.linhas_por_aba = linhas_por_aba
+        self.total_linhas = sum(len(linhas) for linhas in linhas_por_aba.values())
+
+    def __iter__(self):
+        yield from self.linhas_por_aba.values()
+
+
+def importar_controle_gestores_todas_abas(
+    arquivo, fuzzy=False, processos=None, acompanhar=None
+):
+    """
+    Importa de uma vez todas as abas mensais (ex: 'NOV25') da planilha de
+    controle dos gestores.
+
+    As abas são lidas em paralelo por um pool de processos e o casamento dos
+    nomes é feito uma única vez para todas elas. As abas são gravadas da
+    mais antiga para a mais recente, cada uma em sua própria transação,
+    então quando a mesma venda aparece em mais de um mês prevalece a aba
+    mais recente. `acompanhar` (ver executar_importacao) recebe as abas
+    como blocos, e o progresso avança a cada aba gravada.
+    """
+    if processos is None:
+        processos = settings.IMPORTACAO_PROCESSOS
+
+    with caminho_local(arquivo) as caminho:
+        abas = {}
+        for aba in nomes_abas(caminho):
+            mes_referencia = aba_para_mes_referencia(aba)
+            if mes_referencia:
+                abas[aba] = mes_referencia
+        if not abas:
+            raise ErroImportacao("Nenhuma aba mensal (ex: NOV25) encontrada na planilha")
+
+        # Da mais antiga para a mais recente
+        ordem = sorted(abas, key=abas.get)
+        planilhas = ler_abas(caminho, ordem, skiprows=1, processos=processos)
+
+    linhas_por_aba = {
+        aba: list(linhas_controle_gestores(df, colunas_controle_gestores(df.columns)))
+        for aba, df in planilhas.items()
+    }
+    chaves = {
+        nome: normalizar_nome(nome)
+        for linhas in linhas_por_aba.values()
+        for nome, _, _ in linhas
+        if nome
+    }
+
+    # Buscar as vendas de todas as abas em UMA query indexada
+    vendas = Venda.objects.select_related("cliente")
+    busca = BuscaAproximada(vendas) if fuzzy else None
+    vendas_por_nome = vendas_por_chave(vendas, chaves)
+    casar_aproximados(busca, chaves, vendas_por_nome)
+
+    regras = RegrasComissao()
+    por_mes = {}
+    nao_encontradas = NaoEncontradas()
+    atualizadas = set()
+    blocos = AbasLidas(linhas_por_aba)
+    if acompanhar:
+        blocos = acompanhar(blocos)
+    # `blocos` primeiro no zip: ele é iterado até o fim, e o `acompanhar`
+    # registra o progresso da última aba
+    for linhas, aba in zip(blocos, linhas_por_aba):
+        resumo = {"aba": aba, "vendas_atualizadas": 0, "vendas_nao_encontradas": 0}
+        vendas_para_atualizar = {}
+        for nome_cliente, forma, valor in linhas:
+            if not nome_cliente:
+                continue
+
+            venda = vendas_por_nome.get(chaves[nome_cliente])
+            if not venda:
+                resumo["vendas_nao_encontradas"] += 1
+                nao_encontradas.adicionar(nome_cliente)
+                continue
+
+            aplicar_controle_gestores(venda, forma, valor, regras)
+            vendas_para_atualizar[venda.id] = venda
+            resumo["vendas_atualizadas"] += 1
+        por_mes[abas[aba]] = resumo
+
+        if vendas_para_atualizar:
+            with transaction.atomic():
+                atualizar_em_lote(
+                    Venda, vendas_para_atualizar.values(), CAMPOS_CONTROLE_GESTORES
+                )
+                vendas_alteradas(
+                    venda.tabela_mensal_id for venda in vendas_para_atualizar.values()
+                )
+            atualizadas.update(vendas_para_atualizar)
+
+    resultado = {
+        "abas_processadas": ordem,
+        "vendas_atualizadas": len(atualizadas),
+        "vendas_nao_encontradas": nao_encontradas.total,
+        "nao_encontradas": nao_encontradas.amostra,
+        "por_mes": por_mes,
+    }
+    if busca:
+        resultado["busca_aproximada"] = busca.resumo()
+    return resultado
+
+
+def importar_webropay(leitor, fuzzy=False):
+    """
+    Marca como faturadas as vendas à vista pendentes cujos clientes
+    aparecem como pagadores na planilha WebroPay.
+
+    Com `fuzzy`, os nomes sem casamento exato passam pela busca aproximada.
+    """
+    vendas_faturadas = 0
+    nao_encontradas = NaoEncontradas()
+    col_pagador = None
+    meses = set()
+    agora = timezone.now()
+    vendas = Venda.objects.filter(forma_pagamento="AV", status="PE").select_related(
+        "cliente"
+    )
+    busca = BuscaAproximada(vendas) if fuzzy else None
+
+    for df in leitor:
+        if col_pagador is None:
+            # Detectar coluna do pagador automaticamente
+            col_pagador = encontrar_coluna(df.columns, ["pagador", "nome", "cliente"])
+            if not col_pagador:
+                raise ErroImportacao("Coluna de pagador/nome não encontrada na planilha")
+
+        nomes = nomes_da_coluna(df[col_pagador])
+        chaves = {nome: normalizar_nome(nome) for nome in nomes if nome}
+
+        # Buscar as vendas à vista pendentes dos nomes deste bloco em UMA query
+        vendas_por_nome = vendas_por_chave(vendas, chaves)
+        casar_aproximados(busca, chaves, vendas_por_nome)
+
+        vendas_para_atualizar = []
+        for nome_cliente in nomes:
+            if not nome_cliente:
+                continue
+
+            venda = vendas_por_nome.get(chaves[nome_cliente])
+            if not venda:
+                nao_encontradas.adicionar(nome_cliente)
+                continue
+
+            # Marcar como faturado
+            venda.status = "FA"
+            venda.data_faturamento = agora
+            vendas_para_atualizar.append(venda)
+
+        if vendas_para_atualizar:
+            atualizar_em_lote(
+                Venda, vendas_para_atualizar, ["status", "data_faturamento"]
+            )
+            meses.update(venda.tabela_mensal_id for venda in vendas_para_atualizar)
+        vendas_faturadas += len(vendas_para_atualizar)
+
+    vendas_alteradas(meses)
+
+    resultado = {
+        "vendas_faturadas": vendas_faturadas,
+        "vendas_nao_encontradas": nao_encontradas.total,
+        "nao_encontradas": nao_encontradas.amostra,
+    }
+    if busca:
+        resultado["busca_aproximada"] = busca.resumo()
+    return resultado
+
+
+def faturar_financiadas_epr(leitor):
+    """
+    Marca como faturadas as vendas financiadas pendentes dos mutuários da
+    planilha EPR, sem etapa de análise.
+
+    Todos os nomes são resolvidos em uma única query e todas as vendas são
+    atualizadas em um único UPDATE, de forma que o número de queries não
+    cresce com o tamanho da planilha. Cada linha consome uma venda do
+    cliente, a de menor id primeiro.
+    """
+    nomes = []
+    nome_coluna = None
+
+    for df in leitor:
+        if nome_coluna is None:
+            # Identificar coluna com nome do cliente (pode variar)
+            nome_coluna = encontrar_coluna(df.columns, ["nome", "cliente"])
+            if not nome_coluna:
+                nome_coluna = df.columns[0]  # Usa primeira coluna como fallback
+        nomes.extend(nomes_da_coluna(df[nome_coluna]))
+
+    chaves = {nome: normalizar_nome(nome) for nome in nomes if nome}
+
+    pendentes_por_nome = {}
+    mes_da_venda = {}
+    for venda_id, chave, tabela_id in (
+        Venda.objects.filter(
+            cliente__nome_normalizado__in=set(chaves.values()),
+            forma_pagamento="FI",
+            status="PE",
+        )
+        .order_by("id")
+        .values_list("id", "cliente__nome_normalizado", "tabela_mensal_id")
+        .iterator(chunk_size=settings.DB_LOTE_CURSOR)
+    ):
+        pendentes_por_nome.setdefault(chave, []).append(venda_id)
+        mes_da_venda[venda_id] = tabela_id
+
+    # Atribuir as vendas às linhas em memória
+    ids_faturar = []
+    nao_encontradas = NaoEncontradas()
+    for nome_cliente in nomes:
+        if not nome_cliente:
+            continue
+
+        pendentes = pendentes_por_nome.get(chaves[nome_cliente])
+        if not pendentes:
+            nao_encontradas.adicionar(nome_cliente)
+            continue
+
+        ids_faturar.append(pendentes.pop(0))
+
+    vendas_faturadas = 0
+    if ids_faturar:
+        with transaction.atomic():
+            vendas_faturadas = Venda.objects.filter(
+                id__in=ids_faturar, status="PE"
+            ).update(status="FA", data_faturamento=timezone.now())
+            vendas_alteradas(mes_da_venda[venda_id] for venda_id in ids_faturar)
+
+    return {
+        "vendas_faturadas": vendas_faturadas,
+        "vendas_nao_encontradas": nao_encontradas.total,
+        "nao_encontradas": nao_encontradas.amostra,
+    }
@@ -0,0 +1,107 @@
+"""
+Ponto de entrada único das importações de planilha, usado tanto pelas
+rotas síncronas quanto pelos jobs em segundo plano.
+"""
+from ControleDeRecebimentos.models import TabelaMensal
+from ControleDeRecebimentos.services.acompanhamento import (
+    importar_planilha_acompanhamento,
+)
+from ControleDeRecebimentos.services.analise_epr import analisar_epr
+from ControleDeRecebimentos.services.cache_colunar import (
+    LeitorColunar,
+    planilha_colunar,
+)
+from ControleDeRecebimentos.services.importacao import (
+    importar_controle_gestores,
+    importar_controle_gestores_todas_abas,
+    importar_webropay,
+    mes_referencia_para_aba,
+)
+from ControleDeRecebimentos.services.planilhas import LeitorPlanilha
+from ControleDeRecebimentos.services.registro_importacao import hash_conteudo
+
+
+def _acompanhamento(arquivo, leitor_para, parametros, acompanhar):
+    tabela_mensal, _ = TabelaMensal.objects.get_or_create(
+        mes_referencia=parametros["mes_referencia"]
+    )
+    resultado = importar_planilha_acompanhamento(
+        leitor_para(skiprows=3), tabela_mensal
+    )
+    return {
+        "message": "Importação concluída com sucesso",
+        **resultado,
+        "tabela_mensal": tabela_mensal.mes_referencia,
+    }
+
+
+def _controle_gestores(arquivo, leitor_para, parametros, acompanhar):
+    if parametros.get("todas_abas"):
+        return {
+            "message": "Importação concluída",
+            **importar_controle_gestores_todas_abas(
+                arquivo, fuzzy=parametros.get("fuzzy", False), acompanhar=acompanhar
+            ),
+        }
+
+    # Converter mes_referencia para nome da aba
+    sheet_name = mes_referencia_para_aba(parametros["mes_referencia"])
+    resultado = importar_controle_gestores(
+        leitor_para(sheet_name=sheet_name, skiprows=1),
+        fuzzy=parametros.get("fuzzy", False),
+    )
+    return {
+        "message": "Importação concluída",
+        "aba_processada": sheet_name,
+        "mes_referencia": parametros["mes_referencia"],
+        **resultado,
+    }
+
+
+def _webropay(arquivo, leitor_para, parametros, acompanhar):
+    resultado = importar_webropay(leitor_para(), fuzzy=parametros.get("fuzzy", False))
+    return {"message": "Importação concluída", **resultado}
+
+
+def _analise_epr(arquivo, leitor_para, parametros, acompanhar):
+    # EPR é .xls (formato antigo), lenta de ler: a planilha lida fica em
+    # cache colunar para as reanálises
+    hash_arquivo = hash_conteudo(arquivo)
+    return analisar_epr(
+        leitor_para(engine="xlrd", colunar=hash_arquivo),
+        fuzzy=parametros.get("fuzzy", False),
+        hash_arquivo=hash_arquivo,
+    )
+
+
+IMPORTADORES = {
+    "AC": _acompanhamento,
+    "CG": _controle_gestores,
+    "WP": _webropay,
+    "EP": _analise_epr,
+}
+
+
+def executar_importacao(tipo, arquivo, parametros, tamanho_bloco=None, acompanhar=None):
+    """
+    Executa a importação `tipo` (ver ImportJob.TIPO_CHOICES) e devolve o
+    corpo da resposta.
+
+    `acompanhar`, se informado, recebe o LeitorPlanilha e devolve o iterável
+    de blocos efetivamente consumido (usado para registrar progresso). No
+    modo todas_abas do Controle Gestores, cada aba é um bloco.
+
+    Com `colunar=<hash do arquivo>`, `leitor_para` lê a cópia colunar da
+    planilha (ver cache_colunar.py), criando-a na primeira leitura.
+    """
+
+    def leitor_para(colunar=None, **kwargs):
+        if colunar:
+            leitor = LeitorColunar(
+                planilha_colunar(arquivo, colunar, **kwargs), tamanho_bloco
+            )
+        else:
+            leitor = LeitorPlanilha(arquivo, tamanho_bloco, **kwargs)
+        return acompanhar(leitor) if acompanhar else leitor
+
+    return IMPORTADORES[tipo](arquivo, leitor_para, parametros, acompanhar)
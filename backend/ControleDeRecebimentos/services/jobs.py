@@ -0,0 +1,207 @@
+"""
+Execução das importações em segundo plano.
+
+Os jobs rodam em um pool de threads do próprio processo web (sem broker
+externo). Cada job lê o arquivo salvo em disco em blocos e grava o
+progresso no ImportJob a cada bloco, para ser consultado em
+/import/jobs/<id>/.
+
+Jobs que estavam na fila ou em execução quando o processo foi encerrado
+não são retomados. Ao consultar um job pendente ou em execução, ele é
+marcado como erro se o processo dono for o atual e não o estiver mais
+executando, ou, quando o dono for outro processo, se nenhum progresso for
+gravado por IMPORTACAO_JOBS_EXPIRACAO_SEGUNDOS.
+"""
+import os
+import socket
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+
+from ControleDeRecebimentos.models import ImportJob
+from ControleDeRecebimentos.services.importadores import executar_importacao
+from ControleDeRecebimentos.services.metricas import medir_memoria
+from ControleDeRecebimentos.services.registro_importacao import (
+    TIPOS_REGISTRADOS,
+    hash_conteudo,
+    registrar_importacao,
+)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+# Jobs deste processo na fila ou em execução
+_jobs_ativos = set()
+_jobs_ativos_lock = threading.Lock()
+
+
+def executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.IMPORTACAO_JOBS_WORKERS,
+                thread_name_prefix="importacao",
+            )
+    return _executor
+
+
+def processo_atual():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class ProgressoJob:
+    """
+    Envolve o leitor da planilha e grava no job as linhas já processadas
+    sempre que um bloco termina de ser importado.
+    """
+
+    def __init__(self, job, leitor):
+        self.job = job
+        self.leitor = leitor
+
+    def __iter__(self):
+        for bloco in self.leitor:
+            self.job.etapa = "Importando"
+            if self.job.linhas_total is None:
+                self.job.linhas_total = self.leitor.total_linhas
+            yield bloco
+            self.job.linhas_processadas += len(bloco)
+            ImportJob.objects.filter(id=self.job.id).update(
+                etapa=self.job.etapa,
+                linhas_total=self.job.linhas_total,
+                linhas_processadas=self.job.linhas_processadas,
+                atualizado_em=timezone.now(),
+            )
+
+
+def salvar_arquivo(arquivo):
+    """
+    Copia o upload para IMPORTACAO_DIR, já que ele não sobrevive ao fim da
+    requisição.
+    """
+    diretorio = Path(settings.IMPORTACAO_DIR) / "jobs"
+    diretorio.mkdir(parents=True, exist_ok=True)
+    caminho = diretorio / f"{uuid.uuid4().hex}{Path(arquivo.name or '').suffix}"
+    with open(caminho, "wb") as destino:
+        for parte in arquivo.chunks():
+            destino.write(parte)
+    return str(caminho)
+
+
+def criar_job(tipo, arquivo, parametros=None):
+    """
+    Registra o job e o coloca na fila. Retorna imediatamente.
+    """
+    job = ImportJob.objects.create(
+        tipo=tipo,
+        parametros=parametros or {},
+        arquivo=salvar_arquivo(arquivo),
+        processo=processo_atual(),
+        atualizado_em=timezone.now(),
+    )
+    with _jobs_ativos_lock:
+        _jobs_ativos.add(job.id)
+
+    if settings.IMPORTACAO_JOBS_SINCRONO:
+        executar_job(job.id)
+        job.refresh_from_db()
+    else:
+        # Só dispara depois do commit, para a thread enxergar o job
+        transaction.on_commit(lambda: executor().submit(executar_job, job.id))
+
+    return job
+
+
+def executar_job(job_id):
+    # Assume o job só se ainda estiver pendente: outro processo pode já o
+    # ter encerrado como abandonado enquanto ele esperava na fila
+    agora = timezone.now()
+    assumido = ImportJob.objects.filter(id=job_id, status="PE").update(
+        status="EX", etapa="Lendo planilha", iniciado_em=agora, atualizado_em=agora
+    )
+    if not assumido:
+        liberar_job(job_id)
+        return
+
+    job = ImportJob.objects.get(id=job_id)
+    try:
+        with open(job.arquivo, "rb") as arquivo, medir_memoria() as memoria:
+            resultado = executar_importacao(
+                job.tipo,
+                arquivo,
+                job.parametros,
+                tamanho_bloco=settings.IMPORTACAO_TAMANHO_BLOCO,
+                acompanhar=lambda leitor: ProgressoJob(job, leitor),
+            )
+            if job.tipo in TIPOS_REGISTRADOS:
+                registrar_importacao(
+                    job.tipo, arquivo, hash_conteudo(arquivo), job.parametros, resultado
+                )
+
+        job.resultado = {**resultado, "memoria": memoria}
+        job.status = "CO"
+        job.etapa = "Concluído"
+    except Exception as e:
+        job.erro = str(e)
+        job.status = "ER"
+        job.etapa = "Erro"
+    finally:
+        job.finalizado_em = job.atualizado_em = timezone.now()
+        job.save()
+        remover_arquivo(job)
+        liberar_job(job.id)
+
+
+def liberar_job(job_id):
+    with _jobs_ativos_lock:
+        _jobs_ativos.discard(job_id)
+    if not settings.IMPORTACAO_JOBS_SINCRONO:
+        connections.close_all()
+
+
+def remover_arquivo(job):
+    if job.arquivo and os.path.exists(job.arquivo):
+        os.remove(job.arquivo)
+
+
+def abandonado(job):
+    if job.status not in ("PE", "EX"):
+        return False
+    if job.processo == processo_atual():
+        with _jobs_ativos_lock:
+            return job.id not in _jobs_ativos
+    ultimo_progresso = job.atualizado_em or job.created_at
+    limite = timedelta(seconds=settings.IMPORTACAO_JOBS_EXPIRACAO_SEGUNDOS)
+    return timezone.now() - ultimo_progresso > limite
+
+
+def encerrar_se_abandonado(job):
+    """
+    Marca como erro o job pendente ou em execução que nenhum processo está
+    mais executando (ver a docstring do módulo) e remove o seu arquivo.
+    Retorna o job atualizado.
+    """
+    if not abandonado(job):
+        return job
+
+    # Só encerra se o job não tiver avançado desde a leitura
+    encerrado = ImportJob.objects.filter(
+        id=job.id, status=job.status, atualizado_em=job.atualizado_em
+    ).update(
+        status="ER",
+        etapa="Erro",
+        erro="Importação interrompida: o processo que a executava foi encerrado",
+        finalizado_em=timezone.now(),
+    )
+    if encerrado:
+        remover_arquivo(job)
+    job.refresh_from_db()
+    return job
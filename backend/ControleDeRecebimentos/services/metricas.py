@@ -0,0 +1,81 @@
+"""
+Medições de recursos usadas nas respostas das importações.
+"""
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from django.db import connection
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def rss_pico_processo_mb():
+    """
+    Maior memória residente que o processo ocupou desde que iniciou. Não é
+    o consumo de uma requisição: depois de uma importação grande, o valor
+    fica igual em todas as seguintes do mesmo worker.
+    """
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB, macOS em bytes
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(pico / divisor, 1)
+
+
+# O tracemalloc é global ao processo: só uma medição de alocações por vez
+_rastreando_alocacoes = threading.Lock()
+
+
+@contextmanager
+def medir_memoria(rastrear_alocacoes=False):
+    """
+    Mede a memória usada pelo bloco `with`.
+
+    Sempre informa `rss_pico_processo_mb` (ver rss_pico_processo_mb). Com
+    `rastrear_alocacoes`, usa o tracemalloc para informar também o pico
+    alocado durante o próprio bloco. O tracemalloc deixa o processo todo
+    mais lento e mede as alocações de todas as threads, então só o comando
+    `benchmark` o usa; as rotas informam apenas o RSS.
+    """
+    medicao = {}
+    if rastrear_alocacoes and not _rastreando_alocacoes.acquire(blocking=False):
+        raise RuntimeError("Já existe uma medição de alocações em andamento")
+    if rastrear_alocacoes:
+        tracemalloc.start()
+
+    try:
+        yield medicao
+    finally:
+        if rastrear_alocacoes:
+            _, pico = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            _rastreando_alocacoes.release()
+            medicao["pico_alocado_mb"] = round(pico / (1024 * 1024), 1)
+        medicao["rss_pico_processo_mb"] = rss_pico_processo_mb()
+
+
+@contextmanager
+def medir_queries():
+    """
+    Conta as queries executadas na conexão padrão dentro do bloco `with` e
+    o tempo total do bloco, em milissegundos.
+    """
+    medicao = {"queries": 0}
+
+    def contar(execute, sql, params, many, context):
+        medicao["queries"] += 1
+        return execute(sql, params, many, context)
+
+    inicio = time.perf_counter()
+    try:
+        with connection.execute_wrapper(contar):
+            yield medicao
+    finally:
+        medicao["tempo_ms"] = round((time.perf_counter() - inicio) * 1000, 1)
@@ -0,0 +1,128 @@
+"""
+Normalização de nomes de clientes para comparação entre planilhas e banco.
+
+Não depende do Django, para poder ser usado também por processos
+auxiliares.
+"""
+import re
+import unicodedata
+from difflib import SequenceMatcher
+from functools import lru_cache
+
+
+# Partículas ignoradas na busca aproximada
+PARTICULAS = {"da", "das", "de", "do", "dos", "e"}
+
+# Aproximação fonética do português, aplicada em ordem sobre o token já
+# normalizado (ex: 'Souza'/'Sousa', 'Thiago'/'Tiago', 'Felipe'/'Phelipe')
+REGRAS_FONETICAS = [
+    (re.compile(r"ph"), "f"),
+    (re.compile(r"th"), "t"),
+    (re.compile(r"[cs]h"), "x"),
+    (re.compile(r"lh"), "li"),
+    (re.compile(r"nh"), "ni"),
+    (re.compile(r"qu?"), "k"),
+    (re.compile(r"c(?=[eiy])"), "s"),
+    (re.compile(r"c"), "k"),
+    (re.compile(r"g(?=[eiy])"), "j"),
+    (re.compile(r"z"), "s"),
+    (re.compile(r"y"), "i"),
+    (re.compile(r"w"), "v"),
+    (re.compile(r"m(?![aeiou])"), "n"),
+    (re.compile(r"h"), ""),
+    (re.compile(r"(.)\1+"), r"\1"),
+]
+
+
+def normalizar_nome(nome):
+    """
+    Chave de comparação do nome: sem acentos, casefold e com os espaços
+    colapsados. Ex: '  JOSÉ  da Silva ' -> 'jose da silva'.
+    """
+    if nome is None:
+        return ""
+    texto = unicodedata.normalize("NFKD", str(nome))
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    return " ".join(texto.casefold().split())
+
+
+@lru_cache(maxsize=65536)
+def chave_fonetica(token):
+    """
+    Chave fonética de um token normalizado. Ex: 'souza' -> 'sousa'.
+    """
+    for padrao, troca in REGRAS_FONETICAS:
+        token = padrao.sub(troca, token)
+    return token
+
+
+def esqueleto(chave):
+    """
+    Consoantes da chave fonética, sem repetições. Tolera trocas e erros de
+    vogais que mudam a chave fonética. Ex: 'frietas' e 'freitas' -> 'frts'.
+    """
+    return re.sub(r"(.)\1+", r"\1", re.sub(r"[aeiou]", "", chave))
+
+
+def chaves_busca(nome):
+    """
+    Chaves de bloqueio da busca aproximada: para cada palavra relevante do
+    nome, a chave fonética e o esqueleto de consoantes (prefixado com '#').
+    """
+    chaves = set()
+    for token in normalizar_nome(nome).split():
+        if len(token) < 2 or token in PARTICULAS:
+            continue
+        fonetica = chave_fonetica(token)
+        if fonetica:
+            chaves.add(fonetica)
+        consoantes = esqueleto(fonetica)
+        if len(consoantes) > 1:
+            chaves.add(f"#{consoantes}")
+    return chaves
+
+
+def similaridade(nome, outro):
+    """
+    Similaridade entre 0 e 1 de dois nomes normalizados, tolerante a erros
+    de digitação, grafias com o mesmo som ('Souza'/'Sousa'), palavras fora
+    de ordem e nomes do meio ausentes.
+    """
+    if not nome or not outro:
+        return 0.0
+
+    pontuacao = max(
+        _similaridade_texto(nome, outro),
+        _similaridade_texto(_fonetica(nome), _fonetica(outro)),
+    )
+    return round(pontuacao, 3)
+
+
+def _fonetica(nome):
+    return " ".join(chave_fonetica(token) for token in nome.split())
+
+
+def _similaridade_texto(nome, outro):
+    pontuacao = SequenceMatcher(None, nome, outro).ratio()
+
+    palavras, outras = set(nome.split()), set(outro.split())
+    comuns = " ".join(sorted(palavras & outras))
+    significativas = [
+        token for token in palavras & outras
+        if len(token) > 1 and token not in PARTICULAS
+    ]
+    if len(significativas) > 1:
+        # Compara a parte em comum com cada nome completo (em ordem
+        # alfabética), de forma que 'ana souza' e 'ana maria souza' pontuem
+        # alto. Exige ao menos duas palavras relevantes em comum: um nome
+        # de uma palavra só ('joao') não equivale a 'joao pereira'
+        com_resto = " ".join([comuns, *sorted(palavras - outras)]).strip()
+        outro_com_resto = " ".join([comuns, *sorted(outras - palavras)]).strip()
+        pontuacao = max(
+            pontuacao,
+            SequenceMatcher(None, comuns, com_resto).ratio(),
+            SequenceMatcher(None, comuns, outro_com_resto).ratio(),
+            SequenceMatcher(None, com_resto, outro_com_resto).ratio(),
+        )
+
+    return pontuacao
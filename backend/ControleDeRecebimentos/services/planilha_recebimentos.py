@@ -0,0 +1,112 @@
+"""
+Planilha de recebimentos de uma análise EPR confirmada.
+
+Uma análise confirmada não muda mais, então cada planilha é gerada uma
+única vez por (análise, mês) e guardada em IMPORTACAO_DIR; os downloads
+seguintes só leem o arquivo do disco. A geração usa o modo write_only do
+openpyxl, que grava as linhas conforme são adicionadas em vez de montar a
+planilha inteira em memória.
+"""
+import os
+import re
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from openpyxl import Workbook
+
+from ControleDeRecebimentos.models import AnaliseEPRItem
+
+
+# (título da coluna, campo de AnaliseEPRItem)
+COLUNAS_PLANILHA_RECEBIMENTOS = [
+    ("Nome Empreendimento", "nome_empreendimento"),
+    ("Número Contrato", "numero_contrato"),
+    ("Nome Mutuário", "nome_mutuario"),
+    ("CPF/CNPJ Mutuário", "cpf_cnpj"),
+    ("Data de Assinatura", "data_assinatura"),
+    ("Valor de Financiamento", "valor_financiamento"),
+    ("Valor de Financiamento do Terreno", "valor_financiamento_terreno"),
+    ("Valor de Desconto Subsídio Complementar", "valor_subsidio"),
+    ("Valor do FGTS", "valor_fgts"),
+    ("Valor Recursos Próprios", "valor_recursos_proprios"),
+    ("Valor de Compra e Venda", "valor_compra_venda"),
+    ("Valor da Comissão", "valor_comissao"),
+]
+
+
+def caminho_planilha(analise_id, mes=None):
+    """
+    Onde fica a planilha de `analise_id` (filtrada por `mes`, se houver).
+    """
+    sufixo = re.sub(r"[^\w-]", "_", mes) if mes else "todos"
+    return (
+        Path(settings.IMPORTACAO_DIR)
+        / "analises_epr"
+        / f"analise_{analise_id}_{sufixo}.xlsx"
+    )
+
+
+def linhas_planilha(analise_id, mes=None):
+    itens = AnaliseEPRItem.objects.filter(analise_id=analise_id)
+    if mes:
+        itens = itens.filter(mes_referencia=mes)
+    return itens.order_by("id").values_list(
+        *(campo for _, campo in COLUNAS_PLANILHA_RECEBIMENTOS)
+    ).iterator(chunk_size=settings.DB_LOTE_CURSOR)
+
+
+def gerar_planilha(caminho, linhas):
+    """
+    Grava a planilha em `caminho` e retorna quantas linhas de dados foram
+    escritas. Nada é gravado quando não há linhas.
+
+    O arquivo é escrito em um temporário no mesmo diretório e só então
+    renomeado, para um download concorrente nunca ler uma planilha pela
+    metade.
+    """
+    linhas = iter(linhas)
+    primeira = next(linhas, None)
+    if primeira is None:
+        return 0
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Recebimentos")
+    ws.append([titulo for titulo, _ in COLUNAS_PLANILHA_RECEBIMENTOS])
+    ws.append(primeira)
+    total = 1
+    for linha in linhas:
+        ws.append(linha)
+        total += 1
+
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    fd, temporario = tempfile.mkstemp(dir=caminho.parent, suffix=".xlsx.tmp")
+    os.close(fd)
+    try:
+        wb.save(temporario)
+        os.replace(temporario, caminho)
+    except BaseException:
+        os.unlink(temporario)
+        raise
+    return total
+
+
+def planilha_recebimentos(analise_id, mes=None):
+    """
+    Caminho da planilha da análise confirmada `analise_id`, gerando-a na
+    primeira chamada. Retorna None quando não há dados para exportar.
+    """
+    caminho = caminho_planilha(analise_id, mes)
+    if caminho.exists():
+        return caminho
+    if not gerar_planilha(caminho, linhas_planilha(analise_id, mes)):
+        return None
+    return caminho
+
+
+def remover_planilhas(analise_id):
+    """
+    Apaga as planilhas geradas para `analise_id`, de todos os meses.
+    """
+    for caminho in caminho_planilha(analise_id).parent.glob(f"analise_{analise_id}_*.xlsx"):
+        caminho.unlink(missing_ok=True)
@@ -0,0 +1,188 @@
+"""
+Leitura de planilhas em blocos de tamanho fixo.
+
+Arquivos .xlsx são lidos com o openpyxl em modo read-only, linha a linha, de
+forma que só um bloco de cada vez fica em memória. Formatos sem leitura
+incremental (.xls via xlrd) são carregados inteiros e depois fatiados.
+
+Este módulo não depende dos models, para poder ser importado por processos
+auxiliares sem inicializar o Django.
+"""
+import multiprocessing
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+import pandas as pd
+from openpyxl import load_workbook
+
+
+ASSINATURA_ZIP = b"PK\x03\x04"
+
+
+def eh_xlsx(arquivo):
+    """
+    Detecta .xlsx pelo conteúdo (zip), sem depender da extensão enviada.
+    """
+    posicao = arquivo.tell()
+    assinatura = arquivo.read(len(ASSINATURA_ZIP))
+    arquivo.seek(posicao)
+    return assinatura == ASSINATURA_ZIP
+
+
+def nomes_colunas(cabecalho):
+    """
+    Reproduz os nomes que o pandas daria às colunas: vazias viram
+    'Unnamed: N' e repetidas recebem sufixo '.1', '.2'...
+    """
+    colunas = []
+    vistos = {}
+    for i, valor in enumerate(cabecalho):
+        nome = f"Unnamed: {i}" if valor is None else valor
+        if nome in vistos:
+            vistos[nome] += 1
+            nome = f"{nome}.{vistos[nome]}"
+        else:
+            vistos[nome] = 0
+        colunas.append(nome)
+    return colunas
+
+
+class LeitorPlanilha:
+    """
+    Itera uma planilha em DataFrames de até `tamanho_bloco` linhas.
+
+    Com `tamanho_bloco=None` a planilha é lida inteira com `pd.read_excel`
+    e entregue como um único bloco (comportamento original das views).
+    `total_linhas` é uma estimativa disponível antes da leitura, usada
+    para relatar progresso.
+    """
+
+    def __init__(self, arquivo, tamanho_bloco=None, sheet_name=None, skiprows=0, engine=None):
+        self.arquivo = arquivo
+        self.tamanho_bloco = tamanho_bloco
+        self.sheet_name = sheet_name
+        self.skiprows = skiprows
+        self.engine = engine
+        self.streaming = bool(tamanho_bloco) and eh_xlsx(arquivo)
+        self.total_linhas = None
+
+    def __iter__(self):
+        if self.streaming:
+            yield from self._blocos_xlsx()
+            return
+
+        df = pd.read_excel(
+            self.arquivo,
+            sheet_name=self.sheet_name or 0,
+            skiprows=self.skiprows,
+            engine=None if eh_xlsx(self.arquivo) else self.engine,
+        )
+        self.total_linhas = len(df)
+
+        passo = self.tamanho_bloco or max(len(df), 1)
+        for inicio in range(0, max(len(df), 1), passo):
+            yield df.iloc[inicio : inicio + passo]
+
+    def _blocos_xlsx(self):
+        wb = load_workbook(self.arquivo, read_only=True, data_only=True)
+        try:
+            if self.sheet_name is None:
+                ws = wb.worksheets[0]
+            elif self.sheet_name in wb.sheetnames:
+                ws = wb[self.sheet_name]
+            else:
+                raise ValueError(f"Worksheet named '{self.sheet_name}' not found")
+
+            if ws.max_row:
+                self.total_linhas = max(ws.max_row - self.skiprows - 1, 0)
+
+            linhas = ws.iter_rows(values_only=True)
+            for _ in range(self.skiprows):
+                next(linhas, None)
+
+            cabecalho = list(next(linhas, ()))
+            while cabecalho and cabecalho[-1] is None:
+                cabecalho.pop()
+            colunas = nomes_colunas(cabecalho)
+            largura = len(colunas)
+
+            bloco = []
+            vazias = 0
+            entregues = 0
+            for linha in linhas:
+                linha = tuple(linha[:largura]) + (None,) * (largura - len(linha))
+                if all(valor is None for valor in linha):
+                    # Linhas vazias só entram se houver dados depois delas,
+                    # como o pandas faz ao descartar o final da planilha
+                    vazias += 1
+                    continue
+                bloco.extend([(None,) * largura] * vazias)
+                vazias = 0
+                bloco.append(linha)
+
+                if len(bloco) >= self.tamanho_bloco:
+                    yield pd.DataFrame(bloco, columns=colunas)
+                    entregues += 1
+                    bloco = []
+
+            if bloco or not entregues:
+                yield pd.DataFrame(bloco, columns=colunas)
+        finally:
+            wb.close()
+
+
+@contextmanager
+def caminho_local(arquivo):
+    """
+    Caminho em disco do arquivo, para ser aberto por outros processos.
+    Uploads mantidos em memória são copiados para um temporário, removido
+    ao sair do bloco.
+    """
+    if hasattr(arquivo, "temporary_file_path"):
+        yield arquivo.temporary_file_path()
+        return
+    if isinstance(getattr(arquivo, "name", None), str) and os.path.isfile(arquivo.name):
+        yield arquivo.name
+        return
+
+    posicao = arquivo.tell()
+    with tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False) as temporario:
+        arquivo.seek(0)
+        shutil.copyfileobj(arquivo, temporario)
+    arquivo.seek(posicao)
+    try:
+        yield temporario.name
+    finally:
+        os.remove(temporario.name)
+
+
+def nomes_abas(caminho):
+    with pd.ExcelFile(caminho) as planilha:
+        return planilha.sheet_names
+
+
+def ler_aba(caminho, aba, skiprows=0):
+    return pd.read_excel(caminho, sheet_name=aba, skiprows=skiprows)
+
+
+def ler_abas(caminho, abas, skiprows=0, processos=1):
+    """
+    Lê várias abas da planilha em `caminho`, em paralelo quando
+    `processos` > 1. Devolve {aba: DataFrame} na ordem de `abas`.
+
+    Cada processo abre a planilha em modo read-only e interpreta apenas a
+    sua aba. Os processos são criados com `spawn`, que não herda conexões
+    com o banco nem as threads do processo web.
+    """
+    if processos <= 1 or len(abas) <= 1:
+        return {aba: ler_aba(caminho, aba, skiprows) for aba in abas}
+
+    with ProcessPoolExecutor(
+        max_workers=min(processos, len(abas)),
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as pool:
+        futuros = {aba: pool.submit(ler_aba, caminho, aba, skiprows) for aba in abas}
+        return {aba: futuro.result() for aba, futuro in futuros.items()}
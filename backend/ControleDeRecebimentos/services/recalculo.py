@@ -0,0 +1,211 @@
+"""
+Recálculo de campos derivados sobre a tabela inteira, em faixas de chave
+primária (ver o comando `recalcular_campos`).
+
+Cada faixa é processada e confirmada em sua própria transação, então uma
+execução interrompida pode ser retomada a partir das faixas que faltam. O
+progresso fica em IMPORTACAO_DIR/recalculos/<tarefa>.json.
+
+Com mais de um processo, as faixas são distribuídas em um pool criado com
+`spawn`: cada processo inicializa o Django e abre a sua própria conexão
+com o banco.
+"""
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Max, Min
+
+
+def recalcular_comissao(inicio, fim):
+    from ControleDeRecebimentos.models import Venda
+    from ControleDeRecebimentos.services.comissao import aplicar_regras
+
+    aplicar_regras(
+        Venda.objects.filter(id__gte=inicio, id__lt=fim, valor_venda__isnull=False)
+    )
+    return Venda.objects.filter(id__gte=inicio, id__lt=fim).count()
+
+
+def recalcular_nome_normalizado(inicio, fim):
+    from ControleDeRecebimentos.models import Cliente
+    from ControleDeRecebimentos.models.ClienteModel import indexar_chaves_busca
+    from ControleDeRecebimentos.services.nomes import normalizar_nome
+    from ControleDeRecebimentos.services.sql_em_lote import atualizar_em_lote
+
+    clientes = list(
+        Cliente.objects.filter(id__gte=inicio, id__lt=fim).only(
+            "nome", "nome_normalizado"
+        )
+    )
+    alterados = []
+    for cliente in clientes:
+        chave = normalizar_nome(cliente.nome)
+        if chave != cliente.nome_normalizado:
+            cliente.nome_normalizado = chave
+            alterados.append(cliente)
+    atualizar_em_lote(Cliente, alterados, ["nome_normalizado"])
+    indexar_chaves_busca(alterados)
+    return len(clientes)
+
+
+def resumo_e_cache():
+    from ControleDeRecebimentos.services.resumo_mensal import recalcular_resumo_mensal
+    from ControleDeRecebimentos.services.versao_vendas import invalidar_cache_vendas
+
+    recalcular_resumo_mensal()
+    invalidar_cache_vendas()
+
+
+# {tarefa: (nome do model, função que recalcula a faixa [inicio, fim),
+#           função executada uma vez ao final ou None)}
+TAREFAS = {
+    "comissao": ("Venda", recalcular_comissao, resumo_e_cache),
+    "nome_normalizado": ("Cliente", recalcular_nome_normalizado, None),
+}
+
+
+def faixas(model, tamanho_lote, primeiro_id=None):
+    """
+    Faixas [inicio, fim) de `tamanho_lote` ids até o maior id da tabela,
+    a partir de `primeiro_id` ou, se não informado, do menor id atual.
+    """
+    limites = model.objects.aggregate(menor=Min("id"), maior=Max("id"))
+    if limites["maior"] is None:
+        return []
+    if primeiro_id is None:
+        primeiro_id = limites["menor"]
+    return [
+        (inicio, inicio + tamanho_lote)
+        for inicio in range(primeiro_id, limites["maior"] + 1, tamanho_lote)
+    ]
+
+
+def processar_faixa(tarefa, inicio, fim):
+    with transaction.atomic():
+        return TAREFAS[tarefa][1](inicio, fim)
+
+
+def iniciar_processo(modulo_settings):
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", modulo_settings)
+    django.setup()
+
+
+def caminho_progresso(tarefa):
+    return Path(settings.IMPORTACAO_DIR) / "recalculos" / f"{tarefa}.json"
+
+
+def ler_progresso(tarefa, tamanho_lote):
+    """
+    Início das faixas e faixas já concluídas por uma execução anterior com
+    o mesmo tamanho de lote, ou (None, set()) se não houver. Um progresso
+    gravado com outro tamanho de lote é descartado.
+
+    As faixas são refeitas a partir do início gravado, e não do menor id
+    atual, para continuarem alinhadas mesmo que as primeiras linhas tenham
+    sido apagadas depois da interrupção.
+    """
+    caminho = caminho_progresso(tarefa)
+    if not caminho.exists():
+        return None, set()
+    with open(caminho, encoding="utf-8") as entrada:
+        progresso = json.load(entrada)
+    if progresso["tamanho_lote"] != tamanho_lote:
+        return None, set()
+    return progresso.get("primeiro_id"), {
+        tuple(faixa) for faixa in progresso["concluidas"]
+    }
+
+
+def gravar_progresso(tarefa, tamanho_lote, primeiro_id, concluidas):
+    caminho = caminho_progresso(tarefa)
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    fd, temporario = tempfile.mkstemp(dir=caminho.parent)
+    with os.fdopen(fd, "w", encoding="utf-8") as saida:
+        json.dump(
+            {
+                "tamanho_lote": tamanho_lote,
+                "primeiro_id": primeiro_id,
+                "concluidas": sorted(concluidas),
+            },
+            saida,
+        )
+    os.replace(temporario, caminho)
+
+
+def recalcular(tarefa, tamanho_lote=50000, processos=1, retomar=False, relatar=None):
+    """
+    Executa `tarefa` (ver TAREFAS) sobre a tabela inteira. `relatar`, se
+    informado, recebe um dict de progresso ao fim de cada faixa. Retorna o
+    total de linhas processadas nesta execução e o tempo gasto.
+    """
+    from django.apps import apps
+
+    if connection.vendor == "sqlite":
+        # O SQLite serializa as escritas: processos paralelos só disputariam
+        # o lock do banco
+        processos = 1
+    model = apps.get_model("ControleDeRecebimentos", TAREFAS[tarefa][0])
+    primeiro_id, concluidas = (
+        ler_progresso(tarefa, tamanho_lote) if retomar else (None, set())
+    )
+    todas = faixas(model, tamanho_lote, primeiro_id)
+    if todas:
+        primeiro_id = todas[0][0]
+    pendentes = [faixa for faixa in todas if faixa not in concluidas]
+
+    total = len(concluidas) + len(pendentes)
+    inicio = time.perf_counter()
+    linhas = 0
+
+    def concluir(faixa, processadas):
+        nonlocal linhas
+        linhas += processadas
+        concluidas.add(faixa)
+        gravar_progresso(tarefa, tamanho_lote, primeiro_id, concluidas)
+        if relatar:
+            segundos = time.perf_counter() - inicio
+            relatar(
+                {
+                    "faixas_concluidas": len(concluidas),
+                    "faixas_total": total,
+                    "linhas": linhas,
+                    "linhas_por_segundo": round(linhas / segundos, 1),
+                }
+            )
+
+    if processos <= 1 or len(pendentes) <= 1:
+        for faixa in pendentes:
+            concluir(faixa, processar_faixa(tarefa, *faixa))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=processos,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=iniciar_processo,
+            initargs=(os.environ["DJANGO_SETTINGS_MODULE"],),
+        ) as pool:
+            futuros = {
+                pool.submit(processar_faixa, tarefa, *faixa): faixa
+                for faixa in pendentes
+            }
+            try:
+                for futuro in as_completed(futuros):
+                    concluir(futuros[futuro], futuro.result())
+            except BaseException:
+                # As faixas concluídas já estão no progresso; as que não
+                # começaram ficam para a retomada
+                pool.shutdown(cancel_futures=True)
+                raise
+
+    _, _, finalizar = TAREFAS[tarefa]
+    if finalizar:
+        finalizar()
+    caminho_progresso(tarefa).unlink(missing_ok=True)
+    return {"linhas": linhas, "segundos": round(time.perf_counter() - inicio, 2)}
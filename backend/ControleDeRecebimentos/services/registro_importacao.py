@@ -0,0 +1,110 @@
+"""
+Idempotência das importações por conteúdo do arquivo.
+
+Cada importação concluída grava um ImportLog com o SHA-256 do arquivo, os
+parâmetros e o resultado. Reenviar o mesmo arquivo para a mesma rota com os
+mesmos parâmetros devolve o resultado guardado sem ler a planilha, a menos
+que a requisição peça `forcar=true`.
+
+O conteúdo original fica guardado para auditoria em
+IMPORTACAO_DIR/arquivos/<2 primeiros caracteres do hash>/<hash>; arquivos
+iguais ocupam uma única cópia.
+"""
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.db.models import F
+
+from ControleDeRecebimentos.models import ImportLog
+
+
+TIPOS_REGISTRADOS = {tipo for tipo, _ in ImportLog.TIPO_CHOICES}
+
+
+def partes(arquivo):
+    arquivo.seek(0)
+    if hasattr(arquivo, "chunks"):
+        yield from arquivo.chunks()
+    else:
+        yield from iter(lambda: arquivo.read(1024 * 1024), b"")
+    arquivo.seek(0)
+
+
+def hash_conteudo(arquivo):
+    """
+    SHA-256 do conteúdo de `arquivo`, lido em partes. O arquivo volta ao
+    início ao final.
+    """
+    sha = hashlib.sha256()
+    for parte in partes(arquivo):
+        sha.update(parte)
+    return sha.hexdigest()
+
+
+def chave_importacao(tipo, hash_arquivo, parametros):
+    conteudo = json.dumps([tipo, hash_arquivo, parametros], sort_keys=True, default=str)
+    return hashlib.sha256(conteudo.encode()).hexdigest()
+
+
+def caminho_armazenado(hash_arquivo):
+    return Path(settings.IMPORTACAO_DIR) / "arquivos" / hash_arquivo[:2] / hash_arquivo
+
+
+def armazenar_arquivo(arquivo, hash_arquivo):
+    """
+    Guarda o conteúdo de `arquivo` no armazenamento por hash, se ainda não
+    estiver lá, e retorna o caminho.
+    """
+    caminho = caminho_armazenado(hash_arquivo)
+    if caminho.exists():
+        return caminho
+
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    fd, temporario = tempfile.mkstemp(dir=caminho.parent)
+    try:
+        with os.fdopen(fd, "wb") as destino:
+            for parte in partes(arquivo):
+                destino.write(parte)
+        os.replace(temporario, caminho)
+    except BaseException:
+        os.unlink(temporario)
+        raise
+    return caminho
+
+
+def importacao_anterior(tipo, hash_arquivo, parametros):
+    """
+    ImportLog de uma importação igual já concluída, ou None. Conta o reenvio
+    no registro encontrado.
+    """
+    registro = ImportLog.objects.filter(
+        chave=chave_importacao(tipo, hash_arquivo, parametros)
+    ).first()
+    if registro is not None:
+        ImportLog.objects.filter(id=registro.id).update(reenvios=F("reenvios") + 1)
+    return registro
+
+
+def registrar_importacao(tipo, arquivo, hash_arquivo, parametros, resultado):
+    """
+    Guarda o arquivo e registra o resultado da importação. Uma importação
+    forçada de um arquivo já registrado substitui o resultado anterior.
+    """
+    armazenar_arquivo(arquivo, hash_arquivo)
+    registro, _ = ImportLog.objects.update_or_create(
+        chave=chave_importacao(tipo, hash_arquivo, parametros),
+        defaults={
+            "tipo": tipo,
+            "hash_arquivo": hash_arquivo,
+            "nome_arquivo": Path(getattr(arquivo, "name", "") or "").name[:255],
+            "tamanho_bytes": getattr(arquivo, "size", None)
+            or caminho_armazenado(hash_arquivo).stat().st_size,
+            "parametros": parametros,
+            "resultado": json.loads(json.dumps(resultado, default=str)),
+        },
+    )
+    return registro
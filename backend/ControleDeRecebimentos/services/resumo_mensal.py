@@ -0,0 +1,64 @@
+"""
+Resumo mensal das vendas (ResumoMensal), lido pelo dashboard por mês.
+
+Toda rotina do backend que grava em Venda chama `vendas_alteradas` com os
+meses afetados, e só esses meses são recalculados, cada um com uma query
+agregada sobre o índice de tabela_mensal. Alterações feitas fora do backend
+(ex: direto no banco) não são vistas; nesses casos o comando
+`reconstruir_resumo_mensal` refaz a tabela inteira.
+"""
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from ControleDeRecebimentos.models import ResumoMensal, Venda
+from ControleDeRecebimentos.services.versao_vendas import invalidar_cache_vendas
+
+
+def recalcular_resumo_mensal(tabela_ids=None):
+    """
+    Recalcula o resumo dos meses em `tabela_ids`, ou de todos com None.
+    """
+    vendas = Venda.objects.all()
+    resumos = ResumoMensal.objects.all()
+    if tabela_ids is not None:
+        vendas = vendas.filter(tabela_mensal_id__in=tabela_ids)
+        resumos = resumos.filter(tabela_mensal_id__in=tabela_ids)
+
+    totais = (
+        vendas.values("tabela_mensal_id", "status")
+        .annotate(total_vendas=Count("id"), total_comissao=Sum("valor_comissao"))
+        .order_by()
+    )
+
+    with transaction.atomic():
+        resumos.delete()
+        ResumoMensal.objects.bulk_create(
+            [
+                ResumoMensal(
+                    tabela_mensal_id=linha["tabela_mensal_id"],
+                    status=linha["status"],
+                    total_vendas=linha["total_vendas"],
+                    total_comissao=linha["total_comissao"] or 0,
+                )
+                for linha in totais
+            ]
+        )
+
+
+def vendas_alteradas(tabela_ids):
+    """
+    Deve ser chamada depois de criar, atualizar ou excluir vendas, com os
+    ids das TabelaMensal afetadas. Atualiza o resumo mensal e invalida os
+    caches derivados das vendas.
+    """
+    tabela_ids = {tabela_id for tabela_id in tabela_ids if tabela_id}
+    if tabela_ids:
+        recalcular_resumo_mensal(tabela_ids)
+        invalidar_cache_vendas()
+
+
+def meses_das_vendas(vendas):
+    """
+    Ids das TabelaMensal de um queryset de vendas.
+    """
+    return set(vendas.values_list("tabela_mensal_id", flat=True).distinct())
@@ -0,0 +1,210 @@
+"""
+Escritas em lote feitas direto em SQL, para os casos em que o ORM obrigaria
+a ler os registros existentes antes de gravar.
+
+Suporta PostgreSQL (produção) e SQLite 3.35+ (testes).
+"""
+import io
+import uuid
+
+from django.db import NotSupportedError, connections, transaction
+
+
+def upsert(model, objs, unique_fields, update_fields, using="default"):
+    """
+    Grava `objs` com INSERT ... ON CONFLICT (unique_fields) DO UPDATE SET
+    update_fields ... RETURNING, em lotes, sem consultar antes quais já
+    existem. Retorna (ids criados, ids atualizados).
+
+    `unique_fields` precisa corresponder a uma restrição única do model.
+    Objetos com a mesma chave são gravados uma vez, prevalecendo o último.
+    Como NULLs nunca conflitam em restrições únicas, objetos com NULL em
+    algum campo da chave sempre seriam inseridos: quem chama deve tratá-los
+    à parte.
+    """
+    connection = connections[using]
+    if connection.vendor not in ("postgresql", "sqlite"):
+        raise NotSupportedError(f"upsert não suportado em {connection.vendor}")
+
+    opts = model._meta
+    campos = [campo for campo in opts.concrete_fields if not campo.primary_key]
+    chave = [opts.get_field(nome) for nome in unique_fields]
+    atualizar = [opts.get_field(nome) for nome in update_fields]
+
+    por_chave = {}
+    for obj in objs:
+        por_chave[tuple(getattr(obj, campo.attname) for campo in chave)] = obj
+    if not por_chave:
+        return [], []
+
+    qn = connection.ops.quote_name
+    tabela = qn(opts.db_table)
+    pk = qn(opts.pk.column)
+    linha = "(" + ", ".join(["%s"] * len(campos)) + ")"
+    sql = (
+        f"INSERT INTO {tabela} ({', '.join(qn(campo.column) for campo in campos)}) "
+        "VALUES {valores} "
+        f"ON CONFLICT ({', '.join(qn(campo.column) for campo in chave)}) DO UPDATE SET "
+        + ", ".join(f"{qn(campo.column)} = EXCLUDED.{qn(campo.column)}" for campo in atualizar)
+        + f" RETURNING {pk}, "
+    )
+
+    max_params = connection.features.max_query_params or 65535
+    tamanho_lote = max(min(1000, (max_params - 1) // len(campos)), 1)
+    objs = list(por_chave.values())
+    criados, atualizados = [], []
+
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            # Linhas inseridas por este comando ainda não têm xmax
+            inserida, extra = "(xmax = 0)", []
+        else:
+            # No SQLite a escrita é serializada e o id só cresce
+            cursor.execute(f"SELECT COALESCE(MAX({pk}), 0) FROM {tabela}")
+            inserida, extra = f"({pk} > %s)", [cursor.fetchone()[0]]
+
+        for inicio in range(0, len(objs), tamanho_lote):
+            lote = objs[inicio : inicio + tamanho_lote]
+            parametros = [
+                campo.get_db_prep_save(campo.pre_save(obj, add=True), connection)
+                for obj in lote
+                for campo in campos
+            ]
+            cursor.execute(
+                sql.format(valores=", ".join([linha] * len(lote))) + inserida,
+                parametros + extra,
+            )
+            for id, criado in cursor.fetchall():
+                (criados if criado else atualizados).append(id)
+
+    return criados, atualizados
+
+
+# Tipos de campo cujo valor preparado para o banco é um escalar (número,
+# texto, data ou booleano), que o COPY em texto representa corretamente.
+# Campos como JSONField são preparados como objetos de adaptação do driver.
+TIPOS_ATUALIZAVEIS = {
+    "AutoField",
+    "BigAutoField",
+    "BigIntegerField",
+    "BooleanField",
+    "CharField",
+    "DateField",
+    "DateTimeField",
+    "DecimalField",
+    "FloatField",
+    "ForeignKey",
+    "IntegerField",
+    "PositiveIntegerField",
+    "PositiveSmallIntegerField",
+    "SmallIntegerField",
+    "TextField",
+}
+
+
+def texto_copy(valor):
+    """
+    Valor no formato texto do COPY do PostgreSQL.
+    """
+    if valor is None:
+        return "\\N"
+    return (
+        str(valor)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def copiar(cursor, tabela, colunas, linhas):
+    """
+    Grava `linhas` em `tabela` com COPY FROM STDIN. O COPY não passa pelo
+    cursor do Django, então usa o cursor do driver (psycopg 3 ou psycopg2).
+    """
+    from django.db.backends.postgresql.psycopg_any import is_psycopg3
+
+    sql = f"COPY {tabela} ({', '.join(colunas)}) FROM STDIN"
+    if is_psycopg3:
+        with cursor.cursor.copy(sql) as copia:
+            for linha in linhas:
+                copia.write_row(linha)
+    else:
+        conteudo = "".join(
+            "\t".join(texto_copy(valor) for valor in linha) + "\n" for linha in linhas
+        )
+        cursor.cursor.copy_expert(sql, io.StringIO(conteudo))
+
+
+def atualizar_em_lote(model, objs, fields, using="default"):
+    """
+    Grava `fields` de `objs` (já existentes) com um único UPDATE ... FROM
+    uma tabela temporária, em vez do UPDATE ... CASE WHEN id = ... do
+    `bulk_update`, que cresce com o número de objetos. Os valores entram na
+    tabela temporária com COPY no PostgreSQL e executemany no SQLite.
+    Retorna o número de linhas atualizadas.
+
+    Só aceita campos dos tipos em TIPOS_ATUALIZAVEIS. Objetos repetidos são
+    gravados uma vez, prevalecendo o último.
+    """
+    connection = connections[using]
+    if connection.vendor not in ("postgresql", "sqlite"):
+        raise NotSupportedError(f"atualizar_em_lote não suportado em {connection.vendor}")
+
+    opts = model._meta
+    campos = [opts.get_field(nome) for nome in fields]
+    for campo in [opts.pk, *campos]:
+        if campo.get_internal_type() not in TIPOS_ATUALIZAVEIS:
+            raise ValueError(
+                f"atualizar_em_lote não suporta {campo.name} "
+                f"({campo.get_internal_type()})"
+            )
+    por_id = {obj.pk: obj for obj in objs}
+    if not por_id:
+        return 0
+
+    qn = connection.ops.quote_name
+    tabela = qn(opts.db_table)
+    pk = qn(opts.pk.column)
+    temporaria = qn(f"tmp_{opts.db_table}_{uuid.uuid4().hex[:8]}".lower())
+    colunas = [pk, *(qn(campo.column) for campo in campos)]
+    linhas = [
+        [
+            opts.pk.get_db_prep_value(obj.pk, connection),
+            *(
+                campo.get_db_prep_save(getattr(obj, campo.attname), connection)
+                for campo in campos
+            ),
+        ]
+        for obj in por_id.values()
+    ]
+
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        definicoes = ", ".join(
+            f"{coluna} {tipo}"
+            for coluna, tipo in zip(
+                colunas,
+                [
+                    opts.pk.rel_db_type(connection),
+                    *(campo.db_type(connection) for campo in campos),
+                ],
+            )
+        )
+        cursor.execute(f"CREATE TEMPORARY TABLE {temporaria} ({definicoes})")
+        if connection.vendor == "postgresql":
+            copiar(cursor, temporaria, colunas, linhas)
+        else:
+            cursor.executemany(
+                f"INSERT INTO {temporaria} VALUES ({', '.join(['%s'] * len(colunas))})",
+                linhas,
+            )
+        cursor.execute(
+            f"UPDATE {tabela} SET "
+            + ", ".join(f"{coluna} = {temporaria}.{coluna}" for coluna in colunas[1:])
+            + f" FROM {temporaria} WHERE {tabela}.{pk} = {temporaria}.{pk}"
+        )
+        atualizadas = cursor.rowcount
+        # Em caso de erro, o rollback da transação já descarta a tabela
+        cursor.execute(f"DROP TABLE {temporaria}")
+
+    return atualizadas
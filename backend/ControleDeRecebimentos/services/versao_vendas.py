@@ -0,0 +1,42 @@
+"""
+Versão dos dados de vendas, usada para invalidar os caches derivados deles
+(ex: totais do dashboard). Os caches incluem a versão na chave, e toda
+gravação feita pelo backend troca a versão.
+"""
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+from ControleDeRecebimentos.roteador import registrar_escrita_vendas
+
+
+CHAVE_VERSAO = "vendas:versao"
+
+
+def versao_vendas():
+    versao = cache.get(CHAVE_VERSAO)
+    if versao is None:
+        # Começa de um valor novo, para não reaproveitar entradas antigas
+        # caso a chave da versão tenha sido descartada pelo cache
+        cache.add(CHAVE_VERSAO, time.time_ns(), timeout=None)
+        versao = cache.get(CHAVE_VERSAO)
+    return versao
+
+
+def trocar_versao_vendas():
+    """
+    Grava uma versão nova sem ler a atual: o `incr` dos caches em arquivo e
+    em banco faz leitura e gravação separadas, o que pode juntar duas
+    trocas simultâneas em uma, e regrava a chave com o timeout padrão.
+    """
+    registrar_escrita_vendas()
+    cache.set(CHAVE_VERSAO, time.time_ns(), timeout=None)
+
+
+def invalidar_cache_vendas():
+    """
+    Troca a versão quando a transação atual for confirmada, para que
+    nenhuma leitura anterior ao commit seja guardada com a versão nova.
+    """
+    transaction.on_commit(trocar_versao_vendas)
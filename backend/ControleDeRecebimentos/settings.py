@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 import os
 import sys
+import tempfile
 from pathlib import Path
 from dotenv import load_dotenv
 import dj_database_url
@@ -50,6 +51,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Só é carregado com INSTRUMENTACAO_ATIVA (ver middleware.py)
+    "ControleDeRecebimentos.middleware.InstrumentacaoMiddleware",
+    # Só é carregado com a réplica de leitura ativa (ver roteador.py)
+    "ControleDeRecebimentos.middleware.FixarPrimarioMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -87,7 +92,34 @@ SIMPLE_JWT = {
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {"default": dj_database_url.config(default=os.getenv("DATABASE_URL"))}
+# Conexões persistentes: cada processo reaproveita a sua conexão entre
+# requisições por até DB_CONN_MAX_AGE segundos (0 abre uma por requisição),
+# verificando antes de reaproveitá-la se ela ainda responde. Atrás de um
+# pgbouncer em modo transação, desligue os cursores no servidor.
+CONEXAO_BANCO = {
+    "conn_max_age": int(os.getenv("DB_CONN_MAX_AGE", 600)),
+    "conn_health_checks": os.getenv("DB_CONN_HEALTH_CHECKS", "true").lower()
+    in ("1", "true", "sim"),
+    "disable_server_side_cursors": os.getenv(
+        "DB_DESATIVAR_CURSORES_SERVIDOR", "false"
+    ).lower()
+    in ("1", "true", "sim"),
+}
+
+DATABASES = {
+    "default": dj_database_url.config(
+        default=os.getenv("DATABASE_URL"), **CONEXAO_BANCO
+    )
+}
+
+# Réplica de leitura opcional, usada pelos dashboards, pela listagem de
+# vendas e pela listagem/detalhe/exportação das análises EPR (ver
+# roteador.py). Nos testes ela espelha o banco padrão.
+if os.getenv("REPLICA_DATABASE_URL"):
+    DATABASES["replica"] = {
+        **dj_database_url.parse(os.getenv("REPLICA_DATABASE_URL"), **CONEXAO_BANCO),
+        "TEST": {"MIRROR": "default"},
+    }
 
 # Usa SQLite para testes (mais rápido e sem problemas de conexão)
 if "test" in sys.argv:
@@ -95,6 +127,99 @@ if "test" in sys.argv:
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "test_db.sqlite3",
     }
+    DATABASES["replica"] = {**DATABASES["default"], "TEST": {"MIRROR": "default"}}
+
+DATABASE_ROUTERS = ["ControleDeRecebimentos.roteador.RoteadorReplica"]
+# Nos testes a réplica só é usada quando o teste liga REPLICA_ATIVA
+REPLICA_ATIVA = "replica" in DATABASES and "test" not in sys.argv
+# Tempo em que as leituras ficam no banco principal depois de uma gravação
+REPLICA_JANELA_SEGUNDOS = int(os.getenv("REPLICA_JANELA_SEGUNDOS", 5))
+
+# Linhas trazidas por vez nas varreduras grandes das importações e análises,
+# lidas com cursor no servidor (no PostgreSQL) em vez de trazer todas de uma vez
+DB_LOTE_CURSOR = int(os.getenv("DB_LOTE_CURSOR", 2000))
+
+
+# Cache
+# Arquivos por padrão, para a versão dos dados ser compartilhada entre os
+# workers do servidor. Nos testes o cache fica desligado.
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.filebased.FileBasedCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", str(BASE_DIR / "cache")),
+    }
+}
+if "test" in sys.argv:
+    CACHES["default"] = {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+
+# Validade máxima dos totais do dashboard em cache. As gravações feitas pelo
+# backend já invalidam o cache; o prazo cobre alterações feitas fora dele.
+DASHBOARD_CACHE_SEGUNDOS = int(os.getenv("DASHBOARD_CACHE_SEGUNDOS", 300))
+# Idem para a lista de meses com os totais (/tabelas-mensais/)
+TABELAS_MENSAIS_CACHE_SEGUNDOS = int(os.getenv("TABELAS_MENSAIS_CACHE_SEGUNDOS", 60))
+
+
+# Instrumentação das requisições: queries, tempo no banco e tempo da view
+# no cabeçalho Server-Timing e no log "ControleDeRecebimentos.instrumentacao"
+INSTRUMENTACAO_ATIVA = os.getenv("INSTRUMENTACAO_ATIVA", "false").lower() in (
+    "1",
+    "true",
+    "sim",
+)
+# Requisições mais lentas que isso logam a lista completa de queries
+INSTRUMENTACAO_LIMIAR_MS = float(os.getenv("INSTRUMENTACAO_LIMIAR_MS", 500))
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {
+        "ControleDeRecebimentos.instrumentacao": {
+            "handlers": ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
+    },
+}
+
+
+# Importação de planilhas
+# Linhas por bloco no modo streaming (`streaming=true` nas rotas /import/...)
+IMPORTACAO_TAMANHO_BLOCO = int(os.getenv("IMPORTACAO_TAMANHO_BLOCO", 5000))
+
+# Processos usados para ler as abas em paralelo (`todas_abas=true` no
+# Controle Gestores)
+IMPORTACAO_PROCESSOS = int(
+    os.getenv("IMPORTACAO_PROCESSOS", min(os.cpu_count() or 1, 4))
+)
+
+# Arquivos das importações: uploads em segundo plano (`assincrono=true`),
+# cópias por hash dos arquivos importados e planilhas das análises EPR
+IMPORTACAO_DIR = Path(os.getenv("IMPORTACAO_DIR", BASE_DIR / "importacoes"))
+if "test" in sys.argv:
+    IMPORTACAO_DIR = Path(tempfile.mkdtemp(prefix="importacoes-testes-"))
+# Threads do pool que executa os jobs de importação em cada processo
+IMPORTACAO_JOBS_WORKERS = int(os.getenv("IMPORTACAO_JOBS_WORKERS", 2))
+# Tempo sem progresso após o qual um job de outro processo é considerado
+# abandonado (ex: o processo foi reiniciado durante a importação)
+IMPORTACAO_JOBS_EXPIRACAO_SEGUNDOS = int(
+    os.getenv("IMPORTACAO_JOBS_EXPIRACAO_SEGUNDOS", 1800)
+)
+# Executa os jobs dentro da própria requisição (usado nos testes)
+IMPORTACAO_JOBS_SINCRONO = False
+
+# Busca aproximada de nomes (`fuzzy=true`)
+# Similaridade mínima para casar automaticamente e para sugerir candidatos
+IMPORTACAO_FUZZY_LIMIAR = float(os.getenv("IMPORTACAO_FUZZY_LIMIAR", 0.9))
+IMPORTACAO_FUZZY_LIMIAR_SUGESTAO = float(
+    os.getenv("IMPORTACAO_FUZZY_LIMIAR_SUGESTAO", 0.75)
+)
+# Tempo máximo gasto na busca aproximada por importação
+IMPORTACAO_FUZZY_ORCAMENTO_SEGUNDOS = float(
+    os.getenv("IMPORTACAO_FUZZY_ORCAMENTO_SEGUNDOS", 10)
+)
 
 
 # Password validation
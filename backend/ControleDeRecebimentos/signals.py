@@ -0,0 +1,49 @@
+"""
+Invalida os caches derivados das vendas (ver services/versao_vendas.py)
+nas gravações feitas objeto a objeto, como as do admin e dos serializers.
+As gravações em massa dos importadores já chamam `vendas_alteradas`.
+
+Não há receiver de post_delete em Venda: ele impediria o Django de apagar
+em massa as vendas de uma TabelaMensal removida, e essa remoção já é
+coberta pelo receiver da própria TabelaMensal.
+
+Ao apagar uma AnaliseEPR, apaga também as planilhas de recebimentos
+geradas para ela em IMPORTACAO_DIR. Quando uma análise é confirmada,
+cancelada ou apagada e nenhuma outra análise pendente usa o mesmo arquivo,
+a cópia colunar da planilha EPR também é apagada.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from ControleDeRecebimentos.models import AnaliseEPR, TabelaMensal, Venda
+from ControleDeRecebimentos.services.cache_colunar import remover_copias
+from ControleDeRecebimentos.services.planilha_recebimentos import remover_planilhas
+from ControleDeRecebimentos.services.versao_vendas import invalidar_cache_vendas
+
+
+@receiver(post_save, sender=TabelaMensal)
+@receiver(post_delete, sender=TabelaMensal)
+@receiver(post_save, sender=Venda)
+def tabela_ou_venda_alterada(sender, **kwargs):
+    invalidar_cache_vendas()
+
+
+def descartar_copia_sem_uso(analise):
+    if not analise.hash_arquivo:
+        return
+    if not AnaliseEPR.objects.filter(
+        hash_arquivo=analise.hash_arquivo, status="PE"
+    ).exists():
+        remover_copias(analise.hash_arquivo)
+
+
+@receiver(post_save, sender=AnaliseEPR)
+def analise_epr_salva(sender, instance, **kwargs):
+    if instance.status != "PE":
+        descartar_copia_sem_uso(instance)
+
+
+@receiver(post_delete, sender=AnaliseEPR)
+def analise_epr_removida(sender, instance, **kwargs):
+    remover_planilhas(instance.id)
+    descartar_copia_sem_uso(instance)
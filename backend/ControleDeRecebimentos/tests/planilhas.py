@@ -0,0 +1,27 @@
+from io import BytesIO
+
+from openpyxl import Workbook
+
+
+def gerar_xlsx(cabecalho, linhas, preambulo=0, abas=None, nome="planilha.xlsx"):
+    """
+    Monta um .xlsx em memória para os testes de importação.
+
+    `preambulo` é o número de linhas descartadas antes do cabeçalho e
+    `abas` permite gerar várias abas: {"NOV25": linhas, ...}.
+    """
+    wb = Workbook()
+    wb.remove(wb.active)
+    for titulo, dados in (abas or {"Planilha1": linhas}).items():
+        ws = wb.create_sheet(titulo)
+        for _ in range(preambulo):
+            ws.append([titulo])
+        ws.append(cabecalho)
+        for linha in dados:
+            ws.append(linha)
+
+    arquivo = BytesIO()
+    wb.save(arquivo)
+    arquivo.seek(0)
+    arquivo.name = nome
+    return arquivo
@@ -0,0 +1,356 @@
+import shutil
+import tempfile
+from io import BytesIO
+from pathlib import Path
+from unittest import mock
+
+from django.test import override_settings
+from openpyxl import load_workbook
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ControleDeRecebimentos.models import (
+    AnaliseEPR,
+    Cliente,
+    Empreendimento,
+    TabelaMensal,
+    Venda,
+)
+from ControleDeRecebimentos.tests.planilhas import gerar_xlsx
+
+
+CABECALHO_EPR = [
+    "Nome Empreendimento",
+    "Número Contrato",
+    "Nome Mutuário",
+    "CPF/CNPJ Mutuário",
+    "Valor de Financiamento",
+]
+
+
+class AnaliseEPRAPITestCase(APITestCase):
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.diretorio)
+        configuracao = override_settings(IMPORTACAO_DIR=self.diretorio)
+        configuracao.enable()
+        self.addCleanup(configuracao.disable)
+
+        self.tabela = TabelaMensal.objects.create(mes_referencia="2025-11")
+        empreendimento = Empreendimento.objects.create(nome="Residencial Sol")
+        self.vendas = [
+            Venda.objects.create(
+                tabela_mensal=self.tabela,
+                cliente=Cliente.objects.create(nome=nome),
+                empreendimento=empreendimento,
+                data_venda="2025-11-10",
+                forma_pagamento="FI",
+                valor_comissao=100,
+            )
+            for nome in ["Ana Souza", "Bruno Lima"]
+        ]
+
+    def analisar(self, **extra):
+        arquivo = gerar_xlsx(
+            CABECALHO_EPR,
+            [
+                ["SOL", "123", "ANA SOUZA", "000.000.000-00", 150000],
+                ["SOL", "456", "Fulano", "111.111.111-11", 90000],
+            ],
+        )
+        return self.client.post(
+            "/import/epr/analisar/", {"file": arquivo, **extra}, format="multipart"
+        )
+
+    def test_analisar_nao_altera_vendas(self):
+        response = self.analisar()
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["resumo"]["total_linhas_epr"], 2)
+        self.assertEqual(response.data["resumo"]["vendas_encontradas"], 1)
+        self.assertEqual(response.data["resumo"]["por_mes"], {"2025-11": 1})
+        self.assertFalse(Venda.objects.filter(status="FA").exists())
+
+    def test_busca_aproximada_nao_reaproveita_venda_casada(self):
+        self.vendas[0].cliente.nome = "Ana Zzyzxouza"
+        self.vendas[0].cliente.save()
+        arquivo = gerar_xlsx(
+            CABECALHO_EPR,
+            [
+                ["SOL", "123", "Ana Zzyzxouza", "000.000.000-00", 150000],
+                ["SOL", "124", "Ana Zzyzxousa", "000.000.000-00", 150000],
+            ],
+        )
+
+        response = self.client.post(
+            "/import/epr/analisar/",
+            {"file": arquivo, "fuzzy": "true"},
+            format="multipart",
+        )
+
+        self.assertEqual(response.data["resumo"]["vendas_encontradas"], 1)
+        analise = AnaliseEPR.objects.get(id=response.data["analise_id"])
+        self.assertEqual(analise.itens.count(), 1)
+        busca = response.data["busca_aproximada"]
+        self.assertEqual(busca["casadas"], 0)
+        self.assertEqual(busca["casamentos"], [])
+        self.assertEqual(busca["sugestoes"][0]["nome"], "Ana Zzyzxousa")
+
+    def test_um_item_por_venda(self):
+        arquivo = gerar_xlsx(
+            CABECALHO_EPR,
+            [
+                ["SOL", "123", "Ana Sousa", "000.000.000-00", 150000],
+                ["SOL", "124", "Ana Maria Souza", "000.000.000-00", 160000],
+            ],
+        )
+
+        response = self.client.post(
+            "/import/epr/analisar/",
+            {"file": arquivo, "fuzzy": "true"},
+            format="multipart",
+        )
+
+        self.assertEqual(response.data["resumo"]["vendas_encontradas"], 1)
+        self.assertEqual(response.data["resumo"]["por_mes"], {"2025-11": 1})
+        analise = AnaliseEPR.objects.get(id=response.data["analise_id"])
+        self.assertEqual(analise.total_encontradas, 1)
+        [item] = analise.itens.all()
+        self.assertEqual(item.venda_id, self.vendas[0].id)
+        self.assertEqual(item.nome_mutuario, "Ana Maria Souza")
+
+    def test_reanalisar_sem_ler_planilha(self):
+        anterior = self.analisar().data["analise_id"]
+        self.assertTrue(any(Path(self.diretorio, "colunar").iterdir()))
+        # Nome corrigido no cadastro depois da primeira análise
+        cliente = self.vendas[1].cliente
+        cliente.nome = "Fulano"
+        cliente.save()
+
+        with mock.patch("pandas.read_excel", side_effect=AssertionError) as leitura:
+            response = self.client.post(f"/import/epr/reanalisar/{anterior}/")
+
+        leitura.assert_not_called()
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["resumo"]["total_linhas_epr"], 2)
+        self.assertEqual(response.data["resumo"]["vendas_encontradas"], 2)
+        self.assertEqual(response.data["analise_anterior_id"], anterior)
+        self.assertEqual(AnaliseEPR.objects.get(id=anterior).status, "CA")
+
+        detalhe = self.client.get(f"/analises-epr/{response.data['analise_id']}/")
+        self.assertEqual(
+            sorted(d["numero_contrato"] for d in detalhe.data["dados_epr"]),
+            ["123", "456"],
+        )
+
+    def test_reanalisar_sem_vendas_encontradas(self):
+        anterior = self.analisar().data["analise_id"]
+        for venda in self.vendas:
+            venda.status = "FA"
+            venda.save()
+
+        response = self.client.post(f"/import/epr/reanalisar/{anterior}/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("analise_id", response.data)
+        self.assertEqual(AnaliseEPR.objects.get(id=anterior).status, "PE")
+        self.assertTrue(any(Path(self.diretorio, "colunar").iterdir()))
+
+    def test_reanalisar_sem_copia_da_planilha(self):
+        analise_id = self.analisar().data["analise_id"]
+        shutil.rmtree(Path(self.diretorio, "colunar"))
+
+        response = self.client.post(f"/import/epr/reanalisar/{analise_id}/")
+
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+        self.assertEqual(AnaliseEPR.objects.get(id=analise_id).status, "PE")
+
+    def test_copia_da_planilha_mantida_enquanto_ha_analise_pendente(self):
+        anterior = self.analisar().data["analise_id"]
+        colunar = Path(self.diretorio, "colunar")
+
+        nova = self.client.post(f"/import/epr/reanalisar/{anterior}/").data["analise_id"]
+
+        self.assertTrue(any(colunar.iterdir()))
+
+        self.client.post(f"/import/epr/confirmar/{nova}/")
+
+        self.assertEqual(list(colunar.iterdir()), [])
+
+    def test_cancelar_apaga_copia_da_planilha(self):
+        analise_id = self.analisar().data["analise_id"]
+
+        self.client.post(f"/import/epr/cancelar/{analise_id}/")
+
+        self.assertEqual(list(Path(self.diretorio, "colunar").iterdir()), [])
+
+    def test_confirmar_e_exportar(self):
+        analise_id = self.analisar().data["analise_id"]
+
+        response = self.client.post(f"/import/epr/confirmar/{analise_id}/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["vendas_faturadas"], 1)
+        self.vendas[0].refresh_from_db()
+        self.assertEqual(self.vendas[0].status, "FA")
+        self.assertEqual(AnaliseEPR.objects.get(id=analise_id).status, "CO")
+
+        response = self.client.get(f"/export/analise-epr/{analise_id}/?mes=2025-11")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        conteudo = b"".join(response.streaming_content)
+        ws = load_workbook(BytesIO(conteudo)).active
+        linhas = list(ws.iter_rows(values_only=True))
+        self.assertEqual(len(linhas), 2)
+        self.assertEqual(linhas[1][2], "ANA SOUZA")
+        self.assertEqual(linhas[1][-1], 100)
+
+    def test_confirmar_analise_cancelada(self):
+        analise_id = self.analisar().data["analise_id"]
+        self.client.post(f"/import/epr/cancelar/{analise_id}/")
+
+        response = self.client.post(f"/import/epr/confirmar/{analise_id}/")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Venda.objects.filter(status="FA").exists())
+
+    def test_exportacao_reaproveita_planilha_gerada(self):
+        analise_id = self.analisar().data["analise_id"]
+        self.client.post(f"/import/epr/confirmar/{analise_id}/")
+
+        primeira = self.client.get(f"/export/analise-epr/{analise_id}/")
+        primeiro_conteudo = b"".join(primeira.streaming_content)
+        planilhas = list(Path(self.diretorio, "analises_epr").iterdir())
+        self.assertEqual([p.name for p in planilhas], [f"analise_{analise_id}_todos.xlsx"])
+
+        # O segundo download só consulta o status da análise
+        with self.assertNumQueries(1):
+            segunda = self.client.get(f"/export/analise-epr/{analise_id}/")
+            segundo_conteudo = b"".join(segunda.streaming_content)
+
+        self.assertEqual(segunda.status_code, status.HTTP_200_OK)
+        self.assertEqual(segundo_conteudo, primeiro_conteudo)
+        self.assertIn("Analise_", segunda["Content-Disposition"])
+
+    def test_remover_analise_apaga_planilhas(self):
+        analise_id = self.analisar().data["analise_id"]
+        self.client.post(f"/import/epr/confirmar/{analise_id}/")
+        self.client.get(f"/export/analise-epr/{analise_id}/")
+        self.client.get(f"/export/analise-epr/{analise_id}/?mes=2025-11")
+        planilhas = Path(self.diretorio, "analises_epr")
+        self.assertEqual(len(list(planilhas.iterdir())), 2)
+
+        AnaliseEPR.objects.get(id=analise_id).delete()
+
+        self.assertEqual(list(planilhas.iterdir()), [])
+
+    def test_exportar_mes_sem_dados(self):
+        analise_id = self.analisar().data["analise_id"]
+        self.client.post(f"/import/epr/confirmar/{analise_id}/")
+
+        response = self.client.get(f"/export/analise-epr/{analise_id}/?mes=2024-01")
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(Path(self.diretorio, "analises_epr").exists())
+
+    def test_detalhe_com_dados_do_mes(self):
+        analise_id = self.analisar().data["analise_id"]
+
+        response = self.client.get(f"/analises-epr/{analise_id}/?mes=2025-11")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        [dados] = response.data["dados_epr"]
+        self.assertEqual(dados["venda_id"], self.vendas[0].id)
+        self.assertEqual(dados["nome_mutuario"], "ANA SOUZA")
+        self.assertEqual(dados["valor_financiamento"], 150000)
+
+        response = self.client.get(f"/analises-epr/{analise_id}/?mes=2024-01")
+        self.assertEqual(response.data["dados_epr"], [])
+
+    def test_confirmar_fatura_so_vendas_da_analise(self):
+        self.analisar()
+        arquivo = gerar_xlsx(CABECALHO_EPR, [["SOL", "456", "BRUNO LIMA", "", 90000]])
+        analise_id = self.client.post(
+            "/import/epr/analisar/", {"file": arquivo}, format="multipart"
+        ).data["analise_id"]
+
+        response = self.client.post(f"/import/epr/confirmar/{analise_id}/")
+
+        self.assertEqual(response.data["vendas_faturadas"], 1)
+        self.assertEqual(
+            list(Venda.objects.filter(status="FA").values_list("id", flat=True)),
+            [self.vendas[1].id],
+        )
+
+    def test_detalhe_paginado(self):
+        arquivo = gerar_xlsx(
+            CABECALHO_EPR,
+            [["SOL", "1", "ANA SOUZA", "", 1], ["SOL", "2", "BRUNO LIMA", "", 2]],
+        )
+        analise_id = self.client.post(
+            "/import/epr/analisar/", {"file": arquivo}, format="multipart"
+        ).data["analise_id"]
+
+        response = self.client.get(f"/analises-epr/{analise_id}/?page_size=1")
+
+        pagina = response.data["dados_epr"]
+        self.assertEqual([d["nome_mutuario"] for d in pagina["results"]], ["ANA SOUZA"])
+        self.assertIsNone(pagina["previous"])
+
+        response = self.client.get(pagina["next"])
+
+        pagina = response.data["dados_epr"]
+        self.assertEqual([d["nome_mutuario"] for d in pagina["results"]], ["BRUNO LIMA"])
+        self.assertIsNone(pagina["next"])
+
+
+class ListarAnaliseEPRAPITestCase(APITestCase):
+    def setUp(self):
+        self.url = "/analises-epr/"
+        self.analises = [
+            AnaliseEPR.objects.create(status=analise_status, total_encontradas=i)
+            for i, analise_status in enumerate(["PE", "CO", "CO"])
+        ]
+
+    def test_filtros(self):
+        response = self.client.get(f"{self.url}?status=CO")
+
+        self.assertEqual(
+            [a["id"] for a in response.data],
+            [self.analises[2].id, self.analises[1].id],
+        )
+
+        AnaliseEPR.objects.filter(id=self.analises[0].id).update(
+            created_at="2025-01-10T12:00:00Z"
+        )
+        response = self.client.get(f"{self.url}?criado_de=2025-01-10&criado_ate=2025-01-10")
+
+        self.assertEqual([a["id"] for a in response.data], [self.analises[0].id])
+
+    def test_data_invalida(self):
+        response = self.client.get(f"{self.url}?criado_de=10/01/2025")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_paginacao(self):
+        response = self.client.get(f"{self.url}?page_size=2")
+
+        self.assertEqual(len(response.data["results"]), 2)
+        response = self.client.get(response.data["next"])
+        self.assertEqual([a["id"] for a in response.data["results"]], [self.analises[0].id])
+
+    def test_etag(self):
+        response = self.client.get(self.url)
+        etag = response["ETag"]
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        analise = self.analises[0]
+        analise.status = "CA"
+        analise.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
@@ -0,0 +1,82 @@
+from django.test import TestCase
+
+from ControleDeRecebimentos.models import (
+    ChaveBuscaCliente,
+    Cliente,
+    Empreendimento,
+    TabelaMensal,
+    Venda,
+)
+from ControleDeRecebimentos.services.busca_aproximada import BuscaAproximada
+from ControleDeRecebimentos.services.nomes import chaves_busca, normalizar_nome
+
+
+class BuscaAproximadaTestCase(TestCase):
+    def setUp(self):
+        self.tabela = TabelaMensal.objects.create(mes_referencia="2025-11")
+        self.empreendimento = Empreendimento.objects.create(nome="Residencial Sol")
+        for nome in ["Ana Souza", "Bruno Lima", "Carla Maria Dias", "Carla Mara Dias"]:
+            self.criar_venda(nome)
+
+    def criar_venda(self, nome):
+        return Venda.objects.create(
+            tabela_mensal=self.tabela,
+            cliente=Cliente.objects.create(nome=nome),
+            empreendimento=self.empreendimento,
+            data_venda="2025-11-10",
+        )
+
+    def resolver(self, *nomes, **kwargs):
+        busca = BuscaAproximada(Venda.objects.select_related("cliente"), **kwargs)
+        vendas = busca.resolver({normalizar_nome(nome): nome for nome in nomes})
+        return busca, {chave: venda.cliente.nome for chave, venda in vendas.items()}
+
+    def test_chaves_foneticas(self):
+        self.assertEqual(chaves_busca("Thiago de Souza"), chaves_busca("Tiago Sousa"))
+        self.assertEqual(chaves_busca("Ana da Silva"), {"ana", "silva", "#slv"})
+
+    def test_chaves_acompanham_o_nome_do_cliente(self):
+        cliente = Cliente.objects.get(nome="Bruno Lima")
+        cliente.nome = "Bruno Lins"
+        cliente.save()
+
+        self.assertEqual(
+            set(cliente.chaves_busca.values_list("chave", flat=True)),
+            {"bruno", "#brn", "lins", "#lns"},
+        )
+
+    def test_casa_erros_de_digitacao_e_nome_do_meio(self):
+        busca, casadas = self.resolver("Ana Sousa", "Bruno Lma", "Ana Maria Souza")
+
+        self.assertEqual(
+            casadas,
+            {
+                "ana sousa": "Ana Souza",
+                "bruno lma": "Bruno Lima",
+                "ana maria souza": "Ana Souza",
+            },
+        )
+        self.assertEqual(busca.resumo()["casadas"], 3)
+
+    def test_candidatos_ambiguos_viram_sugestao(self):
+        busca, casadas = self.resolver("Carla Dias")
+
+        self.assertEqual(casadas, {})
+        sugestao = busca.resumo()["sugestoes"][0]
+        self.assertEqual(sugestao["nome"], "Carla Dias")
+        self.assertEqual(
+            {candidato["nome"] for candidato in sugestao["candidatos"]},
+            {"Carla Maria Dias", "Carla Mara Dias"},
+        )
+
+    def test_respeita_orcamento_de_tempo(self):
+        busca, casadas = self.resolver("Ana Sousa", orcamento=0)
+
+        self.assertEqual(casadas, {})
+        self.assertTrue(busca.resumo()["interrompida"])
+
+    def test_considera_apenas_vendas_elegiveis(self):
+        busca = BuscaAproximada(Venda.objects.filter(status="FA"))
+
+        self.assertEqual(busca.resolver({"ana sousa": "Ana Sousa"}), {})
+        self.assertTrue(ChaveBuscaCliente.objects.filter(chave="sousa").exists())
@@ -1,4 +1,5 @@
 from django.urls import reverse
+from django.test import TestCase
 
 from rest_framework import status
 from rest_framework.test import APITestCase
@@ -6,6 +7,8 @@ from rest_framework.test import APITestCase
 from django.contrib.auth import get_user_model
 from factory import Factory, Faker, build
 
+from ControleDeRecebimentos.models import Cliente
+
 # Pega o modelo de usuário que está ativo no projeto (o seu modelo customizado)
 User = get_user_model()
 
@@ -29,4 +32,24 @@ class RegisterAPIViewTestCase(APITestCase):
 
         # 3. Verificar se o status code é 201 CREATED
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
-        self.assertEqual(response.data['nome'], payload['nome'])
\ No newline at end of file
+        self.assertEqual(response.data['nome'], payload['nome'])
+
+
+class ClienteNomeNormalizadoTestCase(TestCase):
+    def test_save_preenche_nome_normalizado(self):
+        cliente = Cliente.objects.create(nome="  JOSÉ   da Conceição ")
+
+        self.assertEqual(cliente.nome_normalizado, "jose da conceicao")
+
+        cliente.nome = "Maria Antônia"
+        cliente.save(update_fields=["nome"])
+        cliente.refresh_from_db()
+        self.assertEqual(cliente.nome_normalizado, "maria antonia")
+
+    def test_bulk_create_preenche_nome_normalizado(self):
+        Cliente.objects.bulk_create([Cliente(nome="Ângela Muñoz"), Cliente(nome="ÇÃO")])
+
+        self.assertEqual(
+            set(Cliente.objects.values_list("nome_normalizado", flat=True)),
+            {"angela munoz", "cao"},
+        )
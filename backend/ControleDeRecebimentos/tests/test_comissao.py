@@ -0,0 +1,129 @@
+from datetime import date
+from decimal import Decimal
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ControleDeRecebimentos.models import (
+    Cliente,
+    Empreendimento,
+    RegraComissao,
+    ResumoMensal,
+    TabelaMensal,
+    Venda,
+)
+from ControleDeRecebimentos.services.comissao import RegrasComissao
+
+
+class RegraComissaoAPITestCase(APITestCase):
+    def setUp(self):
+        self.sol = Empreendimento.objects.create(nome="Residencial Sol")
+        self.lua = Empreendimento.objects.create(nome="Residencial Lua")
+        self.novembro = TabelaMensal.objects.create(mes_referencia="2025-11")
+        self.outubro = TabelaMensal.objects.create(mes_referencia="2025-10")
+
+        self.vendas = {
+            nome: Venda.objects.create(
+                tabela_mensal=tabela,
+                cliente=Cliente.objects.create(nome=nome),
+                empreendimento=empreendimento,
+                data_venda=data,
+                forma_pagamento=forma,
+                valor_venda=Decimal("200000.00"),
+                valor_comissao=Decimal("1.00"),
+            )
+            for nome, tabela, empreendimento, data, forma in [
+                ("Ana", self.novembro, self.sol, "2025-11-10", "FI"),
+                ("Bruno", self.novembro, self.sol, "2025-11-10", "AV"),
+                ("Carla", self.novembro, self.lua, "2025-11-10", "FI"),
+                ("Diego", self.outubro, self.lua, "2025-10-10", "FI"),
+            ]
+        }
+
+        # Além da regra geral de 0,195% criada pela migração
+        RegraComissao.objects.create(
+            taxa=Decimal("0.003"), vigente_desde=date(2025, 11, 1)
+        )
+        RegraComissao.objects.create(
+            taxa=Decimal("0.001"), vigente_desde=date(2020, 1, 1), empreendimento=self.sol
+        )
+        RegraComissao.objects.create(
+            taxa=Decimal("0.002"),
+            vigente_desde=date(2020, 1, 1),
+            empreendimento=self.sol,
+            forma_pagamento="FI",
+        )
+
+    def comissoes(self):
+        return {
+            venda.cliente.nome: venda.valor_comissao
+            for venda in Venda.objects.select_related("cliente")
+        }
+
+    def test_recalcula_todas_pela_regra_prevalente(self):
+        response = self.client.post("/comissoes/recalcular/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["por_regra"]), 4)
+        self.assertIn("segundos", response.data)
+        self.assertEqual(
+            self.comissoes(),
+            {
+                "Ana": Decimal("400.00"),
+                "Bruno": Decimal("200.00"),
+                "Carla": Decimal("600.00"),
+                "Diego": Decimal("390.00"),
+            },
+        )
+        self.assertEqual(
+            ResumoMensal.objects.get(tabela_mensal=self.outubro).total_comissao,
+            Decimal("390.00"),
+        )
+
+    def test_recalcula_apenas_o_escopo(self):
+        self.client.post(
+            "/comissoes/recalcular/",
+            {"mes_referencia": "2025-11", "empreendimento": self.lua.id},
+        )
+
+        comissoes = self.comissoes()
+        self.assertEqual(comissoes["Carla"], Decimal("600.00"))
+        self.assertEqual(comissoes["Ana"], Decimal("1.00"))
+        self.assertEqual(comissoes["Diego"], Decimal("1.00"))
+
+    def test_importacao_usa_a_mesma_regra(self):
+        regras = RegrasComissao()
+
+        for venda in Venda.objects.all():
+            self.assertEqual(
+                regras.comissao(venda, 200000),
+                {"Ana": 400, "Bruno": 200, "Carla": 600, "Diego": 390}[
+                    venda.cliente.nome
+                ],
+            )
+
+    def test_sem_regra_aplicavel_usa_taxa_padrao(self):
+        RegraComissao.objects.filter(vigente_desde=date(2000, 1, 1)).delete()
+
+        response = self.client.post("/comissoes/recalcular/")
+
+        self.assertEqual(response.data["vendas_sem_regra"], 1)
+        diego = self.vendas["Diego"]
+        diego.refresh_from_db()
+        self.assertEqual(diego.valor_comissao, Decimal("390.00"))
+        self.assertEqual(RegrasComissao().comissao(diego, 200000), diego.valor_comissao)
+
+    def test_cria_e_lista_regras(self):
+        response = self.client.post(
+            "/regras-comissao/",
+            {"taxa": "0.0025", "vigente_desde": "2026-01-01", "forma_pagamento": "AV"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response = self.client.get("/regras-comissao/")
+        self.assertEqual(len(response.data), 5)
+
+        response = self.client.post(
+            "/regras-comissao/", {"taxa": "-1", "vigente_desde": "2026-01-01"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
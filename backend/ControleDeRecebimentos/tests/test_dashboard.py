@@ -0,0 +1,144 @@
+import shutil
+import tempfile
+import time
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ControleDeRecebimentos.models import (
+    Cliente,
+    Empreendimento,
+    ResumoMensal,
+    TabelaMensal,
+    Venda,
+)
+from ControleDeRecebimentos.services.versao_vendas import (
+    CHAVE_VERSAO,
+    trocar_versao_vendas,
+    versao_vendas,
+)
+
+
+class DashboardPorMesAPITestCase(APITestCase):
+    def setUp(self):
+        self.url = "/dashboard/mes/"
+        self.outubro = TabelaMensal.objects.create(mes_referencia="2025-10")
+        self.novembro = TabelaMensal.objects.create(mes_referencia="2025-11")
+        self.empreendimento = Empreendimento.objects.create(nome="Residencial Sol")
+
+    def criar_venda(self, tabela, nome, valor_comissao):
+        response = self.client.post(
+            "/vendas/",
+            {
+                "tabela_mensal": tabela.id,
+                "cliente": Cliente.objects.create(nome=nome).id,
+                "empreendimento": self.empreendimento.id,
+                "data_venda": "2025-11-10",
+                "valor_comissao": valor_comissao,
+                "status": "PE",
+            },
+            format="json",
+        )
+        return response.data["id"]
+
+    def test_resumo_acompanha_criacao_e_faturamento(self):
+        ana = self.criar_venda(self.novembro, "Ana Souza", "100.00")
+        self.criar_venda(self.novembro, "Bruno Lima", "50.00")
+        self.criar_venda(self.outubro, "Carla Dias", "10.00")
+        self.client.post("/vendas/faturar/", {"ids": [ana]}, format="json")
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        novembro, outubro = response.data
+        self.assertEqual(novembro["mes_referencia"], "2025-11")
+        self.assertEqual(novembro["total_vendas"], 2)
+        self.assertEqual(novembro["pendentes"], 1)
+        self.assertEqual(novembro["faturadas"], 1)
+        self.assertEqual(float(novembro["total_comissao"]), 150)
+        self.assertEqual(float(novembro["comissao_faturada"]), 100)
+        self.assertEqual(outubro["total_vendas"], 1)
+        self.assertEqual(outubro["faturadas"], 0)
+
+    def test_comando_reconstroi_resumo(self):
+        # Gravação direta no banco, sem passar pelo backend
+        Venda.objects.create(
+            tabela_mensal=self.outubro,
+            cliente=Cliente.objects.create(nome="Ana Souza"),
+            empreendimento=self.empreendimento,
+            data_venda="2025-10-10",
+            valor_comissao=20,
+        )
+        self.assertFalse(ResumoMensal.objects.exists())
+
+        call_command("reconstruir_resumo_mensal", stdout=StringIO())
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.data[1]["total_vendas"], 1)
+        self.assertEqual(response.data[0]["total_vendas"], 0)
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class DashboardAPITestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.url = "/dashboard/"
+        self.tabela = TabelaMensal.objects.create(mes_referencia="2025-11")
+        self.empreendimento = Empreendimento.objects.create(nome="Residencial Sol")
+        for nome, forma in [("Ana Souza", "AV"), ("Bruno Lima", "FI")]:
+            self.venda = Venda.objects.create(
+                tabela_mensal=self.tabela,
+                cliente=Cliente.objects.create(nome=nome),
+                empreendimento=self.empreendimento,
+                data_venda="2025-11-10",
+                forma_pagamento=forma,
+                valor_venda=1000,
+                valor_comissao=10,
+            )
+
+    def test_totais_em_uma_query_e_cache(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.data["total_vendas"], 2)
+        self.assertEqual(response.data["vendas_pendentes"], 2)
+        self.assertEqual(response.data["vendas_a_vista"], 1)
+        self.assertEqual(response.data["vendas_financiadas"], 1)
+        self.assertEqual(float(response.data["comissao_pendente"]), 20)
+
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+    def test_faturamento_invalida_cache(self):
+        self.client.get(self.url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post("/vendas/faturar/", {"ids": [self.venda.id]}, format="json")
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.data["vendas_faturadas"], 1)
+        self.assertEqual(float(response.data["comissao_faturada"]), 10)
+
+    def test_versao_trocada_nao_expira(self):
+        diretorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, diretorio)
+        arquivos = {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": diretorio,
+        }
+        with override_settings(CACHES={"default": arquivos}):
+            anterior = versao_vendas()
+            trocar_versao_vendas()
+            versao = versao_vendas()
+
+            self.assertNotEqual(versao, anterior)
+            with mock.patch("time.time", return_value=time.time() + 3600):
+                self.assertEqual(cache.get(CHAVE_VERSAO), versao)
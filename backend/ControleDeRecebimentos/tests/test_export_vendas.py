@@ -0,0 +1,51 @@
+import csv
+import io
+import json
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ControleDeRecebimentos.models import Cliente, Empreendimento, TabelaMensal, Venda
+
+
+class ExportarVendasAPITestCase(APITestCase):
+    def setUp(self):
+        self.url = "/export/vendas/"
+        self.tabela = TabelaMensal.objects.create(mes_referencia="2025-11")
+        empreendimento = Empreendimento.objects.create(nome="Residencial Sol")
+        for nome, venda_status in [("Ana Souza", "PE"), ("José Lima", "FA")]:
+            Venda.objects.create(
+                tabela_mensal=self.tabela,
+                cliente=Cliente.objects.create(nome=nome),
+                empreendimento=empreendimento,
+                data_venda="2025-11-10",
+                status=venda_status,
+                valor_comissao="390.00",
+            )
+
+    def baixar(self, query=""):
+        response = self.client.get(f"{self.url}{query}")
+        return response, b"".join(response.streaming_content).decode()
+
+    def test_exporta_csv(self):
+        response, conteudo = self.baixar()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Content-Type"].startswith("text/csv"))
+        linhas = list(csv.DictReader(io.StringIO(conteudo)))
+        self.assertEqual([linha["cliente_nome"] for linha in linhas], ["Ana Souza", "José Lima"])
+        self.assertEqual(linhas[0]["mes_referencia"], "2025-11")
+        self.assertEqual(linhas[0]["valor_comissao"], "390.00")
+
+    def test_exporta_ndjson_com_filtro(self):
+        response, conteudo = self.baixar("?formato=ndjson&venda_status=FA")
+
+        linhas = [json.loads(linha) for linha in conteudo.splitlines()]
+        self.assertEqual(len(linhas), 1)
+        self.assertEqual(linhas[0]["cliente_nome"], "José Lima")
+        self.assertEqual(linhas[0]["data_venda"], "2025-11-10")
+
+    def test_formato_invalido(self):
+        response = self.client.get(f"{self.url}?formato=xml")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,93 @@
+from datetime import datetime
+
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ControleDeRecebimentos.models import Cliente, Empreendimento, Venda
+from ControleDeRecebimentos.tests.planilhas import gerar_xlsx
+
+
+CABECALHO_ACOMPANHAMENTO = [
+    "QUANT", "DATA", "NOME", "CORRETOR", "IMOBILIÁRIA", "EMPREENDIMENTO",
+    "UNIDADE", "ETAPA", "FGTS", "STATUS", "OBS",
+]
+
+
+class ImportAcompanhamentoAPITestCase(APITestCase):
+    def setUp(self):
+        self.url = "/import/acompanhamento/"
+        self.linhas = [
+            [1, datetime(2025, 11, 3), " Ana Souza ", "Carlos", "Imob A", "Residencial Sol", "101", "Repasse", 1500.5, "OK", None],
+            [2, "15/11/2025", "Bruno Lima", "Carlos", None, "Residencial Sol", "102", "Repasse", "-", "OK", " obs "],
+            [3, datetime(2025, 10, 28), "Carla Dias", "Paula", "Imob B", "Residencial Lua", "201", "Registro", None, "OK", None],
+            [4, "A DEFINIR", "Diego Reis", "Paula", "Imob B", "Residencial Lua", "202", "Registro", None, "OK", None],
+            [5, datetime(2025, 11, 20), None, "Paula", "Imob B", "Residencial Lua", "203", "Registro", None, "OK", None],
+        ]
+
+    def importar(self, linhas, **extra):
+        arquivo = gerar_xlsx(CABECALHO_ACOMPANHAMENTO, linhas, preambulo=3)
+        return self.client.post(
+            self.url,
+            {"file": arquivo, "mes_referencia": "2025-11", **extra},
+            format="multipart",
+        )
+
+    def test_importa_apenas_vendas_do_mes(self):
+        response = self.importar(self.linhas)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["vendas_criadas"], 2)
+        self.assertEqual(response.data["vendas_atualizadas"], 0)
+        self.assertEqual(response.data["clientes_criados"], 4)
+        self.assertEqual(response.data["empreendimentos_criados"], 2)
+
+        venda = Venda.objects.get(cliente__nome="Ana Souza")
+        self.assertEqual(str(venda.data_venda), "2025-11-03")
+        self.assertEqual(venda.unidade, "101")
+        self.assertEqual(float(venda.fgts), 1500.5)
+
+        venda = Venda.objects.get(cliente__nome="Bruno Lima")
+        self.assertIsNone(venda.imobiliaria)
+        self.assertIsNone(venda.fgts)
+        self.assertEqual(venda.observacoes, "obs")
+
+    def test_reimportacao_atualiza_vendas_existentes(self):
+        self.importar(self.linhas)
+        self.linhas[0][3] = "Outro Corretor"
+
+        response = self.importar(self.linhas)
+
+        self.assertEqual(response.data["vendas_criadas"], 0)
+        self.assertEqual(response.data["vendas_atualizadas"], 2)
+        self.assertEqual(response.data["clientes_criados"], 0)
+        self.assertEqual(Venda.objects.count(), 2)
+        self.assertEqual(Cliente.objects.count(), 4)
+        self.assertEqual(Empreendimento.objects.count(), 2)
+        self.assertEqual(
+            Venda.objects.get(cliente__nome="Ana Souza").corretor, "Outro Corretor"
+        )
+
+    def test_reimportacao_sem_unidade_nao_duplica(self):
+        self.linhas[0][6] = None
+        self.importar(self.linhas)
+        self.linhas[0][3] = "Outro Corretor"
+
+        response = self.importar(self.linhas)
+
+        self.assertEqual(response.data["vendas_criadas"], 0)
+        self.assertEqual(response.data["vendas_atualizadas"], 2)
+        venda = Venda.objects.get(cliente__nome="Ana Souza")
+        self.assertIsNone(venda.unidade)
+        self.assertEqual(venda.corretor, "Outro Corretor")
+
+    @override_settings(IMPORTACAO_TAMANHO_BLOCO=2)
+    def test_modo_streaming_gera_mesmos_totais(self):
+        response = self.importar(self.linhas, streaming="true")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["vendas_criadas"], 2)
+        self.assertEqual(response.data["clientes_criados"], 4)
+        self.assertEqual(response.data["empreendimentos_criados"], 2)
+        self.assertEqual(list(response.data["memoria"]), ["rss_pico_processo_mb"])
+        self.assertEqual(Venda.objects.count(), 2)
@@ -0,0 +1,173 @@
+import shutil
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
+
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ControleDeRecebimentos.models import ImportJob, Venda
+from ControleDeRecebimentos.services.jobs import executar_job, processo_atual
+from ControleDeRecebimentos.tests.planilhas import gerar_xlsx
+from ControleDeRecebimentos.tests.test_import_acompanhamento import (
+    CABECALHO_ACOMPANHAMENTO,
+)
+
+
+class ImportJobAPITestCase(APITestCase):
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.diretorio)
+        # Os jobs ativos deste processo, isolados entre os testes
+        ativos = mock.patch("ControleDeRecebimentos.services.jobs._jobs_ativos", set())
+        ativos.start()
+        self.addCleanup(ativos.stop)
+        self.linhas = [
+            [i, "2025-11-10", f"Cliente {i}", "Corretor", None, "Residencial Sol", str(i), None, None, None, None]
+            for i in range(5)
+        ]
+
+    def enviar(self, **extra):
+        arquivo = gerar_xlsx(CABECALHO_ACOMPANHAMENTO, self.linhas, preambulo=3)
+        return self.client.post(
+            "/import/acompanhamento/",
+            {"file": arquivo, "mes_referencia": "2025-11", "assincrono": "true", **extra},
+            format="multipart",
+        )
+
+    def test_job_assincrono_conclui_com_resultado(self):
+        with override_settings(
+            IMPORTACAO_JOBS_SINCRONO=True,
+            IMPORTACAO_DIR=self.diretorio,
+            IMPORTACAO_TAMANHO_BLOCO=2,
+        ):
+            response = self.enviar()
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        job_id = response.data["job_id"]
+
+        response = self.client.get(f"/import/jobs/{job_id}/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], "CO")
+        self.assertEqual(response.data["linhas_processadas"], 5)
+        self.assertEqual(response.data["percentual"], 100.0)
+        self.assertEqual(response.data["resultado"]["vendas_criadas"], 5)
+        self.assertEqual(Venda.objects.count(), 5)
+        # O arquivo temporário é removido ao final
+        self.assertEqual(list(Path(self.diretorio, "jobs").iterdir()), [])
+
+    def test_job_todas_abas_registra_progresso_por_aba(self):
+        arquivo = gerar_xlsx(
+            ["NOME DO CLIENTE", "VALOR DO IMÓVEL", "FORMA DE PAGAMENTO"],
+            [],
+            preambulo=1,
+            abas={
+                "NOV25": [["Ana Souza", 200000, "FIN"], ["Bruno Lima", 1, "PIX"]],
+                "Resumo": [["Ana Souza", 1, "PIX"]],
+                "OUT25": [["Carla Dias", 1, "PIX"]],
+            },
+        )
+        with override_settings(
+            IMPORTACAO_JOBS_SINCRONO=True,
+            IMPORTACAO_DIR=self.diretorio,
+            IMPORTACAO_PROCESSOS=1,
+        ):
+            response = self.client.post(
+                "/import/controle-gestores/",
+                {"file": arquivo, "todas_abas": "true", "assincrono": "true"},
+                format="multipart",
+            )
+
+        response = self.client.get(f"/import/jobs/{response.data['job_id']}/")
+
+        self.assertEqual(response.data["status"], "CO")
+        self.assertEqual(response.data["linhas_total"], 3)
+        self.assertEqual(response.data["linhas_processadas"], 3)
+        self.assertEqual(response.data["resultado"]["abas_processadas"], ["OUT25", "NOV25"])
+
+    def test_job_com_erro(self):
+        arquivo = gerar_xlsx(["Data", "Valor"], [["2025-11-10", 10]])
+        with override_settings(IMPORTACAO_JOBS_SINCRONO=True, IMPORTACAO_DIR=self.diretorio):
+            response = self.client.post(
+                "/import/webropay/",
+                {"file": arquivo, "assincrono": "1"},
+                format="multipart",
+            )
+
+        response = self.client.get(f"/import/jobs/{response.data['job_id']}/")
+
+        self.assertEqual(response.data["status"], "ER")
+        self.assertEqual(response.data["etapa"], "Erro")
+        self.assertIn("pagador", response.data["erro"])
+
+    def test_job_enfileirado_no_pool(self):
+        with override_settings(IMPORTACAO_DIR=self.diretorio), mock.patch(
+            "ControleDeRecebimentos.services.jobs.executor"
+        ) as executor, self.captureOnCommitCallbacks(execute=True):
+            response = self.enviar()
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["status"], "PE")
+        executor.return_value.submit.assert_called_once()
+
+    def test_job_inexistente(self):
+        response = self.client.get("/import/jobs/999/")
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def job_em_execucao(self, processo, atualizado_em):
+        arquivo = Path(self.diretorio, "job.xlsx")
+        arquivo.write_bytes(b"")
+        return ImportJob.objects.create(
+            tipo="AC",
+            status="EX",
+            arquivo=str(arquivo),
+            processo=processo,
+            atualizado_em=atualizado_em,
+        )
+
+    def test_job_de_processo_encerrado_vira_erro(self):
+        job = self.job_em_execucao(
+            "outro-host:123", timezone.now() - timedelta(hours=1)
+        )
+
+        response = self.client.get(f"/import/jobs/{job.id}/")
+
+        self.assertEqual(response.data["status"], "ER")
+        self.assertIn("interrompida", response.data["erro"])
+        self.assertIsNotNone(response.data["finalizado_em"])
+        self.assertFalse(Path(job.arquivo).exists())
+
+    def test_job_perdido_pelo_processo_atual_vira_erro(self):
+        # Registrado como deste processo, mas fora do pool (ex: pid reaproveitado)
+        job = self.job_em_execucao(processo_atual(), timezone.now())
+
+        response = self.client.get(f"/import/jobs/{job.id}/")
+
+        self.assertEqual(response.data["status"], "ER")
+
+    def test_job_de_outro_processo_com_progresso_recente(self):
+        job = self.job_em_execucao("outro-host:123", timezone.now())
+
+        response = self.client.get(f"/import/jobs/{job.id}/")
+
+        self.assertEqual(response.data["status"], "EX")
+        self.assertTrue(Path(job.arquivo).exists())
+
+    def test_job_encerrado_na_fila_nao_executa(self):
+        job = self.job_em_execucao("outro-host:123", timezone.now())
+        ImportJob.objects.filter(id=job.id).update(status="ER", etapa="Erro")
+
+        # Execução síncrona, para não fechar a conexão do próprio teste
+        with override_settings(IMPORTACAO_JOBS_SINCRONO=True), mock.patch(
+            "ControleDeRecebimentos.services.jobs.executar_importacao"
+        ) as importacao:
+            executar_job(job.id)
+
+        importacao.assert_not_called()
+        job.refresh_from_db()
+        self.assertEqual(job.status, "ER")
@@ -0,0 +1,261 @@
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ControleDeRecebimentos.models import Cliente, Empreendimento, TabelaMensal, Venda
+from ControleDeRecebimentos.tests.planilhas import gerar_xlsx
+
+
+class ImportVendasBaseTestCase(APITestCase):
+    def setUp(self):
+        self.tabela = TabelaMensal.objects.create(mes_referencia="2025-11")
+        self.empreendimento = Empreendimento.objects.create(nome="Residencial Sol")
+
+    def criar_venda(self, nome, **campos):
+        return Venda.objects.create(
+            tabela_mensal=self.tabela,
+            cliente=Cliente.objects.create(nome=nome),
+            empreendimento=self.empreendimento,
+            data_venda="2025-11-10",
+            **campos,
+        )
+
+
+class ImportControleGestoresAPITestCase(ImportVendasBaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = "/import/controle-gestores/"
+        self.ana = self.criar_venda("Ana Souza")
+        self.bruno = self.criar_venda("Bruno Lima")
+
+    def importar(self, linhas, **extra):
+        arquivo = gerar_xlsx(
+            ["NOME DO CLIENTE", "VALOR DO IMÓVEL", "FORMA DE PAGAMENTO"],
+            [],
+            preambulo=1,
+            abas={"OUT25": [["Bruno Lima", 1, "PIX"]], "NOV25": linhas},
+        )
+        return self.client.post(
+            self.url,
+            {"file": arquivo, "mes_referencia": "2025-11", **extra},
+            format="multipart",
+        )
+
+    def test_atualiza_vendas_da_aba_do_mes(self):
+        response = self.importar(
+            [["ana souza", 200000, "FINANCIAMENTO"], ["Fulano", 1000, "PIX"]]
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["aba_processada"], "NOV25")
+        self.assertEqual(response.data["vendas_atualizadas"], 1)
+        self.assertEqual(response.data["nao_encontradas"], ["Fulano"])
+
+        self.ana.refresh_from_db()
+        self.assertEqual(self.ana.forma_pagamento, "FI")
+        self.assertEqual(float(self.ana.valor_comissao), 390.0)
+        self.bruno.refresh_from_db()
+        self.assertIsNone(self.bruno.forma_pagamento)
+
+    def test_busca_aproximada_nao_sobrescreve_casamento_exato(self):
+        response = self.importar(
+            [["Ana Souza", 200000, "FINANCIAMENTO"], ["Ana Sousa", 1000, "PIX"]],
+            fuzzy="true",
+        )
+
+        self.assertEqual(response.data["vendas_atualizadas"], 1)
+        self.assertEqual(response.data["busca_aproximada"]["casadas"], 0)
+        self.assertEqual(
+            response.data["busca_aproximada"]["sugestoes"][0]["nome"], "Ana Sousa"
+        )
+        self.ana.refresh_from_db()
+        self.assertEqual(self.ana.forma_pagamento, "FI")
+        self.assertEqual(float(self.ana.valor_venda), 200000.0)
+
+    @override_settings(IMPORTACAO_TAMANHO_BLOCO=1)
+    def test_modo_streaming(self):
+        response = self.importar(
+            [["Ana Souza", 200000, "FINANCIAMENTO"], [None, None, None], ["Bruno Lima", 100000, "PIX"]],
+            streaming="true",
+        )
+
+        self.assertEqual(response.data["vendas_atualizadas"], 2)
+        self.assertEqual(response.data["vendas_nao_encontradas"], 0)
+        self.assertIn("rss_pico_processo_mb", response.data["memoria"])
+        self.bruno.refresh_from_db()
+        self.assertEqual(self.bruno.forma_pagamento, "AV")
+
+    def importar_todas_abas(self):
+        arquivo = gerar_xlsx(
+            ["NOME DO CLIENTE", "VALOR DO IMÓVEL", "FORMA DE PAGAMENTO"],
+            [],
+            preambulo=1,
+            abas={
+                "NOV25": [["Ana Souza", 200000, "FINANCIAMENTO"], ["Bruno Lima", 100000, "FIN"]],
+                "Resumo": [["Ana Souza", 1, "PIX"]],
+                "OUT25": [["Bruno Lima", 1, "PIX"], ["Fulano", 1, "PIX"]],
+            },
+        )
+        return self.client.post(
+            self.url, {"file": arquivo, "todas_abas": "true"}, format="multipart"
+        )
+
+    def test_todas_abas(self):
+        response = self.importar_todas_abas()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["abas_processadas"], ["OUT25", "NOV25"])
+        self.assertEqual(response.data["vendas_atualizadas"], 2)
+        self.assertEqual(response.data["nao_encontradas"], ["Fulano"])
+        self.assertEqual(
+            response.data["por_mes"]["2025-10"],
+            {"aba": "OUT25", "vendas_atualizadas": 1, "vendas_nao_encontradas": 1},
+        )
+        self.assertEqual(response.data["por_mes"]["2025-11"]["vendas_atualizadas"], 2)
+
+        # A aba mais recente prevalece
+        self.bruno.refresh_from_db()
+        self.assertEqual(self.bruno.forma_pagamento, "FI")
+        self.assertEqual(float(self.bruno.valor_venda), 100000)
+
+    @override_settings(IMPORTACAO_PROCESSOS=2)
+    def test_todas_abas_em_processos(self):
+        response = self.importar_todas_abas()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["vendas_atualizadas"], 2)
+        self.ana.refresh_from_db()
+        self.assertEqual(float(self.ana.valor_comissao), 390.0)
+
+    def test_aba_inexistente(self):
+        response = self.client.post(
+            self.url,
+            {
+                "file": gerar_xlsx(["NOME"], [["Ana Souza"]]),
+                "mes_referencia": "2025-11",
+            },
+            format="multipart",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ImportWebroPayAPITestCase(ImportVendasBaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = "/import/webropay/"
+        self.avista = self.criar_venda("Ana Souza", forma_pagamento="AV")
+        self.financiada = self.criar_venda("Bruno Lima", forma_pagamento="FI")
+
+    def importar(self, **extra):
+        arquivo = gerar_xlsx(
+            ["Data", "Pagador", "Valor"],
+            [["2025-11-10", "Ana Souza", 10], ["2025-11-10", "Bruno Lima", 10]],
+        )
+        return self.client.post(self.url, {"file": arquivo, **extra}, format="multipart")
+
+    def test_casa_nomes_sem_acento_e_caixa(self):
+        arquivo = gerar_xlsx(["Pagador"], [["  ÁNA   SOUZA "]])
+
+        response = self.client.post(self.url, {"file": arquivo}, format="multipart")
+
+        self.assertEqual(response.data["vendas_faturadas"], 1)
+        self.assertEqual(response.data["vendas_nao_encontradas"], 0)
+
+    def test_busca_aproximada_opcional(self):
+        arquivo = gerar_xlsx(["Pagador"], [["Ana Sousa"]])
+        response = self.client.post(self.url, {"file": arquivo}, format="multipart")
+        self.assertEqual(response.data["vendas_faturadas"], 0)
+        self.assertNotIn("busca_aproximada", response.data)
+
+        arquivo = gerar_xlsx(["Pagador"], [["Ana Sousa"]])
+        response = self.client.post(
+            self.url, {"file": arquivo, "fuzzy": "true"}, format="multipart"
+        )
+
+        self.assertEqual(response.data["vendas_faturadas"], 1)
+        self.assertEqual(response.data["busca_aproximada"]["casadas"], 1)
+        self.assertEqual(
+            response.data["busca_aproximada"]["casamentos"][0]["cliente"], "Ana Souza"
+        )
+
+    def test_busca_aproximada_nao_casa_nome_de_uma_palavra(self):
+        joao = self.criar_venda("João", forma_pagamento="AV")
+        arquivo = gerar_xlsx(["Pagador"], [["João Pereira"]])
+
+        response = self.client.post(
+            self.url, {"file": arquivo, "fuzzy": "true"}, format="multipart"
+        )
+
+        self.assertEqual(response.data["vendas_faturadas"], 0)
+        self.assertEqual(response.data["busca_aproximada"]["casamentos"], [])
+        joao.refresh_from_db()
+        self.assertEqual(joao.status, "PE")
+
+    def test_fatura_apenas_vendas_a_vista(self):
+        response = self.importar()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["vendas_faturadas"], 1)
+        self.assertEqual(response.data["nao_encontradas"], ["Bruno Lima"])
+        self.avista.refresh_from_db()
+        self.assertEqual(self.avista.status, "FA")
+        self.assertIsNotNone(self.avista.data_faturamento)
+
+    @override_settings(IMPORTACAO_TAMANHO_BLOCO=1)
+    def test_modo_streaming(self):
+        response = self.importar(streaming="1")
+
+        self.assertEqual(response.data["vendas_faturadas"], 1)
+        self.assertEqual(response.data["vendas_nao_encontradas"], 1)
+
+    @override_settings(DB_LOTE_CURSOR=1)
+    def test_varredura_em_lotes_pelo_cursor(self):
+        self.criar_venda("Carla Dias", forma_pagamento="AV")
+        arquivo = gerar_xlsx(["Pagador"], [["Ana Souza"], ["Carla Dias"]])
+
+        response = self.client.post(self.url, {"file": arquivo}, format="multipart")
+
+        self.assertEqual(response.data["vendas_faturadas"], 2)
+        self.assertEqual(response.data["vendas_nao_encontradas"], 0)
+
+class ImportEPRAPITestCase(ImportVendasBaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = "/import/epr/"
+        self.ana = self.criar_venda("Ana Souza", forma_pagamento="FI", status="PE")
+        self.ana_segunda = Venda.objects.create(
+            tabela_mensal=self.tabela,
+            cliente=self.ana.cliente,
+            empreendimento=self.empreendimento,
+            unidade="102",
+            data_venda="2025-11-11",
+            forma_pagamento="FI",
+            status="PE",
+        )
+        self.bruno = self.criar_venda("Bruno Lima", forma_pagamento="AV", status="PE")
+
+    def importar(self, nomes):
+        arquivo = gerar_xlsx(["Nome do Mutuário"], [[nome] for nome in nomes])
+        return self.client.post(self.url, {"file": arquivo}, format="multipart")
+
+    def test_cada_linha_fatura_uma_venda_financiada(self):
+        response = self.importar(["Ana Souza", "ANA SOUZA", "Ana Souza", "Bruno Lima"])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["vendas_faturadas"], 2)
+        self.assertEqual(response.data["vendas_nao_encontradas"], 2)
+        self.assertEqual(response.data["nao_encontradas"], ["Ana Souza", "Bruno Lima"])
+        self.assertEqual(
+            set(Venda.objects.filter(status="FA").values_list("id", flat=True)),
+            {self.ana.id, self.ana_segunda.id},
+        )
+
+    def test_numero_de_queries_nao_depende_das_linhas(self):
+        poucas = self.importar(["Ana Souza"]).data["metricas"]["queries"]
+        Venda.objects.update(status="PE")
+
+        muitas = self.importar(["Ana Souza", "Ana Souza"] + ["Fulano"] * 50)
+
+        self.assertEqual(muitas.data["vendas_faturadas"], 2)
+        self.assertEqual(muitas.data["metricas"]["queries"], poucas)
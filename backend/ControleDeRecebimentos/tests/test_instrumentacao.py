@@ -0,0 +1,61 @@
+import json
+import tracemalloc
+
+from django.test import SimpleTestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ControleDeRecebimentos.models import TabelaMensal
+from ControleDeRecebimentos.services.metricas import medir_memoria
+
+
+class InstrumentacaoMiddlewareTestCase(APITestCase):
+    def setUp(self):
+        TabelaMensal.objects.create(mes_referencia="2025-11")
+
+    def test_desativada_por_padrao(self):
+        response = self.client.get("/tabelas-mensais/")
+
+        self.assertNotIn("Server-Timing", response)
+
+    @override_settings(INSTRUMENTACAO_ATIVA=True, INSTRUMENTACAO_LIMIAR_MS=10_000)
+    def test_server_timing_e_log(self):
+        with self.assertLogs("ControleDeRecebimentos.instrumentacao", "INFO") as logs:
+            response = self.client.get("/tabelas-mensais/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('desc="1 queries"', response["Server-Timing"])
+        self.assertIn("view;dur=", response["Server-Timing"])
+
+        [registro] = logs.records
+        self.assertEqual(registro.levelname, "INFO")
+        dados = json.loads(registro.getMessage())
+        self.assertEqual(dados["caminho"], "/tabelas-mensais/")
+        self.assertEqual(dados["queries"], 1)
+        self.assertEqual(len(dados["queries_lentas"]), 1)
+        self.assertNotIn("lista_queries", dados)
+
+    @override_settings(INSTRUMENTACAO_ATIVA=True, INSTRUMENTACAO_LIMIAR_MS=0)
+    def test_requisicao_lenta_loga_todas_as_queries(self):
+        with self.assertLogs("ControleDeRecebimentos.instrumentacao", "INFO") as logs:
+            self.client.get("/tabelas-mensais/")
+
+        [registro] = logs.records
+        self.assertEqual(registro.levelname, "WARNING")
+        dados = json.loads(registro.getMessage())
+        self.assertIn("ControleDeRecebimentos_tabelamensal", dados["lista_queries"][0]["sql"])
+
+
+class MedirMemoriaTestCase(SimpleTestCase):
+    def test_uma_medicao_de_alocacoes_por_vez(self):
+        with medir_memoria(rastrear_alocacoes=True) as memoria:
+            with self.assertRaises(RuntimeError):
+                with medir_memoria(rastrear_alocacoes=True):
+                    pass
+            # Medições só de RSS podem ocorrer ao mesmo tempo
+            with medir_memoria() as apenas_rss:
+                pass
+
+        self.assertIn("pico_alocado_mb", memoria)
+        self.assertEqual(list(apenas_rss), ["rss_pico_processo_mb"])
+        self.assertFalse(tracemalloc.is_tracing())
@@ -0,0 +1,107 @@
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from ControleDeRecebimentos.models import Cliente, Empreendimento, TabelaMensal, Venda
+from ControleDeRecebimentos.services import recalculo
+
+
+class RecalcularCamposTestCase(TestCase):
+    def setUp(self):
+        tabela = TabelaMensal.objects.create(mes_referencia="2025-11")
+        empreendimento = Empreendimento.objects.create(nome="Residencial Sol")
+        self.vendas = [
+            Venda.objects.create(
+                tabela_mensal=tabela,
+                cliente=Cliente.objects.create(nome=f"Cliente {i}"),
+                empreendimento=empreendimento,
+                data_venda="2025-11-10",
+                valor_venda=Decimal("100000.00"),
+                valor_comissao=Decimal("1.00"),
+            )
+            for i in range(5)
+        ]
+
+    def comissoes(self):
+        return list(
+            Venda.objects.order_by("id").values_list("valor_comissao", flat=True)
+        )
+
+    def test_recalcula_em_faixas(self):
+        saida = StringIO()
+
+        call_command(
+            "recalcular_campos", "comissao", "--tamanho-lote", "2", stdout=saida
+        )
+
+        self.assertEqual(self.comissoes(), [Decimal("195.00")] * 5)
+        self.assertIn("3/3 faixas, 5 linhas", saida.getvalue())
+        self.assertFalse(recalculo.caminho_progresso("comissao").exists())
+
+    def test_retoma_apos_interrupcao(self):
+        original = recalculo.TAREFAS["comissao"]
+        chamadas = []
+
+        def interromper_na_segunda(inicio, fim):
+            chamadas.append(inicio)
+            if len(chamadas) == 2:
+                raise KeyboardInterrupt
+            return original[1](inicio, fim)
+
+        with mock.patch.dict(
+            recalculo.TAREFAS, {"comissao": ("Venda", interromper_na_segunda, None)}
+        ):
+            with self.assertRaises(KeyboardInterrupt):
+                recalculo.recalcular("comissao", tamanho_lote=2)
+
+        self.assertEqual(
+            self.comissoes(), [Decimal("195.00")] * 2 + [Decimal("1.00")] * 3
+        )
+        Venda.objects.filter(id=self.vendas[0].id).update(valor_comissao=1)
+
+        resultado = recalculo.recalcular("comissao", tamanho_lote=2, retomar=True)
+
+        # A primeira faixa, já confirmada, não é processada de novo
+        self.assertEqual(resultado["linhas"], 3)
+        self.assertEqual(
+            self.comissoes(), [Decimal("1.00")] + [Decimal("195.00")] * 4
+        )
+
+    def test_retoma_com_as_primeiras_linhas_apagadas(self):
+        original = recalculo.TAREFAS["comissao"]
+        chamadas = []
+
+        def interromper_na_segunda(inicio, fim):
+            chamadas.append(inicio)
+            if len(chamadas) == 2:
+                raise KeyboardInterrupt
+            return original[1](inicio, fim)
+
+        with mock.patch.dict(
+            recalculo.TAREFAS, {"comissao": ("Venda", interromper_na_segunda, None)}
+        ):
+            with self.assertRaises(KeyboardInterrupt):
+                recalculo.recalcular("comissao", tamanho_lote=2)
+
+        self.vendas[0].delete()
+
+        resultado = recalculo.recalcular("comissao", tamanho_lote=2, retomar=True)
+
+        # As faixas continuam alinhadas ao início da execução interrompida
+        self.assertEqual(resultado["linhas"], 3)
+        self.assertEqual(self.comissoes(), [Decimal("195.00")] * 4)
+
+    def test_nome_normalizado(self):
+        Cliente.objects.filter(id=self.vendas[0].cliente_id).update(
+            nome_normalizado=""
+        )
+
+        recalculo.recalcular("nome_normalizado", tamanho_lote=2)
+
+        self.assertEqual(
+            Cliente.objects.get(id=self.vendas[0].cliente_id).nome_normalizado,
+            "cliente 0",
+        )
@@ -0,0 +1,73 @@
+from unittest import mock
+
+from django.conf import settings
+from rest_framework import status
+
+from ControleDeRecebimentos.models import ImportLog, Venda
+from ControleDeRecebimentos.services.registro_importacao import caminho_armazenado
+from ControleDeRecebimentos.tests.planilhas import gerar_xlsx
+from ControleDeRecebimentos.tests.test_import_vendas import ImportVendasBaseTestCase
+
+
+class RegistroImportacaoAPITestCase(ImportVendasBaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = "/import/webropay/"
+        self.ana = self.criar_venda("Ana Souza", forma_pagamento="AV")
+        self.arquivo = gerar_xlsx(["Pagador"], [["Ana Souza"]])
+
+    def enviar(self, **extra):
+        self.arquivo.seek(0)
+        return self.client.post(self.url, {"file": self.arquivo, **extra}, format="multipart")
+
+    def test_reenvio_devolve_resultado_guardado(self):
+        primeira = self.enviar()
+        self.assertEqual(primeira.data["vendas_faturadas"], 1)
+
+        with mock.patch(
+            "ControleDeRecebimentos.views.import_views.executar_importacao"
+        ) as executar:
+            segunda = self.enviar()
+
+        executar.assert_not_called()
+        self.assertEqual(segunda.status_code, status.HTTP_200_OK)
+        self.assertTrue(segunda.data["importacao_repetida"])
+        self.assertEqual(segunda.data["vendas_faturadas"], 1)
+
+        registro = ImportLog.objects.get()
+        self.assertEqual(registro.tipo, "WP")
+        self.assertEqual(registro.reenvios, 1)
+        self.assertEqual(registro.parametros, {"fuzzy": False})
+        self.assertEqual(
+            caminho_armazenado(registro.hash_arquivo).read_bytes(),
+            self.arquivo.getvalue(),
+        )
+        self.assertTrue(str(caminho_armazenado(registro.hash_arquivo)).startswith(
+            str(settings.IMPORTACAO_DIR)
+        ))
+
+    def test_forcar_reimporta(self):
+        self.enviar()
+        Venda.objects.filter(id=self.ana.id).update(status="PE")
+
+        response = self.enviar(forcar="true")
+
+        self.assertNotIn("importacao_repetida", response.data)
+        self.assertEqual(response.data["vendas_faturadas"], 1)
+        self.assertEqual(ImportLog.objects.count(), 1)
+
+    def test_parametros_diferentes_nao_reaproveitam(self):
+        self.enviar()
+
+        response = self.enviar(fuzzy="true")
+
+        self.assertNotIn("importacao_repetida", response.data)
+        self.assertEqual(ImportLog.objects.count(), 2)
+
+    def test_erro_nao_e_registrado(self):
+        arquivo = gerar_xlsx(["Data", "Valor"], [["2025-11-10", 10]])
+
+        response = self.client.post(self.url, {"file": arquivo}, format="multipart")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(ImportLog.objects.exists())
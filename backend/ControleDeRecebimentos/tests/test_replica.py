@@ -0,0 +1,74 @@
+from django.db import connections
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from ControleDeRecebimentos.models import Cliente, Empreendimento, TabelaMensal, Venda
+from ControleDeRecebimentos.roteador import COOKIE_PRIMARIO
+
+
+@override_settings(
+    REPLICA_ATIVA=True,
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+)
+class ReplicaLeituraTestCase(TransactionTestCase):
+    # Nos testes a réplica é outra conexão com o mesmo banco (TEST MIRROR),
+    # então os dados precisam estar confirmados para ela enxergá-los
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        self.client = APIClient()
+        Venda.objects.create(
+            tabela_mensal=TabelaMensal.objects.create(mes_referencia="2025-11"),
+            cliente=Cliente.objects.create(nome="Ana Souza"),
+            empreendimento=Empreendimento.objects.create(nome="Residencial Sol"),
+            data_venda="2025-11-10",
+        )
+        # Esquece a gravação acima, que fixaria as leituras no principal
+        cache.clear()
+
+    def consultar(self, url):
+        with CaptureQueriesContext(connections["default"]) as principal:
+            with CaptureQueriesContext(connections["replica"]) as replica:
+                response = self.client.get(url)
+        return response, len(principal), len(replica)
+
+    def test_leituras_usam_a_replica(self):
+        for url in ["/dashboard/", "/dashboard/mes/", "/vendas/", "/analises-epr/"]:
+            response, principal, replica = self.consultar(url)
+
+            self.assertEqual(response.status_code, 200, url)
+            self.assertEqual(principal, 0, url)
+            self.assertGreater(replica, 0, url)
+
+    def test_outras_views_usam_o_principal(self):
+        response, principal, replica = self.consultar("/tabelas-mensais/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(principal, 0)
+        self.assertEqual(replica, 0)
+
+    def test_gravacao_fixa_o_principal(self):
+        response = self.client.post("/empreendimentos/", {"nome": "Residencial Lua"})
+
+        self.assertEqual(response.status_code, 201)
+        self.assertIn(COOKIE_PRIMARIO, response.cookies)
+
+        # O cliente de testes reenvia o cookie recebido
+        _, principal, replica = self.consultar("/vendas/")
+        self.assertGreater(principal, 0)
+        self.assertEqual(replica, 0)
+
+    def test_gravacao_em_vendas_fixa_o_principal_para_todos(self):
+        self.client.post(
+            "/vendas/faturar/",
+            {"ids": list(Venda.objects.values_list("id", flat=True))},
+            format="json",
+        )
+        self.client.cookies.clear()
+
+        _, principal, replica = self.consultar("/dashboard/")
+        self.assertGreater(principal, 0)
+        self.assertEqual(replica, 0)
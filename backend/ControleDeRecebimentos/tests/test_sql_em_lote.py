@@ -0,0 +1,174 @@
+import datetime
+from decimal import Decimal
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from ControleDeRecebimentos.models import (
+    AnaliseEPR,
+    Cliente,
+    Empreendimento,
+    TabelaMensal,
+    Venda,
+)
+from ControleDeRecebimentos.services.sql_em_lote import (
+    atualizar_em_lote,
+    texto_copy,
+    upsert,
+)
+
+
+class UpsertTestCase(TestCase):
+    def setUp(self):
+        self.tabela = TabelaMensal.objects.create(mes_referencia="2025-11")
+        self.empreendimento = Empreendimento.objects.create(nome="Residencial Sol")
+        self.clientes = [
+            Cliente.objects.create(nome=nome) for nome in ["Ana Souza", "Bruno Lima"]
+        ]
+        self.existente = Venda.objects.create(
+            tabela_mensal=self.tabela,
+            cliente=self.clientes[0],
+            empreendimento=self.empreendimento,
+            unidade="101",
+            data_venda="2025-11-03",
+            corretor="Carlos",
+            status="FA",
+        )
+
+    def venda(self, cliente, corretor):
+        return Venda(
+            tabela_mensal=self.tabela,
+            cliente=cliente,
+            empreendimento=self.empreendimento,
+            unidade="101",
+            data_venda="2025-11-03",
+            corretor=corretor,
+        )
+
+    def test_cria_e_atualiza_sem_ler_existentes(self):
+        # INSERT ... ON CONFLICT e o savepoint em volta; no SQLite também o
+        # MAX(id) usado para separar criados de atualizados
+        with self.assertNumQueries(4 if connection.vendor == "sqlite" else 3):
+            criados, atualizados = upsert(
+                Venda,
+                [
+                    self.venda(self.clientes[0], "Paula"),
+                    self.venda(self.clientes[1], "Rita"),
+                    self.venda(self.clientes[1], "Rui"),
+                ],
+                unique_fields=["cliente_id", "empreendimento_id", "unidade", "data_venda"],
+                update_fields=["corretor"],
+            )
+
+        self.assertEqual(atualizados, [self.existente.id])
+        [criado] = criados
+        self.existente.refresh_from_db()
+        self.assertEqual(self.existente.corretor, "Paula")
+        # Campos fora de update_fields são preservados
+        self.assertEqual(self.existente.status, "FA")
+        nova = Venda.objects.get(id=criado)
+        self.assertEqual(
+            (nova.cliente_id, nova.corretor, nova.status),
+            (self.clientes[1].id, "Rui", "PE"),
+        )
+        self.assertIsNotNone(nova.created_at)
+
+    @skipUnless(connection.vendor == "postgresql", "xmax só existe no PostgreSQL")
+    def test_separa_criados_de_atualizados_pelo_xmax(self):
+        criados, atualizados = upsert(
+            Venda,
+            [self.venda(self.clientes[0], "Paula"), self.venda(self.clientes[1], "Rui")],
+            unique_fields=["cliente_id", "empreendimento_id", "unidade", "data_venda"],
+            update_fields=["corretor"],
+        )
+        self.assertEqual(atualizados, [self.existente.id])
+        self.assertEqual(len(criados), 1)
+
+        # Reenviar as mesmas linhas só atualiza
+        criados, atualizados = upsert(
+            Venda,
+            [self.venda(self.clientes[0], "Paula"), self.venda(self.clientes[1], "Rui")],
+            unique_fields=["cliente_id", "empreendimento_id", "unidade", "data_venda"],
+            update_fields=["corretor"],
+        )
+        self.assertEqual(criados, [])
+        self.assertEqual(len(atualizados), 2)
+
+
+class AtualizarEmLoteTestCase(TestCase):
+    def setUp(self):
+        tabela = TabelaMensal.objects.create(mes_referencia="2025-11")
+        empreendimento = Empreendimento.objects.create(nome="Residencial Sol")
+        self.vendas = [
+            Venda.objects.create(
+                tabela_mensal=tabela,
+                cliente=Cliente.objects.create(nome=f"Cliente {i}"),
+                empreendimento=empreendimento,
+                data_venda="2025-11-03",
+                observacoes="original",
+            )
+            for i in range(3)
+        ]
+
+    def test_update_unico_independente_do_tamanho(self):
+        for i, venda in enumerate(self.vendas[:2]):
+            venda.status = "FA"
+            venda.valor_comissao = Decimal(f"{i}.50")
+            venda.observacoes = "alterada"
+
+        # CREATE, INSERT, UPDATE e DROP mais o savepoint em volta. No
+        # PostgreSQL o COPY vai direto ao driver e não é contado
+        with self.assertNumQueries(6 if connection.vendor == "sqlite" else 5):
+            atualizadas = atualizar_em_lote(
+                Venda, self.vendas[:2], ["status", "valor_comissao"]
+            )
+
+        self.assertEqual(atualizadas, 2)
+        self.assertEqual(
+            list(
+                Venda.objects.order_by("id").values_list(
+                    "status", "valor_comissao", "observacoes"
+                )
+            ),
+            [
+                ("FA", Decimal("0.50"), "original"),
+                ("FA", Decimal("1.50"), "original"),
+                ("PE", None, "original"),
+            ],
+        )
+
+    @skipUnless(connection.vendor == "postgresql", "COPY só existe no PostgreSQL")
+    def test_copy_preserva_valores(self):
+        criada_em = timezone.make_aware(datetime.datetime(2025, 11, 5, 14, 30))
+        self.vendas[0].observacoes = "tab\tbarra\\ quebra\nfim\r"
+        self.vendas[0].created_at = criada_em
+        self.vendas[0].valor_comissao = Decimal("390.05")
+        self.vendas[1].observacoes = None
+        self.vendas[1].data_venda = datetime.date(2025, 10, 1)
+
+        atualizar_em_lote(
+            Venda,
+            self.vendas[:2],
+            ["observacoes", "created_at", "valor_comissao", "data_venda"],
+        )
+
+        primeira, segunda = Venda.objects.order_by("id")[:2]
+        self.assertEqual(primeira.observacoes, "tab\tbarra\\ quebra\nfim\r")
+        self.assertEqual(primeira.created_at, criada_em)
+        self.assertEqual(primeira.valor_comissao, Decimal("390.05"))
+        self.assertIsNone(segunda.observacoes)
+        self.assertEqual(segunda.data_venda, datetime.date(2025, 10, 1))
+
+    def test_recusa_campos_nao_escalares(self):
+        analise = AnaliseEPR.objects.create(resumo_por_mes={"2025-11": 1})
+        analise.resumo_por_mes = {"2025-12": 2}
+
+        with self.assertRaises(ValueError):
+            atualizar_em_lote(AnaliseEPR, [analise], ["resumo_por_mes"])
+
+    def test_texto_copy(self):
+        self.assertEqual(texto_copy(None), "\\N")
+        self.assertEqual(texto_copy("a\tb\\c\n"), "a\\tb\\\\c\\n")
+        self.assertEqual(texto_copy(Decimal("1.50")), "1.50")
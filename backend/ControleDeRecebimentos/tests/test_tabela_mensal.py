@@ -1,4 +1,5 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 from django.db import IntegrityError
 from rest_framework.test import APITestCase
 from rest_framework import status
@@ -76,3 +77,60 @@ class TabelaMensalAPITestCase(APITestCase):
         response = self.client.get(f"{self.url}{self.tabela.id}/")
 
         self.assertEqual(response.data['total_vendas'], 2)
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class TabelaMensalTotaisAPITestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.url = '/tabelas-mensais/'
+        self.cliente = Cliente.objects.create(nome="João")
+        self.empreendimento = Empreendimento.objects.create(nome="Residencial A")
+        for mes in ["2024-10", "2024-11", "2024-12"]:
+            tabela = TabelaMensal.objects.create(mes_referencia=mes)
+            for dia, venda_status in [(10, "PE"), (11, "FA")]:
+                self.criar_venda(tabela, f"{mes}-{dia}", venda_status)
+
+    def criar_venda(self, tabela, data_venda, venda_status="PE"):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Venda.objects.create(
+                tabela_mensal=tabela,
+                cliente=self.cliente,
+                empreendimento=self.empreendimento,
+                data_venda=data_venda,
+                status=venda_status,
+                valor_comissao="100.00",
+            )
+
+    def test_lista_com_totais_em_uma_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+
+        self.assertEqual([t['mes_referencia'] for t in response.data], ["2024-12", "2024-11", "2024-10"])
+        self.assertEqual(response.data[0]['total_vendas'], 2)
+        self.assertEqual(response.data[0]['vendas_pendentes'], 1)
+        self.assertEqual(response.data[0]['vendas_faturadas'], 1)
+        self.assertEqual(response.data[0]['total_comissao'], 200)
+
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+    def test_nova_venda_invalida_cache(self):
+        self.client.get(self.url)
+
+        self.criar_venda(TabelaMensal.objects.get(mes_referencia="2024-12"), "2024-12-20")
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.data[0]['total_vendas'], 3)
+
+    def test_nova_tabela_invalida_cache(self):
+        self.client.get(self.url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self.url, {"mes_referencia": "2025-01"}, format='json')
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.data[0]['mes_referencia'], "2025-01")
+        self.assertEqual(response.data[0]['total_vendas'], 0)
@@ -1,8 +1,11 @@
+from unittest import mock
+
 from rest_framework import status
 from rest_framework.test import APITestCase
 from factory import Factory, Faker, build, faker
 
-from ControleDeRecebimentos.models import Cliente, Empreendimento, TabelaMensal
+from ControleDeRecebimentos.models import Cliente, Empreendimento, TabelaMensal, Venda
+from ControleDeRecebimentos.views.paginacao import VendaCursorPagination
 
 
 class VendaAPIViewTestCase(APITestCase):
@@ -44,7 +47,7 @@ class VendaAPIViewTestCase(APITestCase):
         response = self.client.get(self.url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data["results"]), 1)
 
     def test_filter_vendas_by_tabela_mensal(self):
         from ControleDeRecebimentos.models import Venda
@@ -67,8 +70,8 @@ class VendaAPIViewTestCase(APITestCase):
         response = self.client.get(f"{self.url}?tabela_mensal={self.tabela_mensal.id}")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["tabela_mensal"], self.tabela_mensal.id)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["tabela_mensal"], self.tabela_mensal.id)
 
     def test_filter_vendas_by_status(self):
         from ControleDeRecebimentos.models import Venda
@@ -91,5 +94,63 @@ class VendaAPIViewTestCase(APITestCase):
         response = self.client.get(f"{self.url}?venda_status=PE")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["status"], "PE")
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["status"], "PE")
+
+    def criar_vendas(self, quantidade):
+        return [
+            Venda.objects.create(
+                tabela_mensal=self.tabela_mensal,
+                cliente=self.cliente,
+                empreendimento=self.empreendimento,
+                unidade=str(i),
+                data_venda="2024-06-15",
+            )
+            for i in range(quantidade)
+        ]
+
+    def test_paginacao_por_cursor(self):
+        vendas = self.criar_vendas(5)
+
+        response = self.client.get(f"{self.url}?page_size=2")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [venda["id"] for venda in response.data["results"]],
+            [vendas[4].id, vendas[3].id],
+        )
+
+        ids = []
+        proxima = f"{self.url}?page_size=2"
+        while proxima:
+            response = self.client.get(proxima)
+            ids.extend(venda["id"] for venda in response.data["results"])
+            proxima = response.data["next"]
+        self.assertEqual(ids, [venda.id for venda in reversed(vendas)])
+
+    def test_listagem_paginada_por_padrao(self):
+        vendas = self.criar_vendas(3)
+
+        with mock.patch.object(VendaCursorPagination, "page_size", 2):
+            response = self.client.get(self.url)
+
+        self.assertEqual(
+            [venda["id"] for venda in response.data["results"]],
+            [vendas[2].id, vendas[1].id],
+        )
+        self.assertIsNotNone(response.data["next"])
+
+    def test_campos_selecionados(self):
+        self.criar_vendas(2)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(f"{self.url}?fields=id,cliente_nome,status_display")
+
+        self.assertEqual(
+            response.data["results"][0],
+            {"id": response.data["results"][0]["id"], "cliente_nome": "João Silva", "status_display": "Pendente"},
+        )
+
+    def test_campo_invalido(self):
+        response = self.client.get(f"{self.url}?fields=id,senha")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
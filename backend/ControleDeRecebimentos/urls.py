@@ -30,6 +30,12 @@ from ControleDeRecebimentos.views.import_views import (
     ImportWebroPayAPIView,
     ImportEPRAPIView,
 )
+from ControleDeRecebimentos.views.import_job_views import ImportJobAPIView
+from ControleDeRecebimentos.views.comissao_views import (
+    RegraComissaoAPIView,
+    RecalcularComissoesAPIView,
+)
+from ControleDeRecebimentos.views.export_views import ExportarVendasAPIView
 from ControleDeRecebimentos.views.tabela_mensal_views import (
     TabelaMensalListCreateAPIView,
     TabelaMensalDetailAPIView,
@@ -40,6 +46,7 @@ from ControleDeRecebimentos.views.dashboard_views import (
 )
 from ControleDeRecebimentos.views.analise_epr_views import (
     AnalisarEPRAPIView,
+    ReanalisarEPRAPIView,
     ConfirmarAnaliseEPRAPIView,
     CancelarAnaliseEPRAPIView,
     ExportarAnaliseEPRAPIView,
@@ -56,6 +63,7 @@ urlpatterns = [
     path("clientes/", ClienteAPIView.as_view(), name="clientes"),
     path("vendas/faturar/", FaturarVendasAPIView.as_view(), name="faturar_vendas"),
     path("vendas/", VendaAPIView.as_view(), name="vendas"),
+    path("export/vendas/", ExportarVendasAPIView.as_view(), name="exportar_vendas"),
     path(
         "import/acompanhamento/",
         ImportAcompanhamentoAPIView.as_view(),
@@ -76,6 +84,11 @@ urlpatterns = [
         ImportEPRAPIView.as_view(),
         name="import_epr",
     ),
+    path(
+        "import/jobs/<int:job_id>/",
+        ImportJobAPIView.as_view(),
+        name="import_job",
+    ),
     path(
         "tabelas-mensais/",
         TabelaMensalListCreateAPIView.as_view(),
@@ -87,6 +100,13 @@ urlpatterns = [
         name="tabela_mensal_detail",
     ),
     path("dashboard/", DashboardAPIView.as_view(), name="dashboard"),
+    # Comissão
+    path("regras-comissao/", RegraComissaoAPIView.as_view(), name="regras_comissao"),
+    path(
+        "comissoes/recalcular/",
+        RecalcularComissoesAPIView.as_view(),
+        name="recalcular_comissoes",
+    ),
     path("dashboard/mes/", DashboardPorMesAPIView.as_view(), name="dashboard_mes"),
     # Análise EPR
     path(
@@ -94,6 +114,11 @@ urlpatterns = [
         AnalisarEPRAPIView.as_view(),
         name="analisar_epr",
     ),
+    path(
+        "import/epr/reanalisar/<int:analise_id>/",
+        ReanalisarEPRAPIView.as_view(),
+        name="reanalisar_epr",
+    ),
     path(
         "import/epr/confirmar/<int:analise_id>/",
         ConfirmarAnaliseEPRAPIView.as_view(),
@@ -1,14 +1,40 @@
-import pandas as pd
-from io import BytesIO
+import hashlib
+from datetime import datetime, time, timedelta
 
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.parsers import MultiPartParser
-from django.http import HttpResponse
+from django.db.models import Count, Max
+from django.http import FileResponse
 from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.dateparse import parse_date
+from django.utils.http import quote_etag
 
 from ControleDeRecebimentos.models import Venda, AnaliseEPR
+from ControleDeRecebimentos.roteador import ler_da_replica
+from ControleDeRecebimentos.services.analise_epr import analisar_epr, dados_epr
+from ControleDeRecebimentos.services.cache_colunar import (
+    LeitorColunar,
+    diretorio_colunar,
+)
+from ControleDeRecebimentos.services.importadores import executar_importacao
+from ControleDeRecebimentos.services.metricas import medir_memoria
+from ControleDeRecebimentos.services.planilha_recebimentos import planilha_recebimentos
+from ControleDeRecebimentos.services.resumo_mensal import (
+    meses_das_vendas,
+    vendas_alteradas,
+)
+from ControleDeRecebimentos.views.import_job_views import enfileirar_importacao
+from ControleDeRecebimentos.views.paginacao import (
+    AnaliseEPRCursorPagination,
+    AnaliseEPRItemCursorPagination,
+)
+from ControleDeRecebimentos.views.parametros import (
+    parametro_booleano,
+    tamanho_bloco_importacao,
+)
 
 
 class AnalisarEPRAPIView(APIView):
@@ -29,140 +55,86 @@ class AnalisarEPRAPIView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        try:
-            # EPR é .xls (formato antigo)
-            df = pd.read_excel(file, engine="xlrd")
-
-            vendas_encontradas = []
-            dados_epr = []
-            resumo_por_mes = {}
-
-            # Identificar coluna com nome do cliente
-            nome_coluna = None
-            for col in df.columns:
-                if "mutuário" in str(col).lower() or "mutua" in str(col).lower():
-                    nome_coluna = col
-                    break
-
-            if not nome_coluna:
-                # Fallback para coluna que contém "nome"
-                for col in df.columns:
-                    if "nome" in str(col).lower():
-                        nome_coluna = col
-                        break
-
-            if not nome_coluna:
-                return Response(
-                    {"error": "Coluna de nome do cliente não encontrada na planilha EPR"},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
+        parametros = {"fuzzy": parametro_booleano(request.data.get("fuzzy"))}
 
-            # Coletar nomes únicos da planilha EPR
-            nomes_planilha = {}
-            for idx, row in df.iterrows():
-                nome = str(row[nome_coluna]).strip() if pd.notna(row[nome_coluna]) else None
-                if nome and nome.lower() != "nan":
-                    nomes_planilha[nome.lower()] = (idx, row)
-
-            # Buscar todas as vendas financiadas pendentes em UMA query
-            vendas_por_nome = {}
-            for venda in Venda.objects.filter(
-                forma_pagamento="FI",
-                status="PE"
-            ).select_related("cliente", "empreendimento", "tabela_mensal"):
-                vendas_por_nome[venda.cliente.nome.lower()] = venda
-
-            # Processar dados
-            for nome_lower, (idx, row) in nomes_planilha.items():
-                nome_cliente = str(row[nome_coluna]).strip()
-
-                # Buscar venda no dicionário (O(1))
-                venda = vendas_por_nome.get(nome_lower)
-
-                if not venda:
-                    continue
-
-                # Extrair dados da EPR para esta venda
-                # Nota: valor_comissao vem da tabela Venda (importado das outras planilhas),
-                # pois a planilha EPR não contém esse valor
-                dados_linha = {
-                    "venda_id": venda.id,
-                    "nome_empreendimento": str(row.get("Nome Empreendimento", "")) if pd.notna(row.get("Nome Empreendimento")) else "",
-                    "numero_contrato": str(row.get("Número Contrato", "")) if pd.notna(row.get("Número Contrato")) else "",
-                    "nome_mutuario": nome_cliente,
-                    "cpf_cnpj": str(row.get("CPF/CNPJ Mutuário", "")) if pd.notna(row.get("CPF/CNPJ Mutuário")) else "",
-                    "data_assinatura": str(row.get("Data de Assinatura", "")) if pd.notna(row.get("Data de Assinatura")) else "",
-                    "valor_financiamento": float(row.get("Valor de Financiamento", 0)) if pd.notna(row.get("Valor de Financiamento")) else 0,
-                    "valor_financiamento_terreno": float(row.get("Valor de Financiamento do Terreno", 0)) if pd.notna(row.get("Valor de Financiamento do Terreno")) else 0,
-                    "valor_subsidio": float(row.get("Valor de Desconto Subsídio Complementar", 0)) if pd.notna(row.get("Valor de Desconto Subsídio Complementar")) else 0,
-                    "valor_fgts": float(row.get("Valor do FGTS", 0)) if pd.notna(row.get("Valor do FGTS")) else 0,
-                    "valor_recursos_proprios": float(row.get("Valor Recursos Próprios", 0)) if pd.notna(row.get("Valor Recursos Próprios")) else 0,
-                    "valor_compra_venda": float(row.get("Valor de Compra e Venda", 0)) if pd.notna(row.get("Valor de Compra e Venda")) else 0,
-                    "valor_comissao": float(venda.valor_comissao) if venda.valor_comissao else 0,
-                    # Dados da venda para o relatório
-                    "tabela_mensal_id": venda.tabela_mensal.id if venda.tabela_mensal else None,
-                    "mes_referencia": venda.tabela_mensal.mes_referencia if venda.tabela_mensal else None,
-                    "empreendimento_sistema": venda.empreendimento.nome if venda.empreendimento else "",
-                }
-
-                vendas_encontradas.append(venda.id)
-                dados_epr.append(dados_linha)
-
-                # Atualizar resumo por mês
-                if venda.tabela_mensal:
-                    mes = venda.tabela_mensal.mes_referencia
-                    resumo_por_mes[mes] = resumo_por_mes.get(mes, 0) + 1
-
-            if not vendas_encontradas:
-                return Response(
-                    {
-                        "message": "Nenhuma venda pendente encontrada na planilha EPR",
-                        "total_linhas_epr": len(df),
-                        "vendas_encontradas": 0,
-                    },
-                    status=status.HTTP_200_OK,
-                )
+        if parametro_booleano(request.data.get("assincrono")):
+            return enfileirar_importacao("EP", file, parametros)
+
+        tamanho_bloco = tamanho_bloco_importacao(request)
+
+        try:
+            with medir_memoria() as memoria:
+                resultado = executar_importacao("EP", file, parametros, tamanho_bloco)
 
-            # Criar registro de análise pendente
-            analise = AnaliseEPR.objects.create(
-                status="PE",
-                vendas_ids=vendas_encontradas,
-                dados_epr=dados_epr,
-                total_encontradas=len(vendas_encontradas),
-                resumo_por_mes=resumo_por_mes,
+            return Response(
+                {**resultado, "memoria": memoria},
+                status=(
+                    status.HTTP_201_CREATED
+                    if "analise_id" in resultado
+                    else status.HTTP_200_OK
+                ),
             )
 
-            # Montar resposta com detalhes por mês
-            detalhes_por_mes = {}
-            for dados in dados_epr:
-                mes = dados.get("mes_referencia")
-                if mes:
-                    if mes not in detalhes_por_mes:
-                        detalhes_por_mes[mes] = []
-                    detalhes_por_mes[mes].append({
-                        "venda_id": dados["venda_id"],
-                        "cliente": dados["nome_mutuario"],
-                        "empreendimento": dados["empreendimento_sistema"],
-                        "valor_comissao": dados["valor_comissao"],
-                    })
+        except Exception as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class ReanalisarEPRAPIView(APIView):
+    """
+    POST /import/epr/reanalisar/<id>/
+    Refaz a análise a partir da cópia colunar da planilha já enviada (por
+    exemplo, depois de corrigir o nome de um cliente), sem novo upload. Se
+    a reanálise gerar uma nova análise, a anterior, se ainda pendente, é
+    cancelada.
+    """
+
+    def post(self, request, analise_id):
+        anterior = AnaliseEPR.objects.only("id", "status", "hash_arquivo").filter(
+            id=analise_id
+        ).first()
+        if anterior is None:
+            return Response(
+                {"error": "Análise não encontrada"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
 
+        diretorio = (
+            diretorio_colunar(anterior.hash_arquivo) if anterior.hash_arquivo else None
+        )
+        if diretorio is None or not diretorio.exists():
             return Response(
                 {
-                    "analise_id": analise.id,
-                    "message": "Análise criada com sucesso. Aguardando confirmação.",
-                    "resumo": {
-                        "total_linhas_epr": len(df),
-                        "vendas_encontradas": len(vendas_encontradas),
-                        "por_mes": resumo_por_mes,
-                    },
-                    "detalhes_por_mes": detalhes_por_mes,
+                    "error": (
+                        "Planilha da análise não está mais disponível. "
+                        "Envie o arquivo novamente."
+                    )
                 },
-                status=status.HTTP_201_CREATED,
+                status=status.HTTP_410_GONE,
             )
 
+        try:
+            with medir_memoria() as memoria:
+                resultado = analisar_epr(
+                    LeitorColunar(diretorio, tamanho_bloco_importacao(request)),
+                    fuzzy=parametro_booleano(request.data.get("fuzzy")),
+                    hash_arquivo=anterior.hash_arquivo,
+                )
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+        if "analise_id" in resultado and anterior.status == "PE":
+            anterior.status = "CA"
+            anterior.save(update_fields=["status", "atualizado_em"])
+
+        return Response(
+            {**resultado, "analise_anterior_id": anterior.id, "memoria": memoria},
+            status=(
+                status.HTTP_201_CREATED
+                if "analise_id" in resultado
+                else status.HTTP_200_OK
+            ),
+        )
+
 
 class ConfirmarAnaliseEPRAPIView(APIView):
     """
@@ -186,11 +158,13 @@ class ConfirmarAnaliseEPRAPIView(APIView):
             )
 
         # Atualizar vendas para Faturado
-        vendas = Venda.objects.filter(id__in=analise.vendas_ids, status="PE")
+        vendas = Venda.objects.filter(itens_analise_epr__analise=analise, status="PE")
+        meses = meses_das_vendas(vendas)
         total_atualizadas = vendas.update(
             status="FA",
             data_faturamento=timezone.now(),
         )
+        vendas_alteradas(meses)
 
         # Atualizar análise
         analise.status = "CO"
@@ -246,12 +220,15 @@ class ExportarAnaliseEPRAPIView(APIView):
     GET /export/analise-epr/<id>/
     Exporta planilha Excel com vendas faturadas da análise.
     Opcional: ?mes=2025-11 para filtrar por mês específico.
+
+    A planilha é gerada no primeiro download e servida do disco nos
+    seguintes (ver services/planilha_recebimentos.py).
     """
 
+    @ler_da_replica
     def get(self, request, analise_id):
-        try:
-            analise = AnaliseEPR.objects.get(id=analise_id)
-        except AnaliseEPR.DoesNotExist:
+        analise = AnaliseEPR.objects.only("id", "status").filter(id=analise_id).first()
+        if analise is None:
             return Response(
                 {"error": "Análise não encontrada"},
                 status=status.HTTP_404_NOT_FOUND,
@@ -265,73 +242,93 @@ class ExportarAnaliseEPRAPIView(APIView):
 
         mes_filtro = request.query_params.get("mes")
 
-        # Filtrar dados por mês se solicitado
-        dados = analise.dados_epr
-        if mes_filtro:
-            dados = [d for d in dados if d.get("mes_referencia") == mes_filtro]
-
-        if not dados:
+        caminho = planilha_recebimentos(analise.id, mes_filtro)
+        if caminho is None:
             return Response(
                 {"error": "Nenhum dado encontrado para exportação"},
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        # Criar DataFrame para exportação
-        df = pd.DataFrame([
-            {
-                "Nome Empreendimento": d["nome_empreendimento"],
-                "Número Contrato": d["numero_contrato"],
-                "Nome Mutuário": d["nome_mutuario"],
-                "CPF/CNPJ Mutuário": d["cpf_cnpj"],
-                "Data de Assinatura": d["data_assinatura"],
-                "Valor de Financiamento": d["valor_financiamento"],
-                "Valor de Financiamento do Terreno": d["valor_financiamento_terreno"],
-                "Valor de Desconto Subsídio Complementar": d["valor_subsidio"],
-                "Valor do FGTS": d["valor_fgts"],
-                "Valor Recursos Próprios": d["valor_recursos_proprios"],
-                "Valor de Compra e Venda": d["valor_compra_venda"],
-                "Valor da Comissão": d["valor_comissao"],
-            }
-            for d in dados
-        ])
-
-        # Gerar arquivo Excel
-        output = BytesIO()
-        with pd.ExcelWriter(output, engine="openpyxl") as writer:
-            df.to_excel(writer, index=False, sheet_name="Recebimentos")
-
-        output.seek(0)
-
         # Nome do arquivo
         if mes_filtro:
             filename = f"{mes_filtro.replace('-', '.')} - Planilha Recebimentos.xlsx"
         else:
             filename = f"Analise_{analise.id} - Planilha Recebimentos.xlsx"
 
-        response = HttpResponse(
-            output.read(),
+        return FileResponse(
+            open(caminho, "rb"),
+            as_attachment=True,
+            filename=filename,
             content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         )
-        response["Content-Disposition"] = f'attachment; filename="{filename}"'
 
-        return response
+
+def inicio_do_dia(valor):
+    """
+    Converte 'AAAA-MM-DD' no início daquele dia, ou None se inválido.
+    """
+    data = parse_date(valor) if valor else None
+    if data is None:
+        return None
+    return timezone.make_aware(datetime.combine(data, time.min))
 
 
 class ListarAnaliseEPRAPIView(APIView):
     """
     GET /analises-epr/
-    Lista todas as análises EPR.
+    Lista as análises EPR (só os campos de resumo).
+    Filtros opcionais: ?status=CO, ?criado_de=2025-11-01, ?criado_ate=2025-11-30.
+    Com `cursor` ou `page_size` a resposta é paginada por cursor
+    ({"next", "previous", "results"}).
+
+    A resposta traz um ETag; com If-None-Match igual, devolve 304.
     """
 
+    @ler_da_replica
     def get(self, request):
-        analises = AnaliseEPR.objects.all().order_by("-created_at")
+        analises = AnaliseEPR.objects.only(
+            "id",
+            "status",
+            "created_at",
+            "confirmado_em",
+            "total_encontradas",
+            "resumo_por_mes",
+        ).order_by("-created_at")
 
         status_filtro = request.query_params.get("status")
         if status_filtro:
             analises = analises.filter(status=status_filtro)
 
-        data = [
-            {
+        for parametro, lookup, dias in [
+            ("criado_de", "created_at__gte", 0),
+            ("criado_ate", "created_at__lt", 1),
+        ]:
+            valor = request.query_params.get(parametro)
+            if not valor:
+                continue
+            inicio = inicio_do_dia(valor)
+            if inicio is None:
+                return Response(
+                    {"error": f"{parametro} deve estar no formato AAAA-MM-DD"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            analises = analises.filter(**{lookup: inicio + timedelta(days=dias)})
+
+        # O ETag muda sempre que alguma análise do filtro é criada ou alterada
+        versao = analises.order_by().aggregate(
+            total=Count("id"), ultima=Max("atualizado_em")
+        )
+        etag = quote_etag(
+            hashlib.md5(
+                f"{request.get_full_path()}|{versao['total']}|{versao['ultima']}".encode()
+            ).hexdigest()
+        )
+        nao_modificado = get_conditional_response(request, etag=etag)
+        if nao_modificado is not None:
+            return nao_modificado
+
+        def resumo(a):
+            return {
                 "id": a.id,
                 "status": a.status,
                 "status_display": a.get_status_display(),
@@ -340,18 +337,30 @@ class ListarAnaliseEPRAPIView(APIView):
                 "total_encontradas": a.total_encontradas,
                 "resumo_por_mes": a.resumo_por_mes,
             }
-            for a in analises
-        ]
 
-        return Response(data, status=status.HTTP_200_OK)
+        if "cursor" in request.query_params or "page_size" in request.query_params:
+            paginacao = AnaliseEPRCursorPagination()
+            pagina = paginacao.paginate_queryset(analises, request, view=self)
+            response = paginacao.get_paginated_response([resumo(a) for a in pagina])
+        else:
+            response = Response(
+                [resumo(a) for a in analises], status=status.HTTP_200_OK
+            )
+
+        response["ETag"] = etag
+        return response
 
 
 class DetalharAnaliseEPRAPIView(APIView):
     """
     GET /analises-epr/<id>/
     Retorna detalhes completos de uma análise EPR, incluindo dados para exportação.
+    Opcional: ?mes=2025-11 para retornar só os dados daquele mês.
+    Com `cursor` ou `page_size`, "dados_epr" vem paginado por cursor
+    ({"next", "previous", "results"}).
     """
 
+    @ler_da_replica
     def get(self, request, analise_id):
         try:
             analise = AnaliseEPR.objects.get(id=analise_id)
@@ -361,6 +370,19 @@ class DetalharAnaliseEPRAPIView(APIView):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
+        dados = dados_epr(analise.id, request.query_params.get("mes"))
+
+        if "cursor" in request.query_params or "page_size" in request.query_params:
+            paginacao = AnaliseEPRItemCursorPagination()
+            pagina = paginacao.paginate_queryset(dados, request, view=self)
+            dados = {
+                "next": paginacao.get_next_link(),
+                "previous": paginacao.get_previous_link(),
+                "results": pagina,
+            }
+        else:
+            dados = list(dados)
+
         data = {
             "id": analise.id,
             "status": analise.status,
@@ -369,7 +391,7 @@ class DetalharAnaliseEPRAPIView(APIView):
             "confirmado_em": analise.confirmado_em,
             "total_encontradas": analise.total_encontradas,
             "resumo_por_mes": analise.resumo_por_mes,
-            "dados_epr": analise.dados_epr,
+            "dados_epr": dados,
         }
 
-        return Response(data, status=status.HTTP_200_OK)
\ No newline at end of file
+        return Response(data, status=status.HTTP_200_OK)
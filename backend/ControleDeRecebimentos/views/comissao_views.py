@@ -0,0 +1,53 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+
+from ControleDeRecebimentos.models import RegraComissao
+from ControleDeRecebimentos.Serializers.RegraComissao.RegraComissaoSerializer import (
+    RegraComissaoSerializer,
+)
+from ControleDeRecebimentos.services.comissao import recalcular_comissoes
+
+
+class RegraComissaoAPIView(APIView):
+    """
+    GET /regras-comissao/ lista as regras de comissão.
+    POST /regras-comissao/ cria uma regra. As vendas já gravadas só mudam
+    depois de um recálculo (POST /comissoes/recalcular/).
+    """
+
+    def get(self, request):
+        regras = RegraComissao.objects.all()
+        return Response(RegraComissaoSerializer(regras, many=True).data)
+
+    def post(self, request):
+        serializer = RegraComissaoSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+class RecalcularComissoesAPIView(APIView):
+    """
+    POST /comissoes/recalcular/
+    Reaplica as regras de comissão às vendas. Opcional: mes_referencia
+    (ex: 2025-11) e/ou empreendimento (id) para limitar o escopo; sem
+    nenhum dos dois, recalcula todas as vendas.
+    """
+
+    def post(self, request):
+        empreendimento = request.data.get("empreendimento")
+        if empreendimento not in (None, "") and not str(empreendimento).isdigit():
+            return Response(
+                {"error": "empreendimento deve ser o id numérico"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        resultado = recalcular_comissoes(
+            mes_referencia=request.data.get("mes_referencia") or None,
+            empreendimento_id=int(empreendimento) if empreendimento else None,
+        )
+        return Response(
+            {"message": "Comissões recalculadas", **resultado},
+            status=status.HTTP_200_OK,
+        )
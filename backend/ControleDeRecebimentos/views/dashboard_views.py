@@ -1,70 +1,78 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from django.conf import settings
+from django.core.cache import cache
 from django.db.models import Sum, Count, Q
 
 from ControleDeRecebimentos.models import Venda, TabelaMensal
+from ControleDeRecebimentos.roteador import ler_da_replica
+from ControleDeRecebimentos.services.versao_vendas import versao_vendas
 
 
-class DashboardAPIView(APIView):
-    def get(self, request):
-        # Estatísticas gerais
-        total_vendas = Venda.objects.count()
-        vendas_pendentes = Venda.objects.filter(status="PE").count()
-        vendas_faturadas = Venda.objects.filter(status="FA").count()
+def totais_dashboard():
+    # Estatísticas gerais, valores e formas de pagamento em UMA query
+    totais = Venda.objects.aggregate(
+        total_vendas=Count("id"),
+        vendas_pendentes=Count("id", filter=Q(status="PE")),
+        vendas_faturadas=Count("id", filter=Q(status="FA")),
+        total_valor_vendas=Sum("valor_venda"),
+        total_comissao=Sum("valor_comissao"),
+        comissao_pendente=Sum("valor_comissao", filter=Q(status="PE")),
+        comissao_faturada=Sum("valor_comissao", filter=Q(status="FA")),
+        vendas_a_vista=Count("id", filter=Q(forma_pagamento="AV")),
+        vendas_financiadas=Count("id", filter=Q(forma_pagamento="FI")),
+    )
 
-        # Valores
-        totais = Venda.objects.aggregate(
-            total_valor_vendas=Sum("valor_venda"),
-            total_comissao=Sum("valor_comissao"),
-            comissao_pendente=Sum("valor_comissao", filter=Q(status="PE")),
-            comissao_faturada=Sum("valor_comissao", filter=Q(status="FA")),
-        )
+    return {
+        "total_vendas": totais["total_vendas"],
+        "vendas_pendentes": totais["vendas_pendentes"],
+        "vendas_faturadas": totais["vendas_faturadas"],
+        "total_valor_vendas": totais["total_valor_vendas"] or 0,
+        "total_comissao": totais["total_comissao"] or 0,
+        "comissao_pendente": totais["comissao_pendente"] or 0,
+        "comissao_faturada": totais["comissao_faturada"] or 0,
+        "vendas_a_vista": totais["vendas_a_vista"],
+        "vendas_financiadas": totais["vendas_financiadas"],
+    }
 
-        # Por forma de pagamento
-        a_vista = Venda.objects.filter(forma_pagamento="AV").count()
-        financiado = Venda.objects.filter(forma_pagamento="FI").count()
 
-        return Response(
-            {
-                "total_vendas": total_vendas,
-                "vendas_pendentes": vendas_pendentes,
-                "vendas_faturadas": vendas_faturadas,
-                "total_valor_vendas": totais["total_valor_vendas"] or 0,
-                "total_comissao": totais["total_comissao"] or 0,
-                "comissao_pendente": totais["comissao_pendente"] or 0,
-                "comissao_faturada": totais["comissao_faturada"] or 0,
-                "vendas_a_vista": a_vista,
-                "vendas_financiadas": financiado,
-            }
-        )
+class DashboardAPIView(APIView):
+    @ler_da_replica
+    def get(self, request):
+        chave = f"dashboard:{versao_vendas()}"
+        dados = cache.get(chave)
+        if dados is None:
+            dados = totais_dashboard()
+            cache.set(chave, dados, settings.DASHBOARD_CACHE_SEGUNDOS)
+
+        return Response(dados)
 
 
 class DashboardPorMesAPIView(APIView):
+    @ler_da_replica
     def get(self, request):
-        tabelas = TabelaMensal.objects.all().order_by("-mes_referencia")
-
-        resultado = []
-        for tabela in tabelas:
-            vendas = Venda.objects.filter(tabela_mensal=tabela)
-
-            totais = vendas.aggregate(
-                total_vendas=Count("id"),
-                pendentes=Count("id", filter=Q(status="PE")),
-                faturadas=Count("id", filter=Q(status="FA")),
-                total_comissao=Sum("valor_comissao"),
-                comissao_faturada=Sum("valor_comissao", filter=Q(status="FA")),
-            )
+        # Totais lidos do ResumoMensal em uma única query
+        tabelas = TabelaMensal.objects.annotate(
+            total_vendas=Sum("resumos__total_vendas"),
+            pendentes=Sum("resumos__total_vendas", filter=Q(resumos__status="PE")),
+            faturadas=Sum("resumos__total_vendas", filter=Q(resumos__status="FA")),
+            total_comissao=Sum("resumos__total_comissao"),
+            comissao_faturada=Sum(
+                "resumos__total_comissao", filter=Q(resumos__status="FA")
+            ),
+        ).order_by("-mes_referencia")
 
-            resultado.append(
-                {
-                    "mes_referencia": tabela.mes_referencia,
-                    "tabela_id": tabela.id,
-                    "total_vendas": totais["total_vendas"] or 0,
-                    "pendentes": totais["pendentes"] or 0,
-                    "faturadas": totais["faturadas"] or 0,
-                    "total_comissao": totais["total_comissao"] or 0,
-                    "comissao_faturada": totais["comissao_faturada"] or 0,
-                }
-            )
+        resultado = [
+            {
+                "mes_referencia": tabela.mes_referencia,
+                "tabela_id": tabela.id,
+                "total_vendas": tabela.total_vendas or 0,
+                "pendentes": tabela.pendentes or 0,
+                "faturadas": tabela.faturadas or 0,
+                "total_comissao": tabela.total_comissao or 0,
+                "comissao_faturada": tabela.comissao_faturada or 0,
+            }
+            for tabela in tabelas
+        ]
 
         return Response(resultado)
@@ -0,0 +1,99 @@
+import csv
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from ControleDeRecebimentos.models import Venda
+from ControleDeRecebimentos.views.venda_views import filtrar_vendas
+
+
+# Coluna do arquivo -> campo consultado
+COLUNAS_EXPORTACAO_VENDAS = {
+    "id": "id",
+    "mes_referencia": "tabela_mensal__mes_referencia",
+    "cliente_id": "cliente_id",
+    "cliente_nome": "cliente__nome",
+    "empreendimento_id": "empreendimento_id",
+    "empreendimento_nome": "empreendimento__nome",
+    "data_venda": "data_venda",
+    "status": "status",
+    "valor_venda": "valor_venda",
+    "forma_pagamento": "forma_pagamento",
+    "corretor": "corretor",
+    "imobiliaria": "imobiliaria",
+    "unidade": "unidade",
+    "etapa": "etapa",
+    "fgts": "fgts",
+    "observacoes": "observacoes",
+    "valor_comissao": "valor_comissao",
+    "data_faturamento": "data_faturamento",
+    "created_at": "created_at",
+}
+
+
+class Eco:
+    """
+    "Arquivo" cujo write devolve o próprio texto, para o csv.writer gerar
+    uma linha por vez.
+    """
+
+    def write(self, valor):
+        return valor
+
+
+def linhas_csv(vendas):
+    writer = csv.writer(Eco())
+    yield writer.writerow(COLUNAS_EXPORTACAO_VENDAS)
+    for venda in vendas:
+        yield writer.writerow(venda)
+
+
+def linhas_ndjson(vendas):
+    for venda in vendas:
+        yield json.dumps(
+            dict(zip(COLUNAS_EXPORTACAO_VENDAS, venda)),
+            cls=DjangoJSONEncoder,
+            ensure_ascii=False,
+        ) + "\n"
+
+
+FORMATOS_EXPORTACAO = {
+    "csv": (linhas_csv, "text/csv; charset=utf-8"),
+    "ndjson": (linhas_ndjson, "application/x-ndjson; charset=utf-8"),
+}
+
+
+class ExportarVendasAPIView(APIView):
+    """
+    GET /export/vendas/?formato=csv|ndjson
+    Exporta as vendas em streaming, com os mesmos filtros de /vendas/
+    (tabela_mensal, cliente, empreendimento, venda_status).
+
+    As linhas são lidas do banco em lotes por um cursor (server-side no
+    Postgres) e enviadas conforme são lidas, sem montar o arquivo em memória.
+    """
+
+    def get(self, request):
+        formato = request.query_params.get("formato", "csv").lower()
+        if formato not in FORMATOS_EXPORTACAO:
+            return Response(
+                {"error": f"Formato inválido. Use: {', '.join(FORMATOS_EXPORTACAO)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        gerar_linhas, content_type = FORMATOS_EXPORTACAO[formato]
+
+        vendas = (
+            filtrar_vendas(Venda.objects.all(), request.query_params)
+            .order_by("id")
+            .values_list(*COLUNAS_EXPORTACAO_VENDAS.values())
+            .iterator(chunk_size=settings.DB_LOTE_CURSOR)
+        )
+
+        response = StreamingHttpResponse(gerar_linhas(vendas), content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="vendas.{formato}"'
+        return response
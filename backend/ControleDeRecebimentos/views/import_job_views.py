@@ -0,0 +1,69 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+
+from ControleDeRecebimentos.models import ImportJob
+from ControleDeRecebimentos.services.jobs import criar_job, encerrar_se_abandonado
+
+
+def enfileirar_importacao(tipo, file, parametros=None):
+    """
+    Resposta das rotas /import/... com `assincrono=true`: registra o job e
+    devolve seu id sem esperar a importação.
+    """
+    job = criar_job(tipo, file, parametros)
+    return Response(
+        {
+            "message": "Importação enviada para processamento",
+            "job_id": job.id,
+            "status": job.status,
+            "status_url": f"/import/jobs/{job.id}/",
+        },
+        status=status.HTTP_202_ACCEPTED,
+    )
+
+
+class ImportJobAPIView(APIView):
+    """
+    GET /import/jobs/<id>/
+    Retorna etapa, progresso, tempo estimado e, ao final, o resultado do job.
+    """
+
+    def get(self, request, job_id):
+        try:
+            job = ImportJob.objects.get(id=job_id)
+        except ImportJob.DoesNotExist:
+            return Response(
+                {"error": "Job de importação não encontrado"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        job = encerrar_se_abandonado(job)
+
+        percentual = None
+        if job.status == "CO":
+            percentual = 100.0
+        elif job.linhas_total:
+            percentual = round(
+                min(job.linhas_processadas / job.linhas_total, 1) * 100, 1
+            )
+
+        return Response(
+            {
+                "id": job.id,
+                "tipo": job.tipo,
+                "tipo_display": job.get_tipo_display(),
+                "status": job.status,
+                "status_display": job.get_status_display(),
+                "etapa": job.etapa,
+                "linhas_processadas": job.linhas_processadas,
+                "linhas_total": job.linhas_total,
+                "percentual": percentual,
+                "eta_segundos": job.eta_segundos,
+                "created_at": job.created_at,
+                "iniciado_em": job.iniciado_em,
+                "finalizado_em": job.finalizado_em,
+                "resultado": job.resultado,
+                "erro": job.erro,
+            },
+            status=status.HTTP_200_OK,
+        )
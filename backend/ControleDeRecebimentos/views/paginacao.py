@@ -0,0 +1,36 @@
+from rest_framework.pagination import CursorPagination
+
+
+class VendaCursorPagination(CursorPagination):
+    """
+    Paginação por cursor (keyset) sobre o id: cada página é uma busca pelo
+    índice a partir do último id, com o mesmo custo em qualquer profundidade.
+    """
+
+    ordering = "-id"
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
+
+class AnaliseEPRCursorPagination(CursorPagination):
+    """
+    Paginação por cursor da listagem de análises EPR, mais recentes
+    primeiro.
+    """
+
+    ordering = "-created_at"
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+
+class AnaliseEPRItemCursorPagination(CursorPagination):
+    """
+    Paginação por cursor dos dados_epr no detalhe de uma análise.
+    """
+
+    ordering = "id"
+    page_size = 500
+    page_size_query_param = "page_size"
+    max_page_size = 5000
@@ -0,0 +1,23 @@
+from django.conf import settings
+
+
+VALORES_VERDADEIROS = {"1", "true", "sim", "on", "yes"}
+
+
+def parametro_booleano(valor):
+    """
+    Interpreta flags enviadas em query string ou formulário ('true', '1'...).
+    """
+    if isinstance(valor, bool):
+        return valor
+    return str(valor or "").strip().lower() in VALORES_VERDADEIROS
+
+
+def tamanho_bloco_importacao(request):
+    """
+    Tamanho de bloco para o modo streaming (`streaming=true`), ou None para
+    ler a planilha inteira de uma vez.
+    """
+    if parametro_booleano(request.data.get("streaming")):
+        return settings.IMPORTACAO_TAMANHO_BLOCO
+    return None
@@ -1,16 +1,28 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from django.conf import settings
+from django.core.cache import cache
 
 from ControleDeRecebimentos.models import TabelaMensal
-from ControleDeRecebimentos.Serializers.TabelaMensal import TabelaMensalSerializer
+from ControleDeRecebimentos.Serializers.TabelaMensal import (
+    TabelaMensalSerializer,
+    tabelas_com_totais,
+)
+from ControleDeRecebimentos.services.versao_vendas import versao_vendas
 
 
 class TabelaMensalListCreateAPIView(APIView):
     def get(self, request):
-        tabelas = TabelaMensal.objects.all().order_by('-mes_referencia')
-        serializer = TabelaMensalSerializer(tabelas, many=True)
-        return Response(serializer.data)
+        # Meses com os totais em uma única query, em cache até a próxima
+        # gravação em vendas ou tabelas mensais
+        chave = f"tabelas_mensais:{versao_vendas()}"
+        dados = cache.get(chave)
+        if dados is None:
+            tabelas = tabelas_com_totais().order_by('-mes_referencia')
+            dados = TabelaMensalSerializer(tabelas, many=True).data
+            cache.set(chave, dados, settings.TABELAS_MENSAIS_CACHE_SEGUNDOS)
+        return Response(dados)
 
     def post(self, request):
         serializer = TabelaMensalSerializer(data=request.data)
@@ -22,7 +34,7 @@ class TabelaMensalListCreateAPIView(APIView):
 class TabelaMensalDetailAPIView(APIView):
     def get(self, request, pk):
         try:
-            tabela = TabelaMensal.objects.get(pk=pk)
+            tabela = tabelas_com_totais().get(pk=pk)
         except TabelaMensal.DoesNotExist:
             return Response(
                 {"error": "Tabela mensal não encontrada"},
@@ -4,39 +4,84 @@ from rest_framework import status
 from django.utils import timezone
 
 from ControleDeRecebimentos.models import Venda
+from ControleDeRecebimentos.roteador import ler_da_replica
 from ControleDeRecebimentos.Serializers.Venda.VendaSerializer import VendaSerializer
+from ControleDeRecebimentos.views.paginacao import VendaCursorPagination
+from ControleDeRecebimentos.services.resumo_mensal import (
+    meses_das_vendas,
+    vendas_alteradas,
+)
 
 
-class VendaAPIView(APIView):
-    def get(self, request):
-        vendas = Venda.objects.select_related(
-            "cliente", "empreendimento", "tabela_mensal"
-        ).all()
+def filtrar_vendas(vendas, params):
+    """
+    Aplica os filtros da listagem de vendas (query string).
+    """
+    tabela_mensal = params.get("tabela_mensal")
+    cliente = params.get("cliente")
+    empreendimento = params.get("empreendimento")
+    venda_status = params.get("venda_status")
+
+    if tabela_mensal:
+        vendas = vendas.filter(tabela_mensal_id=tabela_mensal)
+
+    if cliente:
+        vendas = vendas.filter(cliente_id=cliente)
+
+    if empreendimento:
+        vendas = vendas.filter(empreendimento_id=empreendimento)
+
+    if venda_status:
+        vendas = vendas.filter(status=venda_status)
 
-        tabela_mensal = request.query_params.get("tabela_mensal")
-        cliente = request.query_params.get("cliente")
-        empreendimento = request.query_params.get("empreendimento")
-        venda_status = request.query_params.get("venda_status")
+    return vendas
 
-        if tabela_mensal:
-            vendas = vendas.filter(tabela_mensal_id=tabela_mensal)
 
-        if cliente:
-            vendas = vendas.filter(cliente_id=cliente)
+class VendaAPIView(APIView):
+    @ler_da_replica
+    def get(self, request):
+        """
+        Lista as vendas filtradas.
+
+        `fields=id,cliente_nome,...` devolve só os campos pedidos. A
+        resposta é paginada por cursor ({"next", "previous", "results"}),
+        com `page_size` vendas por página (padrão 100, máximo 1000).
+        """
+        campos = [
+            campo.strip()
+            for campo in request.query_params.get("fields", "").split(",")
+            if campo.strip()
+        ]
+        desconhecidos = set(campos) - set(VendaSerializer.Meta.fields)
+        if desconhecidos:
+            return Response(
+                {"error": f"Campos inválidos: {', '.join(sorted(desconhecidos))}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-        if empreendimento:
-            vendas = vendas.filter(empreendimento_id=empreendimento)
+        if campos:
+            colunas = VendaSerializer.colunas_para(campos)
+            relacionados = {
+                coluna.split("__")[0] for coluna in colunas if "__" in coluna
+            }
+            vendas = Venda.objects.select_related(*relacionados).only(*colunas)
+        else:
+            vendas = Venda.objects.select_related(
+                "cliente", "empreendimento", "tabela_mensal"
+            ).all()
 
-        if venda_status:
-            vendas = vendas.filter(status=venda_status)
+        vendas = filtrar_vendas(vendas, request.query_params)
 
-        serializer = VendaSerializer(vendas, many=True)
-        return Response(serializer.data)
+        paginacao = VendaCursorPagination()
+        pagina = paginacao.paginate_queryset(vendas, request, view=self)
+        serializer = VendaSerializer(pagina, many=True, campos=campos)
+        return paginacao.get_paginated_response(serializer.data)
 
     def post(self, request):
         serializer = VendaSerializer(data=request.data)
         if serializer.is_valid(raise_exception=True):
-            serializer.save()
+            venda = serializer.save()
+            vendas_alteradas([venda.tabela_mensal_id])
             return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
@@ -59,7 +104,9 @@ class FaturarVendasAPIView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+        meses = meses_das_vendas(vendas)
         vendas.update(status="FA", data_faturamento=timezone.now())
+        vendas_alteradas(meses)
 
         return Response(
             {"message": f"{total} vendas faturadas com sucesso"},